@@ -0,0 +1,336 @@
+#!/usr/bin/env python
+"""
+Batch runner of the headless game sessions, used to balance ratings,
+health, shields, scores and weapons of the config files. Each session is
+seeded and played by a scripted or random player through the same keyboard
+events a human would send. Sessions are spread over a pool of processes,
+and their results are aggregated into a single report. Run from the
+repository root:
+
+python -m balancing.balancing --sessions 2000 --player scripted
+python -m balancing.balancing --config config_files/my_config.txt --csv out.csv
+"""
+import os
+import abc
+import sys
+import csv
+import random
+import argparse
+import multiprocessing
+
+from collections import Counter
+
+# sessions are always simulated without window, GL context and sound:
+os.environ.setdefault("RED_INVADERS_HEADLESS", "1")
+import game
+
+from game import arcade
+
+SESSION_TIME = 300  # seconds of the game simulated in each session at most
+DECISION_INTERVAL = 15  # frames between players' decisions
+ROCKET_CHANCE = 0.1  # chance that player launches a rocket at the decision
+AIM_TOLERANCE = 20  # scripted player does not move, if target is that close
+# scripted player dodges hostile shots which would pass closer than that:
+DODGE_DISTANCE = 60
+HORIZONTAL = (arcade.key.A, arcade.key.D, None)
+VERTICAL = (arcade.key.W, arcade.key.S, None)
+METRICS = ("survival", "score", "accuracy", "destroyed")
+LEVELS = (10, 50, 90)  # percentiles of metrics in the report
+FIELDS = ("seed", "player", "frames", "survival", "survived", "score",
+          "shots_fired", "hits", "accuracy", "destroyed", "difficulty")
+
+
+class Player(abc.ABC):
+    """
+    Base class of the automated players. Player holds keys, like a human
+    would, and changes them every 'interval' frames.
+    """
+
+    interval = DECISION_INTERVAL
+
+    def __init__(self, seed: int):
+        """
+        :param seed: int -- seed of the session, player's decisions use their
+        own generator, so game logic gets the same random numbers
+        """
+        self.rng = random.Random(f"player-{seed}")
+        self.keys = []
+
+    def start(self, session: game.Game):
+        """Start shooting, player never stops it."""
+        session.on_key_press(arcade.key.SPACE, 0)
+
+    def hold(self, session: game.Game, keys: list):
+        """
+        Release keys held before, which are not in the new keys, and press
+        the new ones.
+
+        :param session: Game instance
+        :param keys: list -- arcade.key codes, None for no key
+        """
+        keys = [key for key in keys if key is not None]
+        for key in self.keys:
+            if key not in keys:
+                session.on_key_release(key, 0)
+        for key in keys:
+            if key not in self.keys:
+                session.on_key_press(key, 0)
+        self.keys = keys
+
+    def act(self, session: game.Game, frame: int):
+        """
+        Decide which keys should be pressed before the next tick.
+
+        :param session: Game instance
+        :param frame: int -- number of the frame
+        """
+        if frame % self.interval == 0:
+            self.hold(session, self.decide(session))
+        if frame % DECISION_INTERVAL == 0 and session.player.rockets > 0 \
+                and session.hostiles and self.rng.random() < ROCKET_CHANCE:
+            session.on_key_press(arcade.key.R, 0)
+
+    @abc.abstractmethod
+    def decide(self, session: game.Game):
+        """
+        :param session: Game instance
+        :return: list -- arcade.key codes of the keys to hold
+        """
+
+
+class RandomPlayer(Player):
+    """Moves in random directions."""
+
+    def decide(self, session: game.Game):
+        return [self.rng.choice(HORIZONTAL), self.rng.choice(VERTICAL)]
+
+
+class ScriptedPlayer(Player):
+    """
+    Stays in the lower part of the screen and dodges hostile shots, which
+    would cross it's line close to it. When there are none, it follows the
+    nearest hostile ship, aiming ahead of it, where the ship would be when
+    the laser reaches it. Decides each frame, as dodging requires.
+    """
+
+    interval = 1
+
+    def decide(self, session: game.Game):
+        ship = session.player
+        x, y = ship.center_x, ship.center_y
+        threat = self.nearest_threat(session, x, y)
+        horizontal = None
+        if threat is not None:
+            left = threat > x
+            if x < game.MARGIN + DODGE_DISTANCE:
+                left = False
+            elif x > game.SCREEN_WIDTH - game.MARGIN - DODGE_DISTANCE:
+                left = True
+            horizontal = arcade.key.A if left else arcade.key.D
+        elif session.hostiles:
+            target = min(session.hostiles, key=lambda hostile:
+                         abs(hostile.center_x - x))
+            speed = game.weapons[game.SPEED][game.player[game.WEAPON]]
+            lead = target.change_x * (target.center_y - y) / speed
+            distance = target.center_x + lead - x
+            if distance > AIM_TOLERANCE:
+                horizontal = arcade.key.D
+            elif distance < -AIM_TOLERANCE:
+                horizontal = arcade.key.A
+        vertical = arcade.key.S if y > game.SCREEN_HEIGHT / 4 else None
+        return [horizontal, vertical]
+
+    @staticmethod
+    def nearest_threat(session: game.Game, x: float, y: float):
+        """
+        Find the hostile shot which would be the first to cross the player's
+        line closer than DODGE_DISTANCE.
+
+        :param session: Game instance
+        :param x: float -- x coordinate of the player's ship
+        :param y: float -- y coordinate of the player's ship
+        :return: float or None -- x coordinate, where the shot would cross
+        the line
+        """
+        threat, soonest = None, None
+        for shot in session.projectiles:
+            if shot.change_y >= 0 or shot.center_y < y:
+                continue  # player's shot, or it already passed
+            frames = (shot.center_y - y) / -shot.change_y
+            crossing = shot.center_x + shot.change_x * frames
+            if abs(crossing - x) < DODGE_DISTANCE and (
+                    soonest is None or frames < soonest):
+                threat, soonest = crossing, frames
+        return threat
+
+
+PLAYERS = {"random": RandomPlayer, "scripted": ScriptedPlayer}
+
+
+def run_session(task: tuple):
+    """
+    Play a single game session, until player's ship is destroyed or time is
+    over.
+
+    :param task: tuple -- seed, name of the player, maximum number of
+    frames, config path and file name, and if batched AI should be used
+    :return: dict -- results of the session
+    """
+    seed, player_name, frames, config_path, config_file, batched_ai = task
+    session = game.run_headless(0, seed=seed, batched_ai=batched_ai,
+                                config_path=config_path,
+                                config_file=config_file)
+    player = PLAYERS[player_name](seed)
+    player.start(session)
+    frame = 0
+    while frame < frames and session.players:
+        player.act(session, frame)
+        session.tick()
+        frame += 1
+    return {"seed": seed, "player": player_name, "frames": frame,
+            "survival": frame / game.FPS, "survived": bool(session.players),
+            "score": session.score, "shots_fired": session.shots_fired,
+            "hits": session.hits,
+            "accuracy": session.hits / session.shots_fired if
+            session.shots_fired else 0.0,
+            "destroyed": session.destroyed,
+            "difficulty": session.difficulty}
+
+
+def run_batch(sessions: int, processes: int = None, player: str = "random",
+              frames: int = SESSION_TIME * game.FPS, seed: int = 0,
+              config_path: str = game.CONFIG_PATH,
+              config_file: str = game.CONFIG_FILE,
+              batched_ai: bool = False):
+    """
+    Play many sessions over a pool of processes.
+
+    :param sessions: int -- number of the sessions
+    :param processes: int -- number of the processes, all the CPU cores by
+    default, 1 plays all the sessions in this process
+    :param player: str -- name of the player from PLAYERS
+    :param frames: int -- maximum number of frames of each session
+    :param seed: int -- seed of the first session, next ones get following
+    numbers, so batch is repeatable
+    :param config_path: str -- path of the directory containing config file
+    :param config_file: str -- name of the config file
+    :param batched_ai: bool -- update hostiles with HostilesAI engine
+    :return: list of dicts -- results of the sessions, ordered by seed
+    """
+    tasks = [(seed + i, player, frames, config_path, config_file,
+              batched_ai) for i in range(sessions)]
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        results = [run_session(task) for task in tasks]
+    else:
+        # fork shares already imported game and loaded textures:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context(
+            "fork" if "fork" in methods else None)
+        chunk = max(1, sessions // (processes * 8))
+        with context.Pool(processes) as pool:
+            results = list(pool.imap_unordered(run_session, tasks, chunk))
+    return sorted(results, key=lambda result: result["seed"])
+
+
+def percentiles(values: list, levels: tuple = LEVELS):
+    """
+    :param values: list -- values of the metric
+    :param levels: tuple -- requested percentiles
+    :return: tuple -- values of the percentiles
+    """
+    values = sorted(values)
+    last = len(values) - 1
+    return tuple(values[round(last * level / 100)] for level in levels)
+
+
+def aggregate(results: list):
+    """
+    :param results: list of dicts -- results of the sessions
+    :return: dict -- number of sessions, fraction of the sessions player
+    survived, mean and percentiles of each metric, and number of sessions
+    which reached each difficulty level
+    """
+    report = {"sessions": len(results),
+              "survived": sum(result["survived"] for result in results) /
+              len(results),
+              "difficulty": dict(sorted(Counter(
+                  result["difficulty"] for result in results).items()))}
+    for metric in METRICS:
+        values = [result[metric] for result in results]
+        report[metric] = (sum(values) / len(values),) + percentiles(values)
+    return report
+
+
+def format_report(report: dict):
+    """
+    :param report: dict -- aggregated results returned by aggregate()
+    :return: str -- report as a text table
+    """
+    lines = [f"sessions: {report['sessions']}, survived: "
+             f"{report['survived']:.1%}",
+             f"{'metric':<12}{'mean':>10}" + "".join(
+                 f"{'p' + str(level):>10}" for level in LEVELS)]
+    for metric in METRICS:
+        lines.append(f"{metric:<12}" + "".join(
+            f"{value:>10.2f}" for value in report[metric]))
+    lines.append("difficulty reached: " + ", ".join(
+        f"{level}: {count}" for level, count in report["difficulty"].items()))
+    return "\n".join(lines)
+
+
+def save_csv(path: str, results: list):
+    """
+    Write results of each session as a row of the CSV file.
+
+    :param path: str -- path of the CSV file
+    :param results: list of dicts -- results of the sessions
+    """
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main(arguments: list = None):
+    """
+    Command line interface of the batch runner.
+
+    :param arguments: list -- command line arguments, sys.argv by default
+    :return: int -- exit status
+    """
+    parser = argparse.ArgumentParser(
+        description="Play many headless game sessions and report results.")
+    parser.add_argument("--sessions", type=int, default=1000,
+                        help="number of the sessions")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="number of the processes (all CPU cores)")
+    parser.add_argument("--player", choices=sorted(PLAYERS),
+                        default="random", help="automated player")
+    parser.add_argument("--time", type=int, default=SESSION_TIME,
+                        help="maximum game time of a session in seconds")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the first session")
+    parser.add_argument("--config", metavar="FILE",
+                        default=game.CONFIG_PATH + game.CONFIG_FILE,
+                        help="config file to balance")
+    parser.add_argument("--batched-ai", action="store_true",
+                        help="update all hostile ships at once with NumPy")
+    parser.add_argument("--csv", metavar="FILE",
+                        help="write results of each session to CSV file")
+    arguments = parser.parse_args(arguments)
+    # loading config changes working directory, so paths are fixed first:
+    config = os.path.abspath(arguments.config)
+    csv_path = os.path.abspath(arguments.csv) if arguments.csv else None
+    results = run_batch(arguments.sessions, arguments.processes,
+                        arguments.player, arguments.time * game.FPS,
+                        arguments.seed, os.path.dirname(config) + "/",
+                        os.path.basename(config), arguments.batched_ai)
+    if csv_path is not None:
+        save_csv(csv_path, results)
+    print(format_report(aggregate(results)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Benchmark of the projectiles-to-ships collision checks: brute-force
+arcade.check_for_collision_with_list() compared with the SpatialHash
+broad-phase used by the game. Run from the repository root:
+
+python benchmarks/bench_collisions.py
+"""
+import os
+import sys
+import random
+import timeit
+
+os.environ.setdefault("RED_INVADERS_HEADLESS", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import game
+
+HOSTILES = 50
+PROJECTILES = (100, 500, 1000, 2000)
+REPEATS = 5
+
+
+def setup_battle(projectiles_count: int):
+    """Spawn hostiles and player's shots scattered over the whole screen."""
+    battle = game.run_headless(0, seed=1)
+    for _ in range(HOSTILES):
+        battle.spawn_hostile()
+        hostile = battle.hostiles[-1]
+        hostile.center_y = random.uniform(game.SCREEN_HEIGHT / 2,
+                                          game.SCREEN_HEIGHT)
+    for _ in range(projectiles_count):
+        position = ["", random.uniform(0, game.SCREEN_HEIGHT),
+                    random.uniform(0, game.SCREEN_WIDTH)]
+        battle.projectiles.append(
+            game.Projectile(game.player[game.WEAPON], 1, game.UPWARD,
+                            position))
+    battle.update_collision_grids()
+    return battle
+
+
+def brute_force(battle):
+    for projectile in battle.projectiles:
+        game.arcade.check_for_collision_with_list(projectile, battle.hostiles)
+
+
+def spatial_hash(battle):
+    battle.update_collision_grids()
+    for projectile in battle.projectiles:
+        battle.hostiles_grid.check_for_collision(projectile)
+
+
+if __name__ == "__main__":
+    print(f"{HOSTILES} hostiles, time per frame in milliseconds:")
+    print("projectiles  brute-force  spatial-hash  speedup")
+    for count in PROJECTILES:
+        battle = setup_battle(count)
+        brute = min(timeit.repeat(lambda: brute_force(battle), number=1,
+                                  repeat=REPEATS)) * 1000
+        grid = min(timeit.repeat(lambda: spatial_hash(battle), number=1,
+                                 repeat=REPEATS)) * 1000
+        print(f"{count:>11}  {brute:>11.2f}  {grid:>12.2f}  "
+              f"{brute / grid:>6.1f}x")
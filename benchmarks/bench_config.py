@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""
+Benchmark of the game config loading at startup: parsing game_config.txt
+each time, compared with loading it from the compiled cache. Config is
+copied to the temporary directory, so the cache of the game is not touched.
+Parsing time of generated configs with growing number of hostiles types is
+measured too, it should grow linearly. Run from the repository root:
+
+python benchmarks/bench_config.py
+"""
+import os
+import sys
+import shutil
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config_loader.config_loader import load_config_from_file, \
+    parse_config
+
+CONFIG = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), "config_files", "game_config.txt")
+NUMBER = 200
+REPEATS = 5
+HOSTILES_TYPES = (100, 1000, 10000)
+
+
+def generate_config(count: int):
+    """Create lines of config describing the number of hostiles types."""
+    names = [f"hostile_ship_{i}" for i in range(count)]
+    return ["enemies_config:",
+            f"hostiles = [{', '.join(names)}]",
+            "speed = {" + ", ".join(f"{n}: 0.8" for n in names) + "}",
+            "weapon = {" + ", ".join(
+                f"{n}: [1, hostile_laser_red]" for n in names) + "}",
+            "turrets = {" + ", ".join(
+                f"{n}: [[turret_small, hostile_laser_red, 0, -12, 90, 1]]"
+                for n in names) + "}",
+            "EOF"]
+
+
+if __name__ == "__main__":
+    cwd, path = os.getcwd(), tempfile.mkdtemp()
+    shutil.copy(CONFIG, path)
+    try:
+        parsing = min(timeit.repeat(
+            lambda: load_config_from_file(path, "game_config.txt", False),
+            number=NUMBER, repeat=REPEATS)) / NUMBER
+        load_config_from_file(path, "game_config.txt")
+        cached = min(timeit.repeat(
+            lambda: load_config_from_file(path, "game_config.txt"),
+            number=NUMBER, repeat=REPEATS)) / NUMBER
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(path)
+    print("config loading time in milliseconds:")
+    print(f"parsing: {parsing * 1000:.3f}  cached: {cached * 1000:.3f}  "
+          f"speedup: {parsing / cached:.1f}x")
+    print("hostiles types  parsing [ms]  per type [us]")
+    for count in HOSTILES_TYPES:
+        lines = generate_config(count)
+        parsing = min(timeit.repeat(lambda: parse_config(lines), number=1,
+                                    repeat=REPEATS))
+        print(f"{count:>14}  {parsing * 1000:>12.2f}  "
+              f"{parsing * 1e6 / count:>13.2f}")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Benchmark of the hostile ships AI: Hostile.update() called for each ship
+compared with the HostilesAI engine updating all the ships at once. Run from
+the repository root:
+
+python benchmarks/bench_hostiles_ai.py
+"""
+import os
+import sys
+import random
+import timeit
+
+os.environ.setdefault("RED_INVADERS_HEADLESS", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import game
+
+HOSTILES = (10, 50, 200, 1000)
+PROJECTILES = 50
+FRAMES = 20
+REPEATS = 5
+
+
+def setup_battle(hostiles_count: int, batched_ai: bool):
+    """Spawn hostiles over the upper half of the screen and player's shots."""
+    battle = game.run_headless(0, seed=1, batched_ai=batched_ai)
+    for _ in range(hostiles_count):
+        battle.spawn_hostile()
+        hostile = battle.hostiles[-1]
+        hostile.center_y = random.uniform(game.SCREEN_HEIGHT / 2,
+                                          game.SCREEN_HEIGHT)
+        if batched_ai:
+            battle.hostiles_ai.y[hostile.ai_index] = hostile.center_y
+    for _ in range(PROJECTILES):
+        position = ["", random.uniform(0, game.SCREEN_HEIGHT / 2),
+                    random.uniform(0, game.SCREEN_WIDTH)]
+        battle.projectiles.append(
+            game.Projectile(game.player[game.WEAPON], 1, game.UPWARD,
+                            position))
+    return battle
+
+
+def update_hostiles(battle):
+    # projectiles shot by hostiles are dropped, so each frame does the same
+    # amount of work:
+    projectiles = list(battle.projectiles)
+    for _ in range(FRAMES):
+        battle.game_time += 1
+        battle.threat_index.rebuild(battle.projectiles)
+        if battle.hostiles_ai is not None:
+            battle.update_hostiles_ai()
+        battle.hostiles.update()
+    for projectile in battle.projectiles[len(projectiles):]:
+        projectile.kill()
+
+
+if __name__ == "__main__":
+    print(f"{PROJECTILES} player's shots, time per frame in milliseconds:")
+    print("hostiles  per-ship  batched  speedup")
+    for count in HOSTILES:
+        results = []
+        for batched_ai in (False, True):
+            battle = setup_battle(count, batched_ai)
+            results.append(min(timeit.repeat(
+                lambda: update_hostiles(battle), number=1,
+                repeat=REPEATS)) * 1000 / FRAMES)
+        per_ship, batched = results
+        print(f"{count:>8}  {per_ship:>8.2f}  {batched:>7.2f}  "
+              f"{per_ship / batched:>6.1f}x")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""
+Benchmark of observing the game by the BotControllers: naive observation,
+which builds new NumPy arrays from lists each tick, compared with the
+Observation refilling it's preallocated buffer. Besides time, the peak of
+memory allocated by a single observation is measured with tracemalloc. Run
+from the repository root:
+
+python benchmarks/bench_observation.py
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+
+os.environ.setdefault("RED_INVADERS_HEADLESS", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import game
+
+HOSTILES = (10, 30, 60)
+SHOTS_PER_HOSTILE = 3
+TICKS = 1000
+
+
+def setup_battle(hostiles_count: int):
+    battle = game.run_headless(0, seed=1)
+    for _ in range(hostiles_count):
+        battle.spawn_hostile()
+    for hostile in list(battle.hostiles):
+        for _ in range(SHOTS_PER_HOSTILE):
+            battle.projectiles.append(battle.projectiles_pool.acquire(
+                "hostile_laser_red", 1, game.DOWNWARD, [0, hostile.center_y,
+                                                        hostile.center_x]))
+    return battle
+
+
+def naive_observation(battle: game.Game):
+    def rows(sprites):
+        return game.numpy.array(
+            [(s.center_x, s.center_y, s.change_x, s.change_y) for s in
+             sprites], dtype=game.numpy.float32).reshape(-1, 4)
+    return (rows([battle.player]), rows(battle.hostiles),
+            rows(battle.projectiles), rows(battle.powerups))
+
+
+def peak_memory(function):
+    function()  # warm up
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+if __name__ == "__main__":
+    print(f"time of {TICKS} observations in milliseconds, and peak memory "
+          f"allocated by one in bytes:")
+    print(" objects     naive   bytes  Observation   bytes  speedup")
+    for count in HOSTILES:
+        battle = setup_battle(count)
+        observation = game.Observation()
+        objects = len(battle.hostiles) + len(battle.projectiles) + 1
+        old = min(timeit.repeat(lambda: naive_observation(battle),
+                                number=TICKS, repeat=3)) * 1000
+        new = min(timeit.repeat(lambda: observation.update(battle),
+                                number=TICKS, repeat=3)) * 1000
+        old_peak = peak_memory(lambda: naive_observation(battle))
+        new_peak = peak_memory(lambda: observation.update(battle))
+        print(f"{objects:>8}  {old:>8.2f}  {old_peak:>6}  {new:>11.2f}  "
+              f"{new_peak:>6}  {old / new:>6.1f}x")
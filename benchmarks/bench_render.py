@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+Benchmark of preparing 1000 on-screen sprites for drawing: arcade.SpriteList,
+which rebuilds it's whole buffer and textures atlas each time a sprite joins
+or leaves it, compared with the SpriteBatch of the RenderLayer, which writes
+only the changed slots. Each frame all the sprites move, and some shots are
+replaced by the new ones. Drawing requires a GL context, so GL objects
+created by arcade are replaced with stubs, and only the CPU work is
+measured. Run from the repository root:
+
+python benchmarks/bench_render.py
+"""
+import os
+import sys
+import timeit
+from unittest import mock
+
+os.environ.setdefault("RED_INVADERS_HEADLESS", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import game
+
+from render_layer.render_layer import RenderLayer
+
+SPRITES = 1000
+LISTS = 6
+CHURN = (0, 10, 50)  # shots replaced in each frame
+FRAMES = 45
+
+
+def create_sprites(count: int):
+    names = ("shots/hostile_laser_red", "shots/player_laser_blue",
+             "hostiles/hostile_ship_1",
+             "hostiles/hostile_ship_2", "explosion/explosion0000",
+             "player_ship/player_ship")
+    sprites = []
+    for i in range(count):
+        sprite = game.SpaceObject(names[i % len(names)])
+        sprite.position = [i % game.SCREEN_WIDTH, i % game.SCREEN_HEIGHT]
+        sprites.append(sprite)
+    return sprites
+
+
+def frame(lists: list, spare: list, churn: int, prepare):
+    """
+    Move all the sprites, replace 'churn' of them in the first list with
+    the spare ones, and prepare all the lists for drawing.
+
+    :return: int -- bytes which would be sent to the GPU
+    """
+    for sprite_list in lists:
+        for sprite in sprite_list:
+            sprite.center_y += 1
+    shots = lists[0]
+    for _ in range(churn):
+        old = shots[0]
+        old.kill()
+        shots.append(spare.pop())
+        spare.insert(0, old)
+    return sum(prepare(sprite_list) for sprite_list in lists)
+
+
+def prepare_legacy(sprite_list):
+    """What arcade.SpriteList.draw() does before the draw call."""
+    if len(sprite_list) == 0:
+        return 0
+    if sprite_list.vao is None:
+        sprite_list._calculate_sprite_buffer()
+    return len(sprite_list.sprite_data.tobytes())
+
+
+def prepare_batch(batch):
+    return sum(len(data) for _, _, data in batch.prepare())
+
+
+def fill(lists: list, sprites: list):
+    for i, sprite in enumerate(sprites):
+        lists[i % len(lists)].append(sprite)
+
+
+def measure(lists: list, prepare, churn: int):
+    spare = create_sprites(churn * 2)
+    fill(lists, create_sprites(SPRITES))
+    uploaded = [frame(lists, spare, churn, prepare)]
+    seconds = min(timeit.repeat(
+        lambda: uploaded.append(frame(lists, spare, churn, prepare)),
+        number=FRAMES, repeat=3))
+    return seconds * 1000, uploaded[-1]
+
+
+if __name__ == "__main__":
+    print(f"{SPRITES} sprites in {LISTS} lists, time of {FRAMES} frames "
+          f"(1 second) in milliseconds, and bytes uploaded per frame:")
+    print(" churn  SpriteList     bytes  SpriteBatch     bytes  speedup")
+    stubs = (mock.patch("arcade.shader.texture"),
+             mock.patch("arcade.shader.buffer"),
+             mock.patch("arcade.shader.vertex_array"))
+    for churn in CHURN:
+        for stub in stubs:
+            stub.start()
+        old, old_bytes = measure(
+            [game.arcade.SpriteList() for _ in range(LISTS)], prepare_legacy,
+            churn)
+        for stub in stubs:
+            stub.stop()
+        layer = RenderLayer()
+        new, new_bytes = measure(
+            [layer.create_batch() for _ in range(LISTS)], prepare_batch,
+            churn)
+        print(f"{churn:>6}  {old:>10.2f}  {old_bytes:>8}  {new:>11.2f}  "
+              f"{new_bytes:>8}  {old / new:>6.1f}x")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""
+Benchmark of the background stars: previous dict-of-lists implementation of
+Game.create_stars() and Game.scroll_stars() compared with the vectorised
+Starfield. Drawing requires a GL context, so only preparing the vertices
+is measured for the Starfield. Run from the repository root:
+
+python benchmarks/bench_starfield.py
+"""
+import os
+import sys
+import random
+import timeit
+
+os.environ.setdefault("RED_INVADERS_HEADLESS", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import game
+
+SCREENS = ((1280, 720), (1920, 1080), (3840, 2160))
+FRAMES = 45
+
+
+def create_legacy_stars(width: int, height: int):
+    """Stars as they were created before: dict of dicts of lists."""
+    stars = {game.WHITE: {1: [], 2: [], 3: []},
+             game.BLUE: {1: [], 2: [], 3: []},
+             game.RED: {1: [], 2: [], 3: []},
+             game.YELLOW: {1: [], 2: [], 3: []}}
+    for row in range(width):
+        for i in range(game.STARS_DENSITY):
+            star = [random.randint(0, width), row,
+                    random.choice(game.STAR_SIZES),
+                    random.choice(game.STARS_COLORS), random.random()]
+            stars[star[3]][star[2]].append(star)
+    return stars
+
+
+def scroll_legacy_stars(stars: dict, width: int, height: int):
+    for color in stars:
+        for size in stars[color]:
+            for star in stars[color][size]:
+                star[1] -= game.BACKGROUND_SPEED * star[4]
+                if star[1] < 0:
+                    star[1] = height + 1
+                    star[0] = random.randint(0, width)
+
+
+def points_for_legacy_stars(stars: dict):
+    """What arcade.draw_points() did for each color and size of stars."""
+    for color in stars:
+        for size in stars[color]:
+            game.arcade.draw_commands._get_points_for_points(
+                stars[color][size], size)
+
+
+def legacy_frame(stars: dict, width: int, height: int):
+    scroll_legacy_stars(stars, width, height)
+    points_for_legacy_stars(stars)
+
+
+def starfield_frame(starfield: game.Starfield):
+    starfield.scroll()
+    starfield.update_vertices()
+
+
+if __name__ == "__main__":
+    print(f"time of {FRAMES} frames (1 second) in milliseconds:")
+    print("   screen    stars  dict-of-lists  starfield  speedup")
+    for width, height in SCREENS:
+        legacy = create_legacy_stars(width, height)
+        starfield = game.Starfield(width, height, 1)
+        old = min(timeit.repeat(lambda: legacy_frame(legacy, width, height),
+                                number=FRAMES, repeat=3)) * 1000
+        new = min(timeit.repeat(lambda: starfield_frame(starfield),
+                                number=FRAMES, repeat=3)) * 1000
+        print(f"{width:>5}x{height:<4}  {len(starfield):>5}  {old:>13.2f}  "
+              f"{new:>9.2f}  {old / new:>6.1f}x")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""
+Benchmark of the hostiles looking for player's shots to avoid: each hostile
+scanning all the projectiles, compared with the ThreatIndex rebuilt once per
+frame and queried by each hostile. Numbers of hostiles and of projectiles
+grow together with the width of the battlefield, so the density of objects
+is constant: the scan time grows quadratically, and the index time linearly.
+Run from the repository root:
+
+python benchmarks/bench_threats.py
+"""
+import os
+import sys
+import random
+import timeit
+
+os.environ.setdefault("RED_INVADERS_HEADLESS", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import game
+
+OBJECTS = (50, 100, 200, 400, 800)
+REPEATS = 5
+
+
+def setup_battle(count: int):
+    """Spawn hostiles and as many player's shots over the battlefield."""
+    battle = game.run_headless(0, seed=1)
+    width = game.SCREEN_WIDTH * count / OBJECTS[0]
+    for _ in range(count):
+        battle.spawn_hostile()
+        hostile = battle.hostiles[-1]
+        hostile.position = [random.uniform(0, width),
+                            random.uniform(0, game.SCREEN_HEIGHT)]
+    for _ in range(count):
+        position = ["", random.uniform(0, game.SCREEN_HEIGHT),
+                    random.uniform(0, width)]
+        battle.projectiles.append(
+            game.Projectile(game.player[game.WEAPON], 1, game.UPWARD,
+                            position))
+    return battle
+
+
+def scan(battle):
+    for hostile in battle.hostiles:
+        [projectile for projectile in battle.projectiles if
+         projectile.angle == game.UPWARD and
+         projectile.center_y < hostile.center_y and
+         abs(hostile.center_x - projectile.center_x) < game.THREAT_DISTANCE]
+
+
+def threat_index(battle):
+    battle.threat_index.rebuild(battle.projectiles)
+    for hostile in battle.hostiles:
+        battle.threat_index.nearest(hostile.center_x, hostile.center_y)
+
+
+if __name__ == "__main__":
+    print("time per frame in milliseconds, and per object in microseconds:")
+    print("hostiles+shots     scan  index  scan/obj  index/obj")
+    for count in OBJECTS:
+        battle = setup_battle(count)
+        scanning = min(timeit.repeat(lambda: scan(battle), number=1,
+                                     repeat=REPEATS))
+        indexing = min(timeit.repeat(lambda: threat_index(battle), number=1,
+                                     repeat=REPEATS))
+        print(f"{count:>14}  {scanning * 1000:>7.2f}  {indexing * 1000:>5.2f}"
+              f"  {scanning * 1e6 / count:>8.1f}  "
+              f"{indexing * 1e6 / count:>9.1f}")
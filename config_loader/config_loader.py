@@ -1,7 +1,17 @@
 import os
+import re
+import sys
+import pickle
+import hashlib
+import argparse
 
+# compiled config is saved next to the source file, with this extension:
+CACHE_EXTENSION = ".cache"
+# raise it each time format of the compiled configs or the parser changes:
+CACHE_VERSION = 2
 
-def load_config_from_file(path: str, file: str):
+
+def load_config_from_file(path: str, file: str, use_cache: bool = True):
     """
     Find, open and unpack data from config txt file into the internal data
     structures. Config file should be located in the 'config_files' directory.
@@ -10,121 +20,302 @@ def load_config_from_file(path: str, file: str):
     Data retrieved from files is processed to the lists and dicts, which are
     later used by object constructors in the classes and by methods of the
     Game class.
+    Parsed data is saved in compiled cache file next to the config file, and
+    loaded from there until config file is modified.
 
     :param path: str -- absolute path to the config file, for testing provide
     path to the test config files
     :param file: str -- name of the config file
+    :param use_cache: bool -- if compiled cache should be used and updated
     :return: dicts of lists and dicts -- various game-data in the same order
     you ordered your txt file
     """
     os.chdir(path)
-    unloaded = file_unload(file)
-    return convert_unloaded(unloaded)
+    configs = load_compiled(file) if use_cache else None
+    if configs is None:
+        configs = parse_config_file(file)
+        if use_cache:
+            save_compiled(file, configs)
+    return configs
 
 
-def file_unload(file: str):
+def file_digest(file: str):
     """
-    Open text file, read it's contents and write unpack them into list.
+    Calculate hash of the file contents.
 
-    :param file: str -- name of the config file
-    :return: list -- list of lines read from the file
+    :param file: str -- path of the file
+    :return: str -- hexadecimal SHA-1 digest
     """
-    unpacked_file = []
-    with open(file, "r") as f:
-        for line in f:
-            if line.startswith("#") or line == "\n":
-                continue
-            else:
-                unpacked_file.append(line.strip("\n"))
-    return unpacked_file
+    with open(file, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
 
 
-def convert_unloaded(unpacked_file: list):
+def save_compiled(file: str, configs: list, digest: str = None):
     """
-    Read lines extracted from config file one by one, identify them, set the
-    categories, subcategories, and transform strings to the correct data types
-    required by internal data structures.
+    Pickle parsed config data together with the modification time, size and
+    hash of the config file it was parsed from. Cache file is replaced
+    atomically, and it is not an error if it could not be written, e.g. in
+    read-only directory.
 
-    :param unpacked_file: list -- list of strings unpacked from file
-    :return: list of dicts and lists -- structured data in strict order from
-    the config file
+    :param file: str -- path of the config file
+    :param configs: list -- data returned by parse_config()
+    :param digest: str -- hash of the config file, if already known
     """
-    configs, category, subcategory, data = [], None, None, None
-    for line in unpacked_file:
-        if line.endswith(":") or line.endswith("EOF"):
-            if category is not None: configs.append(locals()[category])
-            category = line.strip(":")
-            locals()[category] = {}
-        else:
-            subcategory = line.split(" = ")[0]
-            data = line.split(" = ")[1]
-            if data.startswith("["):  # data is a list
-                locals()[category][subcategory] = unpack_list(data)
-            elif data.startswith("{"):  # data is a dict
-                locals()[category][subcategory] = unpack_dict(data)
-            else:
-                data_type = get_type(data)
-                locals()[category][subcategory] = data_type(data)
+    stat = os.stat(file)
+    entry = (CACHE_VERSION, stat.st_mtime_ns, stat.st_size,
+             digest or file_digest(file), configs)
+    temporary = file + CACHE_EXTENSION + ".tmp"
+    try:
+        with open(temporary, "wb") as f:
+            pickle.dump(entry, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, file + CACHE_EXTENSION)
+    except OSError:
+        pass
+
+
+def load_compiled(file: str):
+    """
+    Load config data from the compiled cache, if config file did not change
+    since it was compiled. When only modification time of the config file
+    changed, but not it's contents, cache is still valid and it is updated.
+
+    :param file: str -- path of the config file
+    :return: list or None -- data, as returned by parse_config(), or None
+    if there is no valid cache
+    """
+    try:
+        with open(file + CACHE_EXTENSION, "rb") as f:
+            version, mtime, size, digest, configs = pickle.load(f)
+        stat = os.stat(file)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError,
+            TypeError):
+        return None
+    if version != CACHE_VERSION:
+        return None
+    if (mtime, size) == (stat.st_mtime_ns, stat.st_size):
+        return configs
+    if digest == file_digest(file):
+        save_compiled(file, configs, digest)
+        return configs
+    return None
+
+
+def compile_config(file: str):
+    """
+    Parse config file and save it's compiled cache, even if cache was valid.
+
+    :param file: str -- path of the config file
+    :return: list -- parsed config data
+    """
+    configs = parse_config_file(file)
+    save_compiled(file, configs)
     return configs
 
 
-def unpack_list(string_: str):
+class ConfigError(ValueError):
+    """
+    Raised when config file breaks the rules of the format. Message starts
+    with the name of the file, line and column where the error was found.
     """
-    Recursively strip, split, translate and unpack provided string to the list.
 
-    :param string_: str -- string to be unpacked into the list
-    :return: list
+    def __init__(self, file: str, line: int, column: int, message: str):
+        super().__init__(f"{file}:{line}:{column}: {message}")
+        self.file, self.line, self.column = file, line, column
+
+
+# scalar ends where the next element of list or dict, or the key, starts:
+SCALAR = re.compile(r"[^,\[\]{}:]*")
+SPACES = re.compile(r"[ \t]*")
+INTEGER = re.compile(r"-?\d+")
+FLOAT = re.compile(r"-?(\d+\.\d*|\.\d+)")
+NUMBER_START = frozenset("-.0123456789")
+BOOLEANS = {"True": True, "False": False}
+
+
+def parse_config_file(file: str):
     """
-    list_ = []
-    string2 = string_.replace("[", "", 1).strip("]")
-    elements = string2.split("], ") if "[" in string2 else string2.split(", ")
-    for i in elements:
-        if i.startswith("["):
-            list_.append(unpack_list(i))
-        elif i.startswith("{"):
-            list_.append(unpack_dict(i))
-        else:
-            list_.append(get_type(i)(i))
-    return list_
+    Open config file and parse it.
+
+    :param file: str -- path of the config file
+    :return: list of dicts -- categories in order found in the file
+    """
+    with open(file, "r") as f:
+        return parse_config(f, file)
 
 
-def unpack_dict(string_: str):
+def parse_config(lines, file: str = "<config>"):
     """
-    Recursively strip, split, translate and unpack provided string to the dict.
+    Parse lines of the config file in a single pass. Each 'category:' line
+    starts new category, and each 'key = value' line adds value to the
+    current category. Lines starting with '#' and blank lines are ignored,
+    and 'EOF' line ends the config. Values are lists: [a, b], dicts:
+    {key: value, key2: value2}, which could be nested, or scalars converted
+    to int, float, bool or str.
 
-    :param string_: str -- string to be unpacked into the dict
-    :return: dict
+    :param lines: iterable of str -- lines of the config file
+    :param file: str -- name of the file used in error messages
+    :return: list of dicts -- categories in order found in the file
     """
-    dict_ = {}
-    string2 = string_.strip("{}")
-    elements = string2.split("], ") if "[" in string2 else string2.split(", ")
-    for i in elements:
-        key, value = i.split(": ")[0], i.split(": ")[1]
-        if value.startswith("["):
-            dict_[key] = unpack_list(value)
-        elif value.startswith("{"):
-            dict_[key] = unpack_dict(value)
+    configs, category = [], None
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        if line == "EOF":
+            break
+        if " = " not in line:
+            if not line.endswith(":"):
+                raise ConfigError(file, number, 1,
+                                  "expected 'category:' or 'key = value'")
+            category = {}
+            configs.append(category)
+            continue
+        if category is None:
+            raise ConfigError(file, number, 1, "value outside any category")
+        key, value = line.split(" = ", 1)
+        start = len(key) + 3
+        if value.startswith(("[", "{")):
+            category[key] = Parser(line, file, number).parse(start)
         else:
-            dict_[key] = get_type(value)(value)
-    return dict_
+            category[key] = convert_scalar(value.strip())
+    return configs
+
+
+class Parser:
+    """
+    Recursive-descent parser of a single value of the config, which reads
+    each character of the line only once.
+    """
+
+    def __init__(self, line: str, file: str, number: int):
+        """
+        :param line: str -- line containing the value
+        :param file: str -- name of the file used in error messages
+        :param number: int -- number of the line used in error messages
+        """
+        self.line, self.file, self.number = line, file, number
+
+    def error(self, position: int, message: str):
+        return ConfigError(self.file, self.number, position + 1, message)
+
+    def parse(self, position: int):
+        """
+        Parse the whole value, which must end the line.
+
+        :param position: int -- index of the first character of the value
+        :return: list or dict -- parsed value
+        """
+        value, position = self.value(position)
+        if position != len(self.line):
+            raise self.error(position, "unexpected text after value")
+        return value
+
+    def skip_spaces(self, position: int):
+        return SPACES.match(self.line, position).end()
 
+    def value(self, position: int):
+        """
+        :return: tuple -- parsed list, dict or scalar, and index of the first
+        character after it
+        """
+        position = self.skip_spaces(position)
+        char = self.line[position:position + 1]
+        if char == "[":
+            return self.sequence(position + 1, "]", self.value, [])
+        if char == "{":
+            return self.sequence(position + 1, "}", self.item, {})
+        end = SCALAR.match(self.line, position).end()
+        token = self.line[position:end].strip()
+        if not token:
+            raise self.error(position, "expected value")
+        return convert_scalar(token), end
 
-def get_type(string_: str):
+    def item(self, position: int):
+        """
+        :return: tuple -- (key, value) pair of dict, and index of the first
+        character after it
+        """
+        position = self.skip_spaces(position)
+        end = SCALAR.match(self.line, position).end()
+        key = self.line[position:end].strip()
+        if not key:
+            raise self.error(position, "expected key")
+        if self.line[end:end + 1] != ":":
+            raise self.error(end, "expected ':' after key")
+        value, position = self.value(end + 1)
+        return (key, value), position
+
+    def sequence(self, position: int, closing: str, element, container):
+        """
+        Parse elements separated with commas, until closing bracket.
+
+        :param position: int -- index of the first character after opening
+        bracket
+        :param closing: str -- ']' or '}'
+        :param element: method parsing single element
+        :param container: empty list or dict filled with elements
+        :return: tuple -- container and index of the first character after
+        closing bracket
+        """
+        position = self.skip_spaces(position)
+        if self.line[position:position + 1] == closing:
+            return container, position + 1
+        while True:
+            parsed, position = element(position)
+            if isinstance(container, dict):
+                container[parsed[0]] = parsed[1]
+            else:
+                container.append(parsed)
+            position = self.skip_spaces(position)
+            char = self.line[position:position + 1]
+            if char == closing:
+                return container, position + 1
+            if char != ",":
+                raise self.error(position, f"expected ',' or '{closing}'")
+            position += 1
+
+
+def convert_scalar(token: str):
     """
-    Find type into which provided string should be casted.
+    Convert single string to the type it represents.
 
-    :param string_: str -- single string to reformat
+    :param token: str -- single string to reformat
     :return: float, int, bool or str
     """
-    if "." in string_ and string_.replace(".", "").isdigit():
-        return float
-    elif string_.replace("-", "").isdigit():
-        return int
-    elif string_ in ("True", "False"):
-        return bool
-    else:
-        return str
+    if token[0] in NUMBER_START:
+        if INTEGER.fullmatch(token):
+            return int(token)
+        if FLOAT.fullmatch(token):
+            return float(token)
+    return BOOLEANS.get(token, token)
+
+
+def main(arguments: list = None):
+    """
+    Command line tool compiling config files in advance, e.g. when game is
+    installed:
+
+    python -m config_loader.config_loader config_files/game_config.txt
+
+    :param arguments: list -- command line arguments, sys.argv by default
+    :return: int -- exit status
+    """
+    parser = argparse.ArgumentParser(
+        description="Compile config files into cache used by the game.")
+    parser.add_argument("files", nargs="+", metavar="FILE",
+                        help="config file to compile")
+    status = 0
+    for file in parser.parse_args(arguments).files:
+        try:
+            configs = compile_config(file)
+        except (OSError, ValueError) as error:
+            print(f"{file}: {error}", file=sys.stderr)
+            status = 1
+        else:
+            print(f"{file}: compiled {len(configs)} sections into "
+                  f"{file + CACHE_EXTENSION}")
+    return status
 
 
 if __name__ == '__main__':
-    print("Is your config_loader in proper directory?")
+    sys.exit(main())
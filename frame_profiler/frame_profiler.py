@@ -0,0 +1,156 @@
+import csv
+import time
+
+from collections import deque
+
+
+class FrameProfiler:
+    """
+    Measure how long each phase of a frame (e.g. updating hostiles or
+    drawing stars) takes. Phases are measured with laps: start() marks the
+    beginning of the frame, and each lap() call assigns the time elapsed
+    since the previous mark to the named phase. When the frame ends, timings
+    are added to the rolling windows used to calculate percentiles, and
+    optionally written as a new row of the CSV file. Besides timings,
+    profiler counts events of each frame, e.g. draw calls.
+    """
+
+    TOTAL = "total"
+
+    def __init__(self, phases: tuple, window: int = 450,
+                 counters: tuple = ()):
+        """
+        :param phases: tuple -- names of all the measured phases in order
+        they are executed
+        :param window: int -- number of last frames used to calculate
+        percentiles
+        :param counters: tuple -- names of all the counted events
+        """
+        self.phases = phases
+        self.counters = counters
+        self.samples = {phase: deque(maxlen=window) for phase in
+                        phases + (FrameProfiler.TOTAL,)}
+        self.counts = {counter: deque(maxlen=window) for counter in counters}
+        self.current = {}
+        self.current_counts = {}
+        self.mark = 0.0
+        self.enabled = False
+        self.frame = 0
+        self.csv_file, self.csv_writer = None, None
+
+    def start(self):
+        """Mark the beginning of measured code."""
+        if self.enabled:
+            self.mark = time.perf_counter()
+
+    def lap(self, phase: str):
+        """
+        Assign time elapsed since the last mark to the phase, and set new
+        mark.
+
+        :param phase: str -- name of the phase
+        """
+        if self.enabled:
+            now = time.perf_counter()
+            self.current[phase] = self.current.get(phase, 0.0) + (
+                    now - self.mark)
+            self.mark = now
+
+    def count(self, counter: str, amount: int = 1):
+        """
+        Add events to the counter of the current frame.
+
+        :param counter: str -- name of the counter
+        :param amount: int -- number of the events
+        """
+        if self.enabled:
+            self.current_counts[counter] = self.current_counts.get(
+                counter, 0) + amount
+
+    def end_frame(self):
+        """
+        Save timings of all the phases measured since the last frame ended.
+        """
+        if not self.enabled:
+            return
+        self.frame += 1
+        current = self.current
+        current[FrameProfiler.TOTAL] = sum(current.values())
+        for phase, seconds in current.items():
+            self.samples[phase].append(seconds)
+        counts = [self.current_counts.get(counter, 0) for counter in
+                  self.counters]
+        for counter, count in zip(self.counters, counts):
+            self.counts[counter].append(count)
+        if self.csv_writer is not None:
+            self.csv_writer.writerow(
+                [self.frame] + [f"{current[phase] * 1000:.4f}" if phase in
+                                current else "" for phase in self.phases] +
+                [f"{current[FrameProfiler.TOTAL] * 1000:.4f}"] + counts)
+        self.current = {}
+        self.current_counts = {}
+
+    def percentiles(self, phase: str, levels: tuple = (50, 95, 99)):
+        """
+        Calculate percentiles of the phase duration in the rolling window.
+
+        :param phase: str -- name of the phase
+        :param levels: tuple -- requested percentiles
+        :return: tuple of floats -- durations in milliseconds, or None if the
+        phase was not measured yet
+        """
+        samples = self.select(self.samples[phase], levels)
+        if samples is None:
+            return None
+        return tuple(seconds * 1000 for seconds in samples)
+
+    @staticmethod
+    def select(samples, levels: tuple):
+        """
+        :param samples: iterable -- measured values
+        :param levels: tuple -- requested percentiles
+        :return: tuple -- values of the percentiles, or None if there are no
+        samples
+        """
+        samples = sorted(samples)
+        if not samples:
+            return None
+        last = len(samples) - 1
+        return tuple(samples[round(last * level / 100)] for level in levels)
+
+    def report(self):
+        """
+        :return: list of tuples -- phase name, and it's p50, p95 and p99
+        durations in milliseconds, for all the measured phases
+        """
+        return [(phase, *self.percentiles(phase)) for phase in
+                self.phases + (FrameProfiler.TOTAL,) if self.samples[phase]]
+
+    def counters_report(self):
+        """
+        :return: list of tuples -- counter name, and it's p50, p95 and p99
+        values per frame, for all the counters
+        """
+        return [(counter, *self.select(self.counts[counter], (50, 95, 99)))
+                for counter in self.counters if self.counts[counter]]
+
+    def open_csv(self, path: str):
+        """
+        Start streaming per-frame timings (in milliseconds) to the CSV file.
+        Turns the profiler on.
+
+        :param path: str -- path of the CSV file
+        """
+        self.close_csv()
+        self.csv_file = open(path, "w", newline="")
+        self.csv_writer = csv.writer(self.csv_file)
+        self.csv_writer.writerow(
+            ["frame"] + list(self.phases) + [FrameProfiler.TOTAL] +
+            list(self.counters))
+        self.enabled = True
+
+    def close_csv(self):
+        """Stop streaming timings and close the CSV file."""
+        if self.csv_file is not None:
+            self.csv_file.close()
+            self.csv_file, self.csv_writer = None, None
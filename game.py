@@ -3,9 +3,9 @@
 Simple, arcade space-shooter with pixel graphics made of basic Sprites. Written
  on Python 3.6 with Arcade 2.0.8 module.
 
-To save best scores shelve module is used, and scores are saved in a distinct
-file in the config_files directory. I also used pyautogui to get screen
-resolution.
+To save best scores score_store module is used, and scores are saved in a
+distinct file in the config_files directory. I also used pyautogui to get
+screen resolution.
 """
 __author__ = "Rafał Trąbski"
 __copyright__ = "Copyright 2019"
@@ -17,26 +17,55 @@ __email__ = "rafal.trabski@mises.pl"
 __status__ = "Development"
 
 import os
+import abc
 import math
+import heapq
+import bisect
+import argparse
 import string
 import random
-import shelve
+
+# headless mode runs game logic without a window, GL context, cursor or sound.
+# It must be known before arcade is imported, since pyglet opens it's shadow
+# window when arcade imports pyglet.gl:
+HEADLESS = os.environ.get("RED_INVADERS_HEADLESS", "0") == "1"
+if HEADLESS:
+    import pyglet
+    pyglet.options["shadow_window"] = False
+
+import numpy
 import arcade
-import pyautogui
 
 from functools import partial
+from pyglet import gl
 
 from simple_arcade_menu import SharedVariable, Cursor, Menu, SubMenu, Button, \
-    Slider, CheckBox
+    Slider, CheckBox, text_cache
 from config_loader.config_loader import load_config_from_file
+from frame_profiler.frame_profiler import FrameProfiler
+from sound_manager.sound_manager import SoundManager
+from score_store.score_store import ScoreStore, ScoresView
+from render_layer.render_layer import RenderLayer
+from replay.replay import ReplayRecorder, load_replay, replay_length, \
+    KEY_PRESS, KEY_RELEASE
 
 # constants:
 TITLE = "Red Invaders"
 # TODO: adjustment o window size to the different screen sizes [ ]
-SCREEN_WIDTH = pyautogui.size()[0]  # int(2048*0.9)
-SCREEN_HEIGHT = pyautogui.size()[1]  # int(1280*0.9)
+if HEADLESS:
+    # fixed screen size, e.g. RED_INVADERS_SCREEN=1920x1080:
+    SCREEN_WIDTH, SCREEN_HEIGHT = [int(size) for size in os.environ.get(
+        "RED_INVADERS_SCREEN", "1280x720").split("x")]
+else:
+    import pyautogui
+    SCREEN_WIDTH = pyautogui.size()[0]  # int(2048*0.9)
+    SCREEN_HEIGHT = pyautogui.size()[1]  # int(1280*0.9)
 SPRITES_SCALE = int(SCREEN_WIDTH / SCREEN_HEIGHT) * 1.5
-FPS = 45  # frames per second used by arcade.window to refresh the screen
+FPS = 45  # fixed number of game logic updates (ticks) per second
+RENDER_FPS = 60  # frames per second used by arcade.window to refresh screen
+MAX_TICKS_PER_FRAME = 5  # slower machine runs game in slow-motion instead
+# sprites moved farther in a tick (e.g. reused from pool) are not interpolated:
+MAX_INTERPOLATED_DISTANCE = 100
 MARGIN, SCORE_STRIPE = 40 * SPRITES_SCALE, 40
 BACKGROUND_SPEED = 0.3
 STARS_DENSITY = 1
@@ -47,10 +76,14 @@ STAR_SIZES = (1,)*4 + (2,)*2 + (3,)
 BACKGROUND_COLOR, GREEN = arcade.color.BLACK, arcade.color.BRIGHT_GREEN
 PATH = os.path.dirname(os.path.abspath(__file__))  # os.getcwd()
 GRAPHICS_PATH = PATH + "/graphics/"
+# directories of the graphics drawn by the RenderLayer:
+SPRITES_GRAPHICS = ("explosion", "hostiles", "player_ship", "powerups",
+                    "shots")
 SOUNDS_PATH = PATH + "/sounds/"
 CONFIG_PATH = PATH + "/config_files/"
 CONFIG_FILE = "game_config.txt"
-SCORES_FILE = "best_scores.data"
+SCORES_FILE = "best_scores.bin"
+LEGACY_SCORES_FILE = "best_scores.data"  # shelve file of older versions
 SPACESHIP_SPEED = 15
 SPACESHIP_STRAFE = 10
 LASER_GUN_SINGLE = "laser_single"
@@ -63,7 +96,9 @@ EXPLOSION = "explosion_sound"
 HIT_SOUND = "hit.wav"
 ROCKET_SOUND = "rocket"
 POWERUP_SOUND = "powerup.wav"
+EXPLOSIONS_SOUNDS = ("explosion.wav", "explosion_2.wav")
 POWERUP_TIME = 1800
+MAX_EXPLOSIONS = 16  # more explosions at once are animated with less frames
 POWERUP_CHANCE = 0
 POWERUP_ROCKETS_1, POWERUP_ROCKETS_2 = "powerup_rockets_1", "powerup_rockets_2"
 POWERUP_ROCKETS_3, POWERUP_LASER_DUAL = "powerup_rockets_3", "powerup_laser_dual"
@@ -75,11 +110,30 @@ LASERS, DAMAGES, SOUNDS, TYPES = "lasers", "damages", "sounds", "types"
 ROF, KINETIC = "rof", "kinetics"
 MAIN_MENU, INSTRUCTIONS, OPTIONS_MENU = "main", "instructions_menu", "options"
 MIN_DISTANCE, MAX_DISTANCE = "preferred_min_distance", "preferred_max_distance"
+WAVES, SPAWN_INTERVAL = "waves", "spawn_interval"
+BASE_RATING, ESCALATION_TIME = "base_rating", "escalation_time"
+COLLISION_CELL = 64 * SPRITES_SCALE  # size of SpatialHash cell in pixels
+THREAT_DISTANCE = 75  # hostiles avoid player's shots closer horizontally
+# maximum numbers of objects seen by the BotControllers:
+OBSERVED_HOSTILES, OBSERVED_SHOTS, OBSERVED_POWERUPS = 64, 256, 16
+SPRITES_LISTS = ("players", "hostiles", "projectiles", "powerups", "turrets",
+                 "explosions")
+# phases of tick() and on_draw() measured by the FrameProfiler:
+UPDATE_PHASES = ("controller", "spawning") + SPRITES_LISTS + (
+    "collision_grids", "targets_markers", "stars", "hints")
+DRAW_PHASES = ("draw_stars",) + tuple(
+    "draw_" + name for name in SPRITES_LISTS) + (
+    "draw_targets_markers", "draw_hints", "draw_hud")
+# per-frame counters of the FrameProfiler:
+TICKS, DRAW_CALLS = "ticks", "draw_calls"
 for _ in ("game", "settings", "player", "hostiles", "weapons", "levels",
           "powerups"):
     globals()[_] = None
-# global dict of sounds used in game:
-sounds = {}
+# sines and cosines of full degrees, used to find velocities of projectiles:
+SINES = tuple(math.sin(math.radians(degree)) for degree in range(360))
+COSINES = tuple(math.cos(math.radians(degree)) for degree in range(360))
+# global dict of textures used in game, each png file is loaded only once:
+textures = {}
 
 
 def get_image_path(filename: str):
@@ -94,25 +148,337 @@ def get_image_path(filename: str):
     return GRAPHICS_PATH + filename + ".png"
 
 
-def get_sound_path(filename: str):
+def get_texture(filename: str, scale: float = SPRITES_SCALE):
+    """
+    Get arcade.Texture from the process-wide textures registry. Image file is
+    read from disk only the first time texture is requested, and each scale
+    of the texture is a separate Texture object sharing the same image, so
+    Sprites never change scale of the textures used by other Sprites.
+
+    :param filename: str -- name of the texture file without extension,
+    relative to the graphics directory, e.g. 'hostiles/hostile_ship_1'
+    :param scale: float -- scale of the texture
+    :return: arcade.Texture
+    """
+    if (filename, scale) not in textures:
+        if filename not in textures:
+            textures[filename] = arcade.load_texture(get_image_path(filename))
+        image_texture = textures[filename]
+        texture = arcade.Texture(image_texture.name, image_texture.image)
+        texture.scale = scale
+        textures[(filename, scale)] = texture
+    return textures[(filename, scale)]
+
+
+def load_all_textures(path: str = GRAPHICS_PATH):
+    """
+    Read all the png images from the graphics directory into the textures
+    registry, so no image is loaded from disk when Sprites are spawned.
+
+    :param path: str -- absolute path of the graphics directory
+    """
+    for directory, _, files in os.walk(path):
+        for file in files:
+            if file.endswith(".png"):
+                name = os.path.relpath(os.path.join(directory, file), path)
+                get_texture(name[:-len(".png")].replace(os.sep, "/"))
+
+
+def sprites_textures():
+    """
+    :return: list of arcade.Textures -- textures of the gameplay Sprites
+    already loaded into the textures registry
+    """
+    return [texture for name, texture in textures.items() if
+            isinstance(name, str) and name.split("/")[0] in SPRITES_GRAPHICS]
+
+
+def sounds_manifest():
     """
-    Produce TESTS_PATH to the sound file, which name is provided as parameter.
+    List all the sounds game could play: sounds of all the weapons and of
+    the other effects, to decode them before they are needed.
 
-    :param filename: str -- name of the sound file
-    :return: str -- absolute TESTS_PATH of sound file
+    :return: list of str -- names of the sound files
     """
-    return SOUNDS_PATH + filename
+    return sorted(set(weapons[SOUNDS].values()) | {
+        HIT_SOUND, POWERUP_SOUND, *EXPLOSIONS_SOUNDS})
 
 
 def play_sound(sound: str):
     """
-    Play sound by arcade.sound module. Sounds are global arcade.sound objects.
+    Play sound by the SoundManager of the game.
+
+    :param sound: str -- name of the sound file
+    """
+    game.sound.play(sound)
+
+
+class SpatialHash:
+    """
+    Uniform grid used as a broad-phase of collision checks. Each Sprite is
+    registered in every cell it's bounding box overlaps, so to find Sprites
+    colliding with another one, we check only Sprites from the few cells
+    around it, instead of the whole arcade.SpriteList.
+    """
+
+    def __init__(self, cell_size: float = COLLISION_CELL):
+        """
+        :param cell_size: float -- width and height of a single grid cell in
+        pixels, should be bigger than most of the indexed Sprites
+        """
+        self.cell_size = cell_size
+        self.cells = {}
+        # cells each Sprite was put into, required to remove it quickly:
+        self.sprites = {}
 
-    :param sound: str -- name of the sound file without .wav extension
+    def __len__(self):
+        return len(self.sprites)
+
+    def cells_keys(self, sprite: arcade.Sprite):
+        """
+        Find all the grid cells overlapped by the bounding box of the Sprite.
+
+        :param sprite: arcade.Sprite -- indexed or queried Sprite
+        :return: list of tuples (int, int) -- keys of the cells
+        """
+        half = max(sprite.width, sprite.height) / 2
+        size = self.cell_size
+        min_x, max_x = int((sprite.center_x - half) // size), int(
+            (sprite.center_x + half) // size)
+        min_y, max_y = int((sprite.center_y - half) // size), int(
+            (sprite.center_y + half) // size)
+        return [(x, y) for x in range(min_x, max_x + 1) for y in
+                range(min_y, max_y + 1)]
+
+    def insert(self, sprite: arcade.Sprite):
+        """Register the Sprite in all the cells it overlaps."""
+        if sprite in self.sprites:
+            self.remove(sprite)
+        keys = self.cells_keys(sprite)
+        for key in keys:
+            if key in self.cells:
+                self.cells[key].append(sprite)
+            else:
+                self.cells[key] = [sprite]
+        self.sprites[sprite] = keys
+
+    def remove(self, sprite: arcade.Sprite):
+        """Forget the Sprite, e.g. when it was killed."""
+        if sprite in self.sprites:
+            for key in self.sprites.pop(sprite):
+                self.cells[key].remove(sprite)
+
+    def rebuild(self, sprites):
+        """
+        Clear the grid and index all the Sprites again in their current
+        positions. Called once per frame.
+
+        :param sprites: iterable of arcade.Sprite objects (e.g. SpriteList)
+        """
+        self.cells.clear()
+        self.sprites.clear()
+        for sprite in sprites:
+            self.insert(sprite)
+
+    def query(self, sprite: arcade.Sprite):
+        """
+        Find all the Sprites which share at least one cell with the queried
+        Sprite. These are only candidates for collision.
+
+        :param sprite: arcade.Sprite -- queried Sprite
+        :return: list -- candidates, in order they were indexed
+        """
+        candidates, seen = [], set()
+        for key in self.cells_keys(sprite):
+            for candidate in self.cells.get(key, ()):
+                if candidate not in seen:
+                    seen.add(candidate)
+                    candidates.append(candidate)
+        return candidates
+
+    def check_for_collision(self, sprite: arcade.Sprite):
+        """
+        Replacement of the arcade.check_for_collision_with_list() which
+        checks exact collisions only with the Sprites found in nearby cells.
+
+        :param sprite: arcade.Sprite -- Sprite to check collisions for
+        :return: list -- Sprites colliding with the checked one
+        """
+        return [candidate for candidate in self.query(sprite) if
+                candidate is not sprite and
+                arcade.check_for_collision(sprite, candidate)]
+
+
+class ThreatIndex:
+    """
+    Player's shots flying upward, indexed once per frame in columns as wide
+    as THREAT_DISTANCE, and sorted by y in each column. Hostile finds the
+    nearest shot below it looking into only three columns around it,
+    instead of checking all the projectiles, so each frame costs
+    O(projectiles log projectiles + hostiles).
     """
-    if sound not in sounds.keys():
-        sounds[sound] = arcade.load_sound(get_sound_path(sound))
-    arcade.play_sound(sounds[sound])
+
+    def __init__(self, distance: float = THREAT_DISTANCE):
+        """
+        :param distance: float -- how close horizontally shot must be to
+        threaten a ship
+        """
+        self.distance = distance
+        # column number: (list of y coordinates, list of Projectiles):
+        self.columns = {}
+        # (x, y) coordinates of all indexed shots:
+        self.shots = []
+
+    def __len__(self):
+        return len(self.shots)
+
+    def rebuild(self, projectiles):
+        """
+        Index upward-flying projectiles in their current positions.
+
+        :param projectiles: iterable of Projectile objects (e.g. SpriteList)
+        """
+        self.columns.clear()
+        upward = sorted((p for p in projectiles if p.angle == UPWARD),
+                        key=lambda p: p.center_y)
+        self.shots = [(p.center_x, p.center_y) for p in upward]
+        columns, distance = self.columns, self.distance
+        for projectile, (x, y) in zip(upward, self.shots):
+            column = int(x // distance)
+            if column in columns:
+                columns[column][0].append(y)
+                columns[column][1].append(projectile)
+            else:
+                columns[column] = ([y], [projectile])
+
+    def nearest(self, x: float, y: float):
+        """
+        Find the shot closest below the point, closer horizontally than the
+        distance. In each of the three columns the search starts from the
+        shot just below the point, found by bisection, and it usually ends
+        there.
+
+        :param x: float -- x coordinate of the threatened ship
+        :param y: float -- y coordinate of the threatened ship
+        :return: Projectile or None
+        """
+        nearest, nearest_y, distance = None, None, self.distance
+        column = int(x // distance)
+        for key in (column - 1, column, column + 1):
+            if key in self.columns:
+                ys, projectiles = self.columns[key]
+                i = bisect.bisect_left(ys, y) - 1
+                while i >= 0 and (nearest_y is None or ys[i] > nearest_y):
+                    if abs(x - projectiles[i].center_x) < distance:
+                        nearest, nearest_y = projectiles[i], ys[i]
+                        break
+                    i -= 1
+        return nearest
+
+
+class Starfield:
+    """
+    'Stars' displayed in the background. Instead of keeping each star as a
+    separate list, their x and y coordinates, speeds, sizes and colors are
+    kept in contiguous NumPy arrays, so scrolling all the stars is a single
+    vectorised operation, and drawing them requires only one draw call.
+    """
+
+    # each star is drawn as a triangle, like in arcade.draw_points():
+    VERTICES_OFFSETS = numpy.array([(-0.5, -0.5), (0.5, -0.5), (0.5, 0.5)],
+                                   dtype=numpy.float32)
+
+    def __init__(self, width: int, height: int, seed: int,
+                 density: int = STARS_DENSITY):
+        """
+        Generate new stars. As before, there are 'density' stars in each row
+        of pixels and the x coordinate of each star is random.
+
+        :param width: int -- width of the screen in pixels
+        :param height: int -- height of the screen in pixels
+        :param seed: int -- seed of the NumPy random numbers generator, taken
+        from the game's generator, so seeded games get the same sky
+        :param density: int -- number of stars per each row of pixels
+        """
+        self.width, self.height = width, height
+        self.generator = numpy.random.RandomState(seed)
+        count = width * density
+        colors = sorted(set(STARS_COLORS))
+        sizes = sorted(set(STAR_SIZES))
+        self.x = self.generator.randint(0, width + 1, count).astype(
+            numpy.float32)
+        self.y = numpy.repeat(numpy.arange(width, dtype=numpy.float32),
+                              density)
+        self.speed = self.generator.random_sample(count).astype(
+            numpy.float32)
+        self.size_index = numpy.array(
+            [sizes.index(size) for size in STAR_SIZES], dtype=numpy.uint8)[
+            self.generator.randint(0, len(STAR_SIZES), count)]
+        self.color_index = numpy.array(
+            [colors.index(color) for color in STARS_COLORS],
+            dtype=numpy.uint8)[
+            self.generator.randint(0, len(STARS_COLORS), count)]
+        # corners of each star triangle relative to it's position:
+        self.offsets = (Starfield.VERTICES_OFFSETS[None, :, :] * numpy.array(
+            sizes, dtype=numpy.float32)[self.size_index][:, None, None])
+        # vertex buffer data: colors never change, so they are set only once:
+        self.vertices = numpy.zeros(count * 3, dtype=[("vertex", "2f4"),
+                                                      ("color", "4B")])
+        self.vertices["color"] = numpy.repeat(numpy.array(
+            [arcade.get_four_byte_color(color) for color in colors],
+            dtype=numpy.uint8)[self.color_index], 3, axis=0)
+        self.program, self.buffer, self.vao = None, None, None
+
+    def __len__(self):
+        return len(self.x)
+
+    def scroll(self):
+        """
+        Move all the stars downward, and respawn stars which left the screen
+        at the top, in random x positions.
+        """
+        self.y -= BACKGROUND_SPEED * self.speed
+        fallen = numpy.flatnonzero(self.y < 0)
+        if len(fallen) > 0:
+            self.y[fallen] = self.height + 1
+            self.x[fallen] = self.generator.randint(0, self.width + 1,
+                                                    len(fallen))
+
+    def update_vertices(self):
+        """
+        Calculate triangles drawn for each star from current positions.
+
+        :return: numpy.ndarray -- vertex buffer data
+        """
+        vertices = self.vertices["vertex"].reshape(-1, 3, 2)
+        numpy.add(self.offsets[:, :, 0], self.x[:, None],
+                  out=vertices[:, :, 0])
+        numpy.add(self.offsets[:, :, 1], self.y[:, None],
+                  out=vertices[:, :, 1])
+        return self.vertices
+
+    def draw(self):
+        """
+        Display all the stars with a single draw call. Shader program and
+        vertex buffer are created once and the buffer is only refilled with
+        new positions each frame.
+        """
+        data = self.update_vertices().tobytes()
+        if self.vao is None:
+            self.program = arcade.shader.program(
+                vertex_shader=arcade.draw_commands.line_vertex_shader,
+                fragment_shader=arcade.draw_commands.line_fragment_shader)
+            self.buffer = arcade.shader.buffer(data, usage="stream")
+            self.vao = arcade.shader.vertex_array(self.program, [
+                arcade.shader.BufferDescription(self.buffer, "2f 4B",
+                                                ("in_vert", "in_color"),
+                                                normalized=["in_color"])])
+        else:
+            self.buffer.orphan()
+            self.buffer.write(data)
+        with self.vao:
+            self.program["Projection"] = arcade.get_projection().flatten()
+            self.vao.render(mode=gl.GL_TRIANGLES)
 
 
 class SpaceObject(arcade.Sprite):
@@ -120,17 +486,61 @@ class SpaceObject(arcade.Sprite):
     Each object generated in the game is a SpaceObject. It is basically a
     wrapper used to correctly spawn arcade.Sprite object with usage of
     helper function get_image_path().
+    SpaceObject could carry other objects attached to it (e.g. turrets of
+    the ship), which are moved with it by the TransformsSystem, and are
+    destroyed together with it.
     """
 
     def __init__(self, filename: str, size: int = 1):
         # this is what we need this base-class for:
-        super().__init__(get_image_path(filename), SPRITES_SCALE * size)
+        super().__init__(scale=SPRITES_SCALE * size)
+        self.texture = get_texture(filename, SPRITES_SCALE * size)
+        self.textures = [self.texture]
+        # cheaper to check than a membership in arcade.SpriteList:
+        self.alive = True
+        self.parent = None
+        self.children = []
+        # position of child's offset in TransformsSystem arrays:
+        self.transform_index = None
 
     def update(self):
         # guarantee that angle would be in range 0 to 360 degrees
         self.angle = self.angle % 360
         super().update()
 
+    def attach(self, child, offset_x: float, offset_y: float):
+        """
+        Attach other object to this one, so it keeps the same offset from
+        the center of this object, and is destroyed when this one is. Only
+        objects without parent could carry children, so all the parts of
+        the multi-part object should be attached to it's main part.
+
+        :param child: SpaceObject instance
+        :param offset_x: float -- horizontal offset of the child in pixels
+        :param offset_y: float -- vertical offset of the child in pixels,
+        positive upward
+        """
+        if self.parent is not None:
+            raise ValueError("Child object can not carry other objects.")
+        child.parent = self
+        self.children.append(child)
+        child.position = [self.center_x + offset_x, self.center_y + offset_y]
+        game.transforms.add(child, offset_x, offset_y)
+
+    def kill(self):
+        self.alive = False
+        if self.children:
+            children, self.children = self.children, []
+            for child in children:
+                child.parent = None  # parent does not need to forget it
+                child.kill()
+        if self.parent is not None:
+            self.parent.children.remove(self)
+            self.parent = None
+        if self.transform_index is not None:
+            game.transforms.remove(self)
+        super().kill()
+
 
 class Spaceship(SpaceObject):
     """
@@ -194,8 +604,8 @@ class Spaceship(SpaceObject):
                 power = self.powerup_damage_mod
             else:
                 power = 1
-            game.projectiles.append(
-                Projectile(self.main_weapon, power, self.angle, slot))
+            game.projectiles.append(game.projectiles_pool.acquire(
+                self.main_weapon, power, self.angle, slot))
             self.last_shot = game.game_time
 
     def launch_rocket(self):
@@ -203,9 +613,8 @@ class Spaceship(SpaceObject):
         Handle launching a rocket.
         """
         play_sound(weapons[SOUNDS][self.secondary_weapon])
-        game.projectiles.append(
-            Projectile(self.secondary_weapon, 1, self.angle,
-                       self.gun_slots[0]))
+        game.projectiles.append(game.projectiles_pool.acquire(
+            self.secondary_weapon, 1, self.angle, self.gun_slots[0]))
         self.rockets -= 1
 
     def damage(self, damage: int):
@@ -239,6 +648,11 @@ class Spaceship(SpaceObject):
         if self.hit or self.shield_hit:
             self.clear_hit_texture()
 
+        self.update_gun_slots()
+        self.obey_margins()  # shots does not obey screen margins
+
+    def update_gun_slots(self):
+        """Move positions of the guns, where shots start, with the ship."""
         for slot in self.gun_slots:
             slot[1] = self.top if self.angle == UPWARD else self.bottom
             if slot[0] == LASER_GUN_SINGLE:
@@ -248,8 +662,6 @@ class Spaceship(SpaceObject):
             else:
                 slot[2] = self.right
 
-        self.obey_margins()  # shots does not obey screen margins
-
     def clear_hit_texture(self):
         """Replace 'hit' texture with normal one, after ship being hit."""
         if self.shield > 0:
@@ -274,7 +686,8 @@ class Spaceship(SpaceObject):
 
     def kill(self):
         super().kill()
-        game.explosions.append(Explosion(self.center_x, self.center_y))
+        game.explosions.append(
+            game.explosions_pool.acquire(self.center_x, self.center_y))
 
 
 class PlayerShip(Spaceship):
@@ -307,10 +720,8 @@ class PlayerShip(Spaceship):
         Set up all textures for a playership sprite. Ship texture changes
         accordingly to themovementnt direction.
         """
-        textures = ["player_ship/" + texture for texture in textures_list]
-        [self.append_texture(
-            arcade.load_texture(get_image_path(texture), scale=SPRITES_SCALE))
-            for texture in textures]
+        for texture in textures_list:
+            self.append_texture(get_texture("player_ship/" + texture))
 
     def update_texture(self):
         """
@@ -378,7 +789,7 @@ class PlayerShip(Spaceship):
         Check if player ship collides with hostile ships or meteorites (?). If
         so, destroy it.
         """
-        hit_list = arcade.check_for_collision_with_list(self, game.hostiles)
+        hit_list = game.hostiles_grid.check_for_collision(self)
         if not game.god_mode:
             for hit in hit_list:
                 hit.kill()
@@ -445,7 +856,10 @@ class PlayerShip(Spaceship):
 
     def kill(self):
         super().kill()
+        game.players_grid.remove(self)
         game.if_new_high_score()
+        if game.recorder is not None:
+            game.recorder.stop(game.frames)
 
 
 class Hostile(Spaceship):
@@ -454,11 +868,17 @@ class Hostile(Spaceship):
     shots.
     """
 
-    def __init__(self, difficulty: int):
-        max_enemy = difficulty + 1 if difficulty <= len(
-            hostiles[HOSTILES]) else len(hostiles[HOSTILES])
-        hostile = random.choice(hostiles[HOSTILES][
-                                0:max_enemy])  # TODO: better enemies spawning?
+    def __init__(self, difficulty: int, model: str = None):
+        """
+        :param difficulty: int -- difficulty level of the game
+        :param model: str -- name of the ship from the hostiles, random one
+        allowed by the difficulty by default
+        """
+        hostile = model
+        if hostile is None:
+            max_enemy = difficulty + 1 if difficulty <= len(
+                hostiles[HOSTILES]) else len(hostiles[HOSTILES])
+            hostile = game.rng.choice(hostiles[HOSTILES][0:max_enemy])
         super().__init__("hostiles/" + hostile)
         self.model = hostile
         self.speed = hostiles[SPEED][hostile]
@@ -467,16 +887,16 @@ class Hostile(Spaceship):
         # tricky, lesser number, higher chance that hostile will evade:
         self.evasiveness = 40 - difficulty
         self.avoiding = False
+        # decision of HostilesAI, if ship should shoot in this frame:
+        self.firing = False
+        self.ai_index = None  # position of ship's state in HostilesAI arrays
         self.targeted_position = None
         self.dangerous = None
         self.playerX, self.playerY = None, None
         self.turrets = self.install_turrets()
-        self.append_texture(arcade.load_texture(
-            get_image_path("hostiles/" + hostile + "_shield"),
-            scale=SPRITES_SCALE))
-        self.append_texture(
-            arcade.load_texture(get_image_path("hostiles/" + hostile + "_hit"),
-                                scale=SPRITES_SCALE))
+        game.census.add(self)
+        self.append_texture(get_texture("hostiles/" + hostile + "_shield"))
+        self.append_texture(get_texture("hostiles/" + hostile + "_hit"))
         for i in range(hostiles[WEAPON][hostile][0]):
             self.rearm(hostiles[WEAPON][hostile][1])
 
@@ -492,15 +912,28 @@ class Hostile(Spaceship):
             for turret in hostiles[TURRETS][self.model]:
                 new_turret = Turret(turret[0], turret[1], turret[2], turret[3],
                                     turret[4], turret[5])
-                new_turret.center_x = self.left + turret[2]
-                new_turret.center_y = self.top - turret[3]
                 new_turret.angle = self.angle
+                self.attach(new_turret, turret[2], -turret[3])
                 installed_turrets.append(new_turret)
                 game.turrets.append(new_turret)
+                game.turrets_system.add(new_turret)
             return installed_turrets
         return None
 
     def update(self):
+        if game.hostiles_ai is not None:
+            # ship was already moved by HostilesAI, which also decided where it
+            # would go next and if it should shoot now:
+            if self.hit or self.shield_hit:
+                self.clear_hit_texture()
+            self.playerX, self.playerY = (game.player.center_x,
+                                          game.player.center_y)
+            if self.firing:
+                # guns positions are required only to shoot:
+                self.update_gun_slots()
+                self.shoot()
+            return
+
         super().update()
 
         self.playerX, self.playerY = game.player.center_x, game.player.center_y
@@ -509,7 +942,7 @@ class Hostile(Spaceship):
             self.evade()
 
         if (not self.avoiding or not self.targeted_position) \
-            and random.randint(1, 100) > 75: self.maneuvre()
+            and game.rng.randint(1, 100) > 75: self.maneuvre()
 
         if not self.avoiding or not self.targeted_position:
             self.aim_at_player()
@@ -520,9 +953,6 @@ class Hostile(Spaceship):
 
         self.update_speed()  # each enemy ship has it's own speed modifier
 
-        if self.turrets:
-            self.handle_turrets()
-
     def damage(self, damage: int):
         game.hits += 1
         super().damage(damage)
@@ -532,14 +962,12 @@ class Hostile(Spaceship):
         Check if there is a player-shot projectile in line of this enemy ship.
         """
         self.avoiding = False
-        for projectile in game.projectiles:
-            if projectile.angle == UPWARD:
-                if projectile.center_y < self.center_y:
-                    if abs(self.center_x - projectile.center_x) < 75:
-                        # there is the tricky part!
-                        if random.randint(1, 100) > self.evasiveness:
-                            self.dangerous = projectile
-                            return True
+        threat = game.threat_index.nearest(self.center_x, self.center_y)
+        if threat is not None:
+            # lesser evasiveness, higher chance to notice the nearest shot:
+            if game.rng.random() < 1 - self.evasiveness / 100:
+                self.dangerous = threat
+                return True
         return self.avoiding
 
     def evade(self):
@@ -554,7 +982,7 @@ class Hostile(Spaceship):
                     self.center_x > self.dangerous.center_x:
                 self.change_x = SPACESHIP_STRAFE
             else:
-                self.change_x = random.choice(
+                self.change_x = game.rng.choice(
                     (SPACESHIP_SPEED, -SPACESHIP_SPEED))
         self.avoiding = True
 
@@ -564,9 +992,9 @@ class Hostile(Spaceship):
         """
         min_distance, max_distance = hostiles[MIN_DISTANCE][self.model], \
             hostiles[MAX_DISTANCE][self.model]
-        target_x, target_y = (random.randint(MARGIN, SCREEN_WIDTH - MARGIN),
-                              SCREEN_HEIGHT * random.uniform(min_distance,
-                                                             max_distance))
+        target_x, target_y = (
+            game.rng.randint(int(MARGIN), int(SCREEN_WIDTH - MARGIN)),
+            SCREEN_HEIGHT * game.rng.uniform(min_distance, max_distance))
 
         self.targeted_position = (target_x, target_y)
 
@@ -598,25 +1026,6 @@ class Hostile(Spaceship):
         else:
             self.change_x = 0
 
-    def handle_turrets(self):
-        """
-        If hostile ship has at least 1 turret object attached to it, handle
-        their position, rotation and shooting at the player.
-        """
-        for i in range(len(self.turrets)):
-            turret = self.turrets[i]
-            # position:
-            turret.center_x = self.center_x + turret.offset_x
-            turret.center_y = self.center_y - turret.offset_y
-            # rotation - aiming at player:
-            radians = math.atan2(self.playerX - self.center_x,
-                                 self.playerY - self.center_y)
-            turret.angle = -math.degrees(radians)
-            # shooting at player:
-            if game.game_time - turret.last_shot > turret.rate_of_fire:
-                self.turret_shot(turret)
-                turret.last_shot = game.game_time
-
     @staticmethod
     def turret_shot(turret):
         """
@@ -625,8 +1034,9 @@ class Hostile(Spaceship):
         :param turret: Turret instance
         """
         play_sound(weapons[SOUNDS][turret.gun])
-        shot = Projectile(turret.gun, 1, turret.angle,
-                          ["", turret.center_y, turret.center_x])
+        shot = game.projectiles_pool.acquire(
+            turret.gun, 1, turret.angle,
+            ["", turret.center_y, turret.center_x])
         game.projectiles.append(shot)
 
     def update_speed(self):
@@ -638,11 +1048,13 @@ class Hostile(Spaceship):
         self.change_y *= self.speed
 
     def kill(self):
-        if self.turrets:
-            for turret in self.turrets:
-                turret.kill()
-
+        if not self.alive:  # already destroyed, e.g. by two shots at once
+            return
+        game.census.remove(self)
         super().kill()
+        game.hostiles_grid.remove(self)
+        if game.hostiles_ai is not None:
+            game.hostiles_ai.remove(self)
 
         score = hostiles[SCORES][self.model]
         game.score += score
@@ -661,10 +1073,198 @@ class Hostile(Spaceship):
                   - game.difficulty
                   + (game.game_time - PowerUp.last_spawn) / FPS)
 
-        if random.randint(1, 100) <= chance:
+        if game.rng.randint(1, 100) <= chance:
             PowerUp(self.center_x, self.center_y)
 
 
+class HostilesAI:
+    """
+    Optional engine updating all the hostile ships at once. State of the
+    ships: positions, velocities, speeds, evasiveness and weapons cooldowns,
+    is kept in NumPy arrays (structure of arrays), and the same decisions
+    Hostile.update() makes for a single ship: avoiding player's shots,
+    random maneuvers, aiming at the player and firing, are evaluated for all
+    the ships with vectorised operations. Results are written back to the
+    Sprites, which only shoot and update their textures and turrets.
+
+    Random numbers are drawn from NumPy generator seeded from the game
+    generator, and each ship rolls it's evasiveness once per frame, for the
+    nearest shot threatening it.
+    """
+
+    FIELDS = ("x", "y", "change_x", "change_y", "speed", "evasiveness",
+              "last_shot", "rate_of_fire", "min_distance", "max_distance")
+
+    def __init__(self, seed: int, capacity: int = 64):
+        """
+        :param seed: int -- seed of the NumPy random numbers generator
+        :param capacity: int -- initial size of the arrays, doubled when more
+        ships are added
+        """
+        self.generator = numpy.random.RandomState(seed)
+        self.capacity = capacity
+        self.count = 0
+        self.ships = []
+        for field in HostilesAI.FIELDS:
+            setattr(self, field, numpy.zeros(capacity))
+        self.avoiding = numpy.zeros(capacity, dtype=bool)
+        self.targeted = numpy.zeros(capacity, dtype=bool)
+
+    def __len__(self):
+        return self.count
+
+    def add(self, ship: Hostile):
+        """
+        Copy state of the new ship to the arrays.
+
+        :param ship: Hostile instance
+        """
+        if self.count == self.capacity:
+            self.capacity *= 2
+            for field in HostilesAI.FIELDS + ("avoiding", "targeted"):
+                array = getattr(self, field)
+                setattr(self, field, numpy.resize(array, self.capacity))
+        i = self.count
+        ship.ai_index = i
+        self.ships.append(ship)
+        self.x[i], self.y[i] = ship.center_x, ship.center_y
+        self.change_x[i], self.change_y[i] = ship.change_x, ship.change_y
+        self.speed[i] = ship.speed
+        self.evasiveness[i] = ship.evasiveness
+        self.last_shot[i] = ship.last_shot
+        self.rate_of_fire[i] = ship.rate_of_fire
+        self.min_distance[i] = hostiles[MIN_DISTANCE][ship.model]
+        self.max_distance[i] = hostiles[MAX_DISTANCE][ship.model]
+        self.avoiding[i] = ship.avoiding
+        self.targeted[i] = bool(ship.targeted_position)
+        self.count += 1
+
+    def remove(self, ship: Hostile):
+        """
+        Forget destroyed ship. The last ship is moved into it's slot, so the
+        arrays stay compact.
+
+        :param ship: Hostile instance
+        """
+        i, last = ship.ai_index, self.count - 1
+        if i is None:
+            return
+        if i != last:
+            for field in HostilesAI.FIELDS + ("avoiding", "targeted"):
+                array = getattr(self, field)
+                array[i] = array[last]
+            moved = self.ships[last]
+            self.ships[i] = moved
+            moved.ai_index = i
+        self.ships.pop()
+        ship.ai_index = None
+        self.count -= 1
+
+    def update(self, player_x: float, player_y: float, shots: list):
+        """
+        Move all the ships, and decide where they go next and which of them
+        shoot.
+
+        :param player_x: float -- x coordinate of the player's ship
+        :param player_y: float -- y coordinate of the player's ship
+        :param shots: list -- (x, y) coordinates of player's shots
+        """
+        n = self.count
+        if n == 0:
+            return
+        x, y = self.x[:n], self.y[:n]
+        change_x, change_y = self.change_x[:n], self.change_y[:n]
+        avoiding, targeted = self.avoiding[:n], self.targeted[:n]
+        # movement and screen margins:
+        x += change_x
+        y += change_y
+        numpy.clip(x, MARGIN, SCREEN_WIDTH - MARGIN, out=x)
+        numpy.clip(y, MARGIN + SCORE_STRIPE, SCREEN_HEIGHT - MARGIN, out=y)
+
+        self.avoid_shots(x, y, change_x, avoiding, shots)
+        self.maneuvre(x, y, change_x, change_y, avoiding, targeted)
+
+        # aiming at the player and firing:
+        aiming = ~avoiding | ~targeted
+        distance = player_x - x
+        change_x[aiming] = numpy.where(
+            numpy.abs(distance) > SPRITES_SCALE / 2,
+            numpy.sign(distance) * SPACESHIP_STRAFE, 0)[aiming]
+        firing = aiming & (game.game_time - self.last_shot[:n] >
+                           self.rate_of_fire[:n]) & (
+                         numpy.abs(distance) < 50)
+        self.last_shot[:n][firing] = game.game_time
+
+        change_x *= self.speed[:n]
+        change_y *= self.speed[:n]
+        self.write_back(firing)
+
+    def avoid_shots(self, x, y, change_x, avoiding, shots: list):
+        """
+        Find ships with player's shot below them, closer than THREAT_DISTANCE
+        horizontally, and make those which succeed evasiveness roll move
+        away from the nearest such shot.
+        """
+        avoiding[:] = False
+        if not shots:
+            return
+        shots = numpy.array(shots)
+        threats = (shots[:, 1] < y[:, None]) & (
+                numpy.abs(x[:, None] - shots[:, 0]) < THREAT_DISTANCE)
+        chance = 1 - self.evasiveness[:len(x)] / 100
+        danger = threats.any(axis=1) & (
+            self.generator.random_sample(len(x)) < chance)
+        if not danger.any():
+            return
+        # the highest of the shots below the ship is the nearest one:
+        dangerous_x = shots[numpy.where(threats, shots[:, 1], -numpy.inf)
+                            .argmax(axis=1), 0]
+        left = (x + 100 >= SCREEN_WIDTH - MARGIN) | (x < dangerous_x)
+        right = ~left & ((x < MARGIN + 100) | (x > dangerous_x))
+        random_side = self.generator.choice(
+            (SPACESHIP_SPEED, -SPACESHIP_SPEED), len(x))
+        change_x[danger] = numpy.where(left, -SPACESHIP_STRAFE, numpy.where(
+            right, SPACESHIP_STRAFE, random_side))[danger]
+        avoiding[danger] = True
+
+    def maneuvre(self, x, y, change_x, change_y, avoiding, targeted):
+        """
+        Make random ships fly toward random positions.
+        """
+        n = len(x)
+        maneuvring = (~avoiding | ~targeted) & (
+                self.generator.randint(1, 101, n) > 75)
+        if not maneuvring.any():
+            return
+        target_x = self.generator.randint(
+            int(MARGIN), int(SCREEN_WIDTH - MARGIN) + 1, n)
+        target_y = SCREEN_HEIGHT * self.generator.uniform(
+            self.min_distance[:n], self.max_distance[:n])
+        reached = (numpy.abs(x - target_x) <= 50) & (
+                numpy.abs(y - target_y) < 50)
+        targeted[maneuvring] = ~reached[maneuvring]
+        moving = maneuvring & ~reached
+        change_x[moving & (x < target_x)] = SPACESHIP_STRAFE
+        change_x[moving & (x > target_x)] = -SPACESHIP_STRAFE
+        change_y[moving & (y < target_y)] = SPACESHIP_STRAFE
+        change_y[moving & (y > target_y)] = -SPACESHIP_SPEED
+
+    def write_back(self, firing):
+        """
+        Set new positions, velocities and decisions of the ships Sprites.
+        """
+        n = self.count
+        for ship, x, y, change_x, change_y, avoiding, targeted, fire in zip(
+                self.ships, self.x[:n].tolist(), self.y[:n].tolist(),
+                self.change_x[:n].tolist(), self.change_y[:n].tolist(),
+                self.avoiding[:n].tolist(), self.targeted[:n].tolist(),
+                firing.tolist()):
+            ship.position = [x, y]
+            ship.change_x, ship.change_y = change_x, change_y
+            ship.avoiding, ship.targeted_position = avoiding, targeted
+            ship.firing = fire
+
+
 class Projectile(SpaceObject):
     """
     Basic class for all kind of 'shots' fired  in game by the player and his
@@ -684,6 +1284,21 @@ class Projectile(SpaceObject):
         point
         """
         super().__init__("shots/" + type_, power)
+        # if Projectile is waiting in the SpritesPool to be reused:
+        self.pooled = False
+        self.reset(type_, power, angle, gun_position)
+
+    def reset(self, type_: str, power: int, angle: float,
+              gun_position: list):
+        """
+        Set up Projectile as it was just fired. Used by new Projectiles and
+        by the ones recycled by the SpritesPool. Parameters are the same
+        as for __init__().
+        """
+        self.scale = SPRITES_SCALE * power
+        self.texture = get_texture("shots/" + type_, SPRITES_SCALE * power)
+        self.textures = [self.texture]
+        self.alive = True
         self.type_ = type_
         self.angle = angle
         self.target, self.marker = None, None
@@ -696,14 +1311,20 @@ class Projectile(SpaceObject):
     def calculate_speed_vector(self):
         """
         Calculate proper elements of the speed vector of projectile fired from
-        gun. Required for rotating turrets.
+        gun. Required for rotating turrets. Angles in full degrees, which are
+        all the angles used by the ships and the turrets, are found in the
+        SINES and COSINES tables.
 
         :return: float, float -- x and y velocities
         """
-        radians = math.radians(self.angle)
         velocity = weapons[SPEED][self.type_]
-        change_y = math.cos(radians)
-        change_x = -math.sin(radians)
+        if self.angle % 1 == 0:
+            degree = int(self.angle) % 360
+            change_y, change_x = COSINES[degree], -SINES[degree]
+        else:
+            radians = math.radians(self.angle)
+            change_y = math.cos(radians)
+            change_x = -math.sin(radians)
         return change_x * velocity, change_y * velocity
 
     def update(self):
@@ -741,9 +1362,8 @@ class Projectile(SpaceObject):
             elif self.center_x > self.target.center_x:
                 self.change_x = -SPACESHIP_STRAFE
 
-        if not self.marker:
-            self.marker = True
-            game.add_target_marker(self, self.target)
+        if self.marker is None:
+            self.marker = game.add_target_marker(self, self.target) or False
 
     def check_if_on_the_screen(self):
         """
@@ -760,16 +1380,271 @@ class Projectile(SpaceObject):
         destroy Projectile instance.
         """
         if self.type_.startswith("player"):
-            hit_list = arcade.check_for_collision_with_list(self,
-                                                            game.hostiles)
+            hit_list = game.hostiles_grid.check_for_collision(self)
         else:
-            hit_list = arcade.check_for_collision_with_list(self, game.players)
+            hit_list = game.players_grid.check_for_collision(self)
 
         for hit in hit_list:
             hit.damage(self.damage)
             self.kill()
             break
 
+    def kill(self):
+        super().kill()
+        game.projectiles_pool.release(self)
+
+
+class TargetMarker:
+    """
+    Rectangle displayed around the ship targeted by a rocket, as long as
+    both of them exist.
+    """
+    __slots__ = ("rocket", "target", "x", "y", "width", "height")
+
+    def __init__(self, rocket: Projectile, target: Spaceship):
+        """
+        :param rocket: Projectile instance -- rocket which marked the target
+        :param target: Spaceship instance -- ship targeted by the rocket
+        """
+        self.rocket, self.target = rocket, target
+        self.x, self.y = target.center_x, target.center_y
+        self.width, self.height = target.width, target.height
+
+    def update(self):
+        """
+        Follow the target.
+
+        :return: bool -- False if rocket or it's target was destroyed, and
+        marker should be deleted
+        """
+        rocket, target = self.rocket, self.target
+        # rocket could be recycled by the SpritesPool as a new shot, but then
+        # it's marker would be reset:
+        if not (rocket.alive and rocket.marker is self and target.alive):
+            return False
+        self.x, self.y = target.center_x, target.center_y
+        return True
+
+
+class Hint:
+    """
+    Short text displayed for a while during the game, e.g. after a hit.
+    """
+    __slots__ = ("x", "y", "speed_x", "speed_y", "time", "sprite")
+
+    def __init__(self, x: float, y: float, speed_x: float, speed_y: float,
+                 time: int, sprite: arcade.Sprite):
+        self.x, self.y = x, y
+        self.speed_x, self.speed_y = speed_x, speed_y
+        self.time = time
+        self.sprite = sprite
+
+
+class HintsManager:
+    """
+    Keeps all the hints displayed on the screen. Text of each hint is
+    rasterized once by the text_cache, shared as a texture by hints with the
+    same text, and drawn as a Sprite, so all the hints are drawn at once with
+    a single SpriteBatch. Hints appearing and expiring only fill and free
+    slots of the batch, without rebuilding it's buffers.
+    """
+
+    def __init__(self, layer: RenderLayer):
+        """
+        :param layer: RenderLayer instance -- layer drawing the hints
+        """
+        self.hints = []
+        self.sprites = layer.create_batch()
+
+    def __len__(self):
+        return len(self.hints)
+
+    def __iter__(self):
+        return iter(self.hints)
+
+    def add(self, text: str, x: float, y: float, speed_x: float,
+            speed_y: float, color: arcade.Color, size: int, time: int):
+        """
+        Create new hint. Parameters are the same as for Game.create_hint(),
+        but time is in frames.
+
+        :return: Hint instance
+        """
+        texture = text_cache.get(text, color, size, align="center")[
+            0].texture
+        sprite = arcade.Sprite()
+        sprite.texture = texture
+        sprite.textures = [texture]
+        hint = Hint(x, y, speed_x, speed_y, time, sprite)
+        self.place(hint)
+        self.hints.append(hint)
+        self.sprites.append(sprite)
+        return hint
+
+    @staticmethod
+    def place(hint: Hint):
+        """
+        Put Sprite of the hint in it's position: x is the center of the text,
+        and y it's baseline.
+        """
+        hint.sprite.position = [hint.x, hint.y + hint.sprite.height / 2]
+
+    def update(self):
+        """
+        Move hints and remove the expired ones. Expired hint is replaced by
+        the last one, so removal does not shift the rest of the list.
+        """
+        hints, i = self.hints, len(self.hints) - 1
+        while i >= 0:
+            hint = hints[i]
+            if hint.time > 0:
+                hint.time -= 1
+                if hint.speed_x != 0 or hint.speed_y != 0:
+                    hint.x += hint.speed_x
+                    hint.y += hint.speed_y
+                    self.place(hint)
+            else:
+                hints[i] = hints[-1]
+                hints.pop()
+                hint.sprite.kill()
+            i -= 1
+
+    def draw(self):
+        """
+        Draw all the hints at once. Must be called between RenderLayer.begin()
+        and RenderLayer.end().
+        """
+        self.sprites.draw()
+
+
+class Hud:
+    """
+    Line of the counters displayed at the bottom of the screen. Labels are
+    rasterized once by the text_cache, and counters are made of the cached
+    glyphs of the digits. All of them are Sprites of a single SpriteBatch,
+    so the hud is drawn with one draw call, and Sprites are laid out again
+    only when any of the counters changed.
+    """
+
+    LABELS = ("Fired shots: ", ", Hit enemies: ", ", Destroyed: ",
+              ", Rockets: ", ", Shield: ", ", Score: ")
+    X, Y, COLOR, SIZE = 10, 20, arcade.color.ANTIQUE_WHITE, 14
+
+    def __init__(self, layer: RenderLayer):
+        """
+        :param layer: RenderLayer instance -- layer drawing the hud
+        """
+        self.sprites = layer.create_batch()
+        self.state = None
+
+    def update(self, counters: tuple, god_mode: bool):
+        """
+        Lay out the labels and the digits of the counters, if they changed.
+
+        :param counters: tuple of ints -- values displayed after LABELS
+        :param god_mode: bool -- if god mode is displayed at the end
+        """
+        if (counters, god_mode) == self.state:
+            return
+        self.state = counters, god_mode
+        texts = []
+        for label, value in zip(self.LABELS, counters):
+            texts.append(label)
+            texts.extend(str(value))
+        if god_mode:
+            texts.append(", Godmode: on")
+        sprites, x = self.sprites, self.X
+        while len(sprites) > len(texts):
+            sprites.pop()
+        for i, text in enumerate(texts):
+            texture = text_cache.get(text, self.COLOR, self.SIZE)[0].texture
+            if i < len(sprites):
+                sprite = sprites[i]
+            else:
+                sprite = arcade.Sprite()
+            sprite.texture = texture
+            sprite.position = [x + sprite.width / 2, self.Y +
+                               sprite.height / 2]
+            if i == len(sprites):
+                sprites.append(sprite)
+            x += sprite.width
+
+    def draw(self):
+        """
+        Draw the hud. Must be called between RenderLayer.begin() and
+        RenderLayer.end().
+        """
+        self.sprites.draw()
+
+
+class SpritesPool:
+    """
+    Keeps killed Sprites (e.g. Projectiles) to recycle them when next ones
+    are spawned, instead of constructing new arcade.Sprite each time. Pooled
+    class must provide reset() method accepting the same arguments as it's
+    __init__(), and 'pooled' attribute.
+    """
+
+    def __init__(self, sprite_class: type):
+        """
+        :param sprite_class: type -- class of pooled Sprites, e.g. Projectile
+        """
+        self.sprite_class = sprite_class
+        self.free = []
+        # statistics:
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+        self.peak_in_use = 0
+
+    def __len__(self):
+        return len(self.free)
+
+    @property
+    def in_use(self):
+        """Number of Sprites acquired and not released yet."""
+        return self.created + self.reused - self.released
+
+    def acquire(self, *args):
+        """
+        Get Sprite ready to be added to it's arcade.SpriteList. Arguments are
+        the same as for the __init__() of the pooled class.
+
+        :return: instance of the pooled class
+        """
+        if self.free:
+            sprite = self.free.pop()
+            sprite.pooled = False
+            sprite.reset(*args)
+            self.reused += 1
+        else:
+            sprite = self.sprite_class(*args)
+            self.created += 1
+        self.peak_in_use = max(self.peak_in_use, self.in_use)
+        return sprite
+
+    def release(self, sprite: arcade.Sprite):
+        """
+        Return killed Sprite to the pool. Sprite can be killed twice in the
+        same frame (e.g. Projectile leaving the screen and hitting something),
+        but is put into the pool only once.
+
+        :param sprite: instance of the pooled class
+        """
+        if not sprite.pooled:
+            sprite.pooled = True
+            self.free.append(sprite)
+            self.released += 1
+
+    def statistics(self):
+        """
+        :return: dict -- counters of created, reused, released, currently
+        used, pooled and maximum simultaneously used Sprites
+        """
+        return {"created": self.created, "reused": self.reused,
+                "released": self.released, "in_use": self.in_use,
+                "pooled": len(self.free), "peak_in_use": self.peak_in_use}
+
 
 class Turret(SpaceObject):
 
@@ -792,6 +1667,176 @@ class Turret(SpaceObject):
         self.last_shot = 0
         self.offset_x = offset_x
         self.offset_y = offset_y
+        # position of turret's state in TurretsSystem arrays:
+        self.system_index = None
+
+    def kill(self):
+        super().kill()
+        game.turrets_system.remove(self)
+
+
+class TransformsSystem:
+    """
+    Moves all the objects attached to other objects (see SpaceObject.attach)
+    at once: positions of the parents are gathered into arrays, offsets of
+    the children added to them, and the children placed in the results, in
+    a single pass after all the parents were updated. Offsets are not
+    rotated with the parents.
+    """
+
+    def __init__(self, capacity: int = 16):
+        """
+        :param capacity: int -- initial size of the arrays, doubled when more
+        children are attached
+        """
+        self.capacity = capacity
+        self.children = []
+        self.offset_x = numpy.zeros(capacity)
+        self.offset_y = numpy.zeros(capacity)
+        # positions of the parents gathered by the last update():
+        self.parent_x = self.parent_y = numpy.zeros(0)
+
+    def __len__(self):
+        return len(self.children)
+
+    def add(self, child: SpaceObject, offset_x: float, offset_y: float):
+        """
+        Register new child object.
+
+        :param child: SpaceObject instance with the parent
+        :param offset_x: float -- horizontal offset from the parent
+        :param offset_y: float -- vertical offset from the parent
+        """
+        i = len(self.children)
+        if i == self.capacity:
+            self.capacity *= 2
+            self.offset_x = numpy.resize(self.offset_x, self.capacity)
+            self.offset_y = numpy.resize(self.offset_y, self.capacity)
+        child.transform_index = i
+        self.children.append(child)
+        self.offset_x[i], self.offset_y[i] = offset_x, offset_y
+
+    def remove(self, child: SpaceObject):
+        """
+        Forget destroyed child. The last child is moved into it's slot, so
+        the arrays stay compact.
+
+        :param child: SpaceObject instance
+        """
+        i, last = child.transform_index, len(self.children) - 1
+        if i != last:
+            self.offset_x[i] = self.offset_x[last]
+            self.offset_y[i] = self.offset_y[last]
+            moved = self.children[i] = self.children[last]
+            moved.transform_index = i
+        self.children.pop()
+        child.transform_index = None
+
+    def update(self):
+        """
+        Place all the children at their offsets from their parents.
+        """
+        n = len(self.children)
+        if n == 0:
+            return
+        parents = [child.parent for child in self.children]
+        self.parent_x = numpy.fromiter((parent.center_x for parent in
+                                        parents), float, n)
+        self.parent_y = numpy.fromiter((parent.center_y for parent in
+                                        parents), float, n)
+        x = self.parent_x + self.offset_x[:n]
+        y = self.parent_y + self.offset_y[:n]
+        for child, child_x, child_y in zip(self.children, x.tolist(),
+                                           y.tolist()):
+            child.position = [child_x, child_y]
+
+
+class TurretsSystem:
+    """
+    Updates all the turrets of all the hostile ships at once: aims them at
+    the player, and decides which of them shoot. Turrets are moved with
+    their ships by the TransformsSystem before. Angles are rounded to full
+    degrees, so projectiles shot by the turrets take their velocities from
+    the SINES and COSINES tables.
+    """
+
+    def __init__(self, capacity: int = 16):
+        """
+        :param capacity: int -- initial size of the arrays, doubled when more
+        turrets are added
+        """
+        self.capacity = capacity
+        self.turrets = []
+        self.rate_of_fire = numpy.zeros(capacity)
+        self.last_shot = numpy.zeros(capacity)
+
+    def __len__(self):
+        return len(self.turrets)
+
+    def add(self, turret: Turret):
+        """
+        Register new turret installed on the ship.
+
+        :param turret: Turret instance attached to it's ship
+        """
+        i = len(self.turrets)
+        if i == self.capacity:
+            self.capacity *= 2
+            for field in ("rate_of_fire", "last_shot"):
+                setattr(self, field, numpy.resize(getattr(self, field),
+                                                  self.capacity))
+        turret.system_index = i
+        self.turrets.append(turret)
+        self.rate_of_fire[i] = turret.rate_of_fire
+        self.last_shot[i] = turret.last_shot
+
+    def remove(self, turret: Turret):
+        """
+        Forget destroyed turret. The last turret is moved into it's slot, so
+        the arrays stay compact.
+
+        :param turret: Turret instance
+        """
+        i, last = turret.system_index, len(self.turrets) - 1
+        if i is None:
+            return
+        if i != last:
+            for array in (self.rate_of_fire, self.last_shot):
+                array[i] = array[last]
+            moved = self.turrets[i] = self.turrets[last]
+            moved.system_index = i
+        self.turrets.pop()
+        turret.system_index = None
+
+    def update(self, transforms: TransformsSystem, player_x: float,
+               player_y: float, game_time: float):
+        """
+        Rotate and fire all the turrets.
+
+        :param transforms: TransformsSystem which moved the turrets
+        :param player_x: float -- x coordinate of the player's ship
+        :param player_y: float -- y coordinate of the player's ship
+        :param game_time: float -- current game time in frames
+        """
+        n = len(self.turrets)
+        if n == 0:
+            return
+        # turrets aim at the player from the center of the ship:
+        index = numpy.fromiter((turret.transform_index for turret in
+                                self.turrets), int, n)
+        ship_x = transforms.parent_x[index]
+        ship_y = transforms.parent_y[index]
+        angles = numpy.rint(-numpy.degrees(numpy.arctan2(
+            player_x - ship_x, player_y - ship_y))) % 360
+        last_shot = self.last_shot[:n]
+        firing = game_time - last_shot > self.rate_of_fire[:n]
+        last_shot[firing] = game_time
+        for turret, angle, fire in zip(self.turrets, angles.tolist(),
+                                       firing.tolist()):
+            turret.angle = angle
+            if fire:
+                Hostile.turret_shot(turret)
+                turret.last_shot = game_time
 
 
 class PowerUp(SpaceObject):
@@ -802,7 +1847,7 @@ class PowerUp(SpaceObject):
     last_spawn = 0  # spawn time kept to update spawning chance
 
     def __init__(self, pos_x: float, pos_y: float):
-        self.type_ = random.choice(powerups[POWERUPS])
+        self.type_ = game.rng.choice(powerups[POWERUPS])
         super().__init__("powerups/" + self.type_)
         self.center_x = pos_x
         self.center_y = pos_y
@@ -815,7 +1860,7 @@ class PowerUp(SpaceObject):
         if 0 > self.center_y:
             self.kill()
 
-        if arcade.check_for_collision(self, game.player):
+        if game.players_grid.check_for_collision(self):
             play_sound(POWERUP_SOUND)
             game.player.apply_powerup(self.type_)
             self.kill()
@@ -826,30 +1871,359 @@ class Explosion(SpaceObject):
     This object is spawned when something explodes.
     """
 
-    textures_list = []
-    for i in range(1, 40):
-        tex = f"explosion/explosion{i:04d}"
-        textures_list.append(arcade.load_texture(get_image_path(tex)))
+    textures_list = [get_texture(f"explosion/explosion{i:04d}", 1) for i in
+                     range(1, 40)]
 
     def __init__(self, x, y):
         super().__init__("explosion/explosion0000")
+        # if Explosion is waiting in the ExplosionsPool to be reused:
+        self.pooled = False
+        self.reset(x, y)
 
+    def reset(self, x, y):
+        """
+        Start the animation from the first frame in the new position. Used by
+        new Explosions and by the ones recycled by the ExplosionsPool.
+        """
+        self.texture = get_texture("explosion/explosion0000")
         self.textures = Explosion.textures_list
+        self.alive = True
 
         self.center_y = y
         self.center_x = x
         self.current_texture = 0
         self.detonation = int(game.game_time)
-        play_sound(random.choice(("explosion.wav", "explosion_2.wav")))
+        play_sound(game.rng.choice(EXPLOSIONS_SOUNDS))
 
     def update(self):
         super().update()
-        self.current_texture += 1
+        # when there are too many explosions, frames are skipped:
+        self.current_texture += game.explosions_pool.frame_step
         if self.current_texture < len(self.textures):
             self.set_texture(self.current_texture)
         else:
             self.kill()
 
+    def kill(self):
+        super().kill()
+        game.explosions_pool.release(self)
+
+
+class ExplosionsPool(SpritesPool):
+    """
+    SpritesPool of Explosions, which keeps their number on the screen under
+    control. When more explosions than the limit are animated at once, each
+    of them skips frames, so they finish faster and frame times stay flat
+    during mass destruction.
+    """
+
+    def __init__(self, limit: int = MAX_EXPLOSIONS):
+        """
+        :param limit: int -- number of explosions animated frame by frame
+        """
+        super().__init__(Explosion)
+        self.limit = limit
+
+    @property
+    def frame_step(self):
+        """
+        Number of animation frames each Explosion advances per game frame:
+        1 within the limit, 2 up to twice the limit, etc.
+        """
+        return 1 + max(self.in_use - 1, 0) // self.limit
+
+
+class Observation:
+    """
+    State of the game seen by a BotController: positions and velocities
+    (x, y, change_x, change_y) of the player's ship, hostile ships, shots
+    of the player and of the hostiles, and powerups. All of them are rows of
+    a single NumPy array allocated once and refilled each tick through a
+    flat memoryview, so observing the game does not allocate any arrays.
+    Each group has fixed number of rows, and counts tells how many of them
+    are valid in the current tick. Rows left by objects which disappeared
+    are zeroed.
+    """
+
+    FEATURES = 4  # x, y, change_x, change_y
+    GROUPS = ("player", "hostiles", "player_shots", "hostile_shots",
+              "powerups")
+
+    def __init__(self, hostiles: int = OBSERVED_HOSTILES,
+                 shots: int = OBSERVED_SHOTS,
+                 powerups: int = OBSERVED_POWERUPS):
+        """
+        :param hostiles: int -- maximum number of observed hostile ships
+        :param shots: int -- maximum number of observed shots of the player
+        and of the hostiles
+        :param powerups: int -- maximum number of observed powerups
+        """
+        capacities = (1, hostiles, shots, shots, powerups)
+        self.buffer = numpy.zeros((sum(capacities), Observation.FEATURES),
+                                  dtype=numpy.float32)
+        self.view = memoryview(self.buffer).cast("B").cast("f")
+        # first row and number of rows of each group:
+        self.starts = tuple(sum(capacities[:i]) for i in range(
+            len(capacities)))
+        self.capacities = capacities
+        self.counts = numpy.zeros(len(capacities), dtype=numpy.int32)
+        # health, shield and rockets of the player's ship, and game time:
+        self.status = numpy.zeros(4, dtype=numpy.float32)
+        # named views of the groups:
+        for name, start, capacity in zip(Observation.GROUPS, self.starts,
+                                         capacities):
+            setattr(self, name, self.buffer[start:start + capacity])
+
+    def update(self, session):
+        """
+        Copy current state of the game into the buffer.
+
+        :param session: Game instance
+        """
+        ship, status = session.player, self.status
+        status[0], status[1] = ship.health, ship.shield
+        status[2], status[3] = ship.rockets, session.game_time
+        self.write(0, session.players)
+        self.write(1, session.hostiles)
+        self.write_shots(session.projectiles)
+        self.write(4, session.powerups)
+
+    def write(self, group: int, sprites):
+        """
+        Write the Sprites into the rows of the group, as long as there is
+        room.
+
+        :param group: int -- index of the group in GROUPS
+        :param sprites: iterable of arcade.Sprites -- observed objects
+        """
+        view, features = self.view, Observation.FEATURES
+        first = i = self.starts[group] * features
+        end = first + self.capacities[group] * features
+        for sprite in sprites:
+            if i == end:
+                break
+            view[i], view[i + 1] = sprite._position
+            view[i + 2], view[i + 3] = sprite.change_x, sprite.change_y
+            i += features
+        self.finish(group, (i - first) // features)
+
+    def write_shots(self, projectiles):
+        """
+        Write shots of the player and of the hostiles into their groups in a
+        single pass over the projectiles.
+
+        :param projectiles: iterable of Projectiles
+        """
+        view, features = self.view, Observation.FEATURES
+        player_first = player_i = self.starts[2] * features
+        hostile_first = hostile_i = self.starts[3] * features
+        player_end = player_first + self.capacities[2] * features
+        hostile_end = hostile_first + self.capacities[3] * features
+        for shot in projectiles:
+            if shot.type_.startswith("player"):
+                if player_i == player_end:
+                    continue
+                i, player_i = player_i, player_i + features
+            else:
+                if hostile_i == hostile_end:
+                    continue
+                i, hostile_i = hostile_i, hostile_i + features
+            view[i], view[i + 1] = shot._position
+            view[i + 2], view[i + 3] = shot.change_x, shot.change_y
+        self.finish(2, (player_i - player_first) // features)
+        self.finish(3, (hostile_i - hostile_first) // features)
+
+    def finish(self, group: int, count: int):
+        """
+        Zero rows of the group which were valid in the previous tick only,
+        and save the number of valid rows.
+        """
+        previous = self.counts[group]
+        if previous > count:
+            start = self.starts[group]
+            self.buffer[start + count:start + previous] = 0
+        self.counts[group] = count
+
+
+class BotController(abc.ABC):
+    """
+    Base class of the programmatic players. Controller attached to the Game
+    (see Game.attach_controller()) is asked for the action before each
+    tick, instead of waiting for the keyboard events.
+    """
+
+    @abc.abstractmethod
+    def act(self, observation: Observation):
+        """
+        Decide what player's ship should do in the next tick. To avoid
+        allocations, return the same, preallocated array each time.
+
+        :param observation: Observation instance -- current state of the
+        game, reused by all the ticks
+        :return: sequence of 4 numbers -- horizontal movement (-1 left, 1
+        right, 0 none), vertical movement (-1 down, 1 up, 0 none), shooting
+        (1 or 0) and launching a rocket (1 or 0)
+        """
+
+
+class Census:
+    """
+    Population of the hostile ships alive: number of ships of each model and
+    sum of their ratings (the threat they make together). It is updated
+    when a ship is spawned or killed, so spawning logic and HUD could query
+    it at any frequency without scanning all the hostiles.
+    """
+
+    def __init__(self):
+        self.rating = 0
+        self.population = 0
+        self.counts = {}  # model: number of ships alive
+
+    def __len__(self):
+        return self.population
+
+    def add(self, hostile: Hostile):
+        """
+        :param hostile: Hostile instance which appeared on the screen
+        """
+        self.rating += hostiles[RATINGS][hostile.model]
+        self.population += 1
+        self.counts[hostile.model] = self.counts.get(hostile.model, 0) + 1
+
+    def remove(self, hostile: Hostile):
+        """
+        :param hostile: Hostile instance which was destroyed
+        """
+        self.rating -= hostiles[RATINGS][hostile.model]
+        self.population -= 1
+        self.counts[hostile.model] -= 1
+
+    def count(self, model: str):
+        """
+        :param model: str -- name of the hostile ship
+        :return: int -- number of ships of this model alive
+        """
+        return self.counts.get(model, 0)
+
+
+class WaveScheduler:
+    """
+    Timed events of the level compiled from the levels_config into a heap,
+    ordered by the number of the tick they are due: scripted waves of the
+    hostile ships, periodic filling of the screen with random hostiles, and
+    raising the difficulty. Each tick looks only at the top of the heap, so
+    it costs O(1) when nothing is due, no matter how long the script of the
+    level is. Periodic events push their next occurrence back to the heap.
+    """
+
+    # order of the events due in the same tick:
+    WAVE, FILL, ESCALATION = range(3)
+
+    def __init__(self, levels: dict, start: int = 0):
+        """
+        :param levels: dict -- levels_config section of the config file
+        :param start: int -- game time the level starts at
+        """
+        waves = levels.get(WAVES, ())
+        for wave in waves:
+            self.check_wave(wave)
+        self.fill_interval = round(levels.get(SPAWN_INTERVAL, 2) * FPS)
+        self.base_rating = levels.get(BASE_RATING, 5)
+        # events are (tick, kind, sequence, data), sequence keeps events of
+        # the same tick and kind in order they were scheduled:
+        self.events = [(start + round(seconds * FPS), self.WAVE, i,
+                        (model, count)) for i, (seconds, model, count) in
+                       enumerate(waves)]
+        escalation = start + round(levels.get(ESCALATION_TIME, 30) * FPS)
+        self.events.append((start + self.fill_interval, self.FILL, 0, None))
+        self.events.append((escalation, self.ESCALATION, 0, escalation))
+        heapq.heapify(self.events)
+        self.sequence = len(self.events)
+
+    def __len__(self):
+        return len(self.events)
+
+    @staticmethod
+    def check_wave(wave):
+        """
+        Make sure the wave from the config file could be spawned, so a typo
+        is reported when the level starts, not when the wave is due.
+
+        :param wave: list -- [second of the game, hostile ship, number of
+        ships]
+        """
+        if not (isinstance(wave, (list, tuple)) and len(wave) == 3 and
+                isinstance(wave[0], (int, float)) and wave[0] >= 0 and
+                wave[1] in hostiles[HOSTILES] and
+                isinstance(wave[2], int) and wave[2] > 0):
+            raise ValueError(f"Invalid wave {wave} in {WAVES}, it should be:"
+                             f" [second of the game, one of the {HOSTILES}:"
+                             f" {', '.join(hostiles[HOSTILES])}, number of"
+                             f" ships].")
+
+    def push(self, tick: int, kind: int, data=None):
+        """
+        Schedule new event.
+
+        :param tick: int -- game time the event is due
+        :param kind: int -- WAVE, FILL or ESCALATION
+        :param data: (model, count) of the wave, or nominal time of the
+        escalation
+        """
+        self.sequence += 1
+        heapq.heappush(self.events, (tick, kind, self.sequence, data))
+
+    def update(self, session):
+        """
+        Execute all the events due in the current tick of the session.
+
+        :param session: Game instance
+        """
+        events, now = self.events, session.game_time
+        while events and events[0][0] <= now:
+            tick, kind, _, data = heapq.heappop(events)
+            if kind == self.WAVE:
+                self.spawn_wave(session, *data)
+            elif kind == self.FILL:
+                if session.not_enough_enemies():
+                    session.spawn_hostile()
+                self.push(tick + self.fill_interval, kind)
+            else:
+                self.escalate(session, now, data)
+
+    @staticmethod
+    def spawn_wave(session, model: str, count: int):
+        """
+        Spawn ships of the wave evenly spread over the width of the screen.
+
+        :param session: Game instance
+        :param model: str -- name of the hostile ship from the hostiles
+        :param count: int -- number of the ships
+        """
+        spacing = (SCREEN_WIDTH - 2 * MARGIN) / (count + 1)
+        for i in range(1, count + 1):
+            session.spawn_hostile(model, MARGIN + i * spacing)
+
+    def escalate(self, session, now: int, nominal: int):
+        """
+        Raise difficulty of the challenge mode, and schedule the next raise
+        twice as late. When challenge mode is off, raise is postponed, and
+        checked again each second.
+
+        :param session: Game instance
+        :param now: int -- current game time
+        :param nominal: int -- game time the raise was scheduled for
+        """
+        if session.difficulty > len(hostiles[HOSTILES]):
+            return  # all hostile ships are already spawned
+        if session.challenge_mode:
+            session.raise_difficulty()
+            # after a late raise, the next one waits at least for a tick:
+            nominal += nominal
+            self.push(max(nominal, now + 1), self.ESCALATION, nominal)
+        else:
+            self.push(now + FPS, self.ESCALATION, nominal)
+
 
 class Game(arcade.Window):
     """
@@ -857,7 +2231,10 @@ class Game(arcade.Window):
     """
 
     def __init__(self, width, height, title, fullscreen, resizeable,
-                 test: bool = False):
+                 test: bool = False, headless: bool = HEADLESS,
+                 seed: int = None, record: str = None, profile: str = None,
+                 batched_ai: bool = False, render_fps: int = RENDER_FPS,
+                 max_ticks_per_frame: int = MAX_TICKS_PER_FRAME):
         """
         Initialization of new game window and game logic.
 
@@ -866,19 +2243,72 @@ class Game(arcade.Window):
         :param title: str -- title of window displayed s window name
         :param fullscreen: bool -- if game should be started in full-screen
         :param resizeable: bool -- if player can resize the window
-        """
-        super().__init__(width, height, title, fullscreen, resizeable)
+        :param headless: bool -- run game logic only, without window, GL
+        context, cursor, menus and sound (see simulate())
+        :param seed: int -- seed of random numbers generator, to make runs
+        repeatable
+        :param record: str -- path of the file to record keyboard events of
+        each game session into, to replay it later (see run_replay())
+        :param profile: str -- path of the CSV file to write durations of
+        each phase of each frame into
+        :param batched_ai: bool -- update all hostile ships at once with
+        HostilesAI engine instead of each ship separately
+        :param render_fps: int -- how many times per second screen is drawn,
+        game logic is always updated FPS times per second
+        :param max_ticks_per_frame: int -- maximum number of logic updates
+        run to catch up with the time of a single, delayed frame
+        """
+        self.headless = headless
+        self.batched_ai = batched_ai
+        # all the randomness of game logic comes from this generator:
+        self.rng = random.Random(seed)
+        self.session_seed = None
+        self.recorder = ReplayRecorder(record) if record else None
+        # number of logic updates (ticks) in current game session:
+        self.frames = 0
+        # real time not simulated yet, shorter than a single tick:
+        self.accumulator = 0.0
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.render_fps = render_fps
+        # how far between previous and last tick the screen is drawn:
+        self.interpolation = 1.0
+        self.profiler = FrameProfiler(UPDATE_PHASES + DRAW_PHASES,
+                                      counters=(TICKS, DRAW_CALLS))
+        self.show_profiler = False
+        self.profiler_lines = []
+        if profile is not None:
+            self.profiler.open_csv(profile)
+        # headless game and sound_on = False setting mute the game:
+        sound_on = settings.get("sound_on", True) if settings else True
+        self.sound = SoundManager(SOUNDS_PATH,
+                                  enabled=not headless and sound_on)
+        self.sound.preload(sounds_manifest())
+        # headless game does not save it's scores:
+        self.scores = ScoreStore(
+            None if headless else CONFIG_PATH + SCORES_FILE,
+            legacy_path=CONFIG_PATH + LEGACY_SCORES_FILE)
+        self.scores.load()
+        load_all_textures()
+        # shader program and textures atlas shared by all the sprites lists,
+        # atlas is packed with all the textures at once:
+        self.render_layer = RenderLayer(MAX_INTERPOLATED_DISTANCE,
+                                        sprites_textures())
         self.in_menu = False  # game starts in the menu
-        self.cursor = Cursor(self, GRAPHICS_PATH, "/cursors/cursor")
+        self.cursor = None
         self.menu = None
-        arcade.set_background_color(BACKGROUND_COLOR)
-        self.set_update_rate(1 / FPS)
+        if not headless:
+            super().__init__(width, height, title, fullscreen, resizeable)
+            self.cursor = Cursor(self, GRAPHICS_PATH, "/cursors/cursor")
+            arcade.set_background_color(BACKGROUND_COLOR)
+            self.set_update_rate(1 / render_fps)
 
         self.difficulty = 0
-        self.next_difficulty_raise = 0
+        self.wave_scheduler = None
+        self.census = None
 
         # Additional elements displayed on the screen:
         self.hints = None
+        self.hud = None
         self.stars = None
         self.targets_markers = None
 
@@ -890,9 +2320,21 @@ class Game(arcade.Window):
         self.explosions = None
         # all the arcade.spriteLists would be put into this list:
         self.sprites_lists = None
+        # broad-phase of collision checks, rebuilt each frame:
+        self.players_grid = None
+        self.hostiles_grid = None
+        self.threat_index = None
+        self.hostiles_ai = None
+        self.transforms = None
+        self.turrets_system = None
+        self.projectiles_pool = None
+        self.explosions_pool = None
 
         self.player = None
         self.player_name = ""
+        # programmatic player, used instead of the keyboard:
+        self.controller = None
+        self.observation = None
 
         self.paused = False
         # we have two 'times' because we need to keep time updating when game
@@ -912,7 +2354,7 @@ class Game(arcade.Window):
         self.challenge_mode = SharedVariable(True)
         self.god_mode = False
 
-        if not test:
+        if not (test or headless):
             self.setup_menus()
 
     def __setattr__(self, key, value):
@@ -988,25 +2430,51 @@ class Game(arcade.Window):
             difficulty_slider, arcade_checkbox]
         return elements
 
-    def setup_new_game(self):
+    def setup_new_game(self, seed: int = None):
         """
         Setup all game variables. Used when new game is started and when game
         is restarted after player's death.
+
+        :param seed: int -- seed of the session, used to replay recorded
+        sessions. By default new seed is drawn from the game generator.
         """
         self.in_menu = False
-
-        self.hints = []
+        # each session has it's own seed, so it could be recorded and
+        # replayed separately:
+        self.session_seed = self.rng.getrandbits(32) if seed is None else seed
+        self.rng.seed(self.session_seed)
+        PowerUp.last_spawn = 0
+        self.frames = 0
+        if self.recorder is not None:
+            self.recorder.start(self.session_seed, SCREEN_WIDTH,
+                                SCREEN_HEIGHT, self.difficulty,
+                                bool(self.challenge_mode), self.god_mode,
+                                self.batched_ai)
+
+        self.hints = HintsManager(self.render_layer)
+        self.hud = Hud(self.render_layer)
         self.stars = self.create_stars()
         self.targets_markers = []
 
-        self.next_difficulty_raise = 30 * FPS
+        self.wave_scheduler = WaveScheduler(levels or {})
+        self.census = Census()
 
         self.players, self.hostiles, self.projectiles, self.powerups, \
-            self.turrets, self.explosions = self.create_spritelists()
+            self.turrets, self.explosions = self.create_spritelists(
+                self.render_layer)
 
         self.sprites_lists = [self.players, self.hostiles, self.projectiles,
                               self.powerups, self.turrets, self.explosions]
 
+        self.players_grid, self.hostiles_grid = SpatialHash(), SpatialHash()
+        self.threat_index = ThreatIndex()
+        self.transforms = TransformsSystem()
+        self.turrets_system = TurretsSystem()
+        self.hostiles_ai = HostilesAI(
+            self.rng.getrandbits(32)) if self.batched_ai else None
+        self.projectiles_pool = SpritesPool(Projectile)
+        self.explosions_pool = ExplosionsPool()
+
         self.player = self.spawn_player()
         self.player_name = ""
 
@@ -1017,7 +2485,8 @@ class Game(arcade.Window):
         self.hits = 0
         self.destroyed = 0
         self.score = 0
-        self.best_scores = self.load_best_scores()
+        # table is loaded in the background when the game starts:
+        self.best_scores = self.scores.table
 
         self.should_display_scores = False
         self.new_score_index = None
@@ -1032,68 +2501,34 @@ class Game(arcade.Window):
 
     def create_stars(self):
         """
-        Generate 'stars' displayed in the background. Stars are points stored
-        in the 3-levels structure. Main dict contains 4 dicts or each color
-        o the stars and each o these dict contains 3-lists of stars of
-        different sizes.
-
-        :return: dict -- dict of 4 dicts (colors) of 3 lists (sizes) of stars
-         (lists)
-        """
-        stars = {WHITE: {1: [], 2: [], 3: []}, BLUE: {1: [], 2: [], 3: []},
-                 RED: {1: [], 2: [], 3: []}, YELLOW: {1: [], 2: [], 3: []}}
-        for row in range(SCREEN_WIDTH):
-            for i in range(STARS_DENSITY):
-                new_star = self.create_star(row)
-                stars[new_star[3]][new_star[2]].append(new_star)
-        return stars
-
-    @staticmethod
-    def create_star(row: int):
-        """
-        Generate a single 'star' object to be added to the self.stars list -
-        game background. Each 'star' is a list containing info about it's x,
-        and y coordinates, star's size, and speed.
+        Generate 'stars' displayed in the background.
 
-        :return: list -- star in format: [x, y, size, color, speed]
+        :return: Starfield instance
         """
-        col = random.randint(0, SCREEN_WIDTH)
-        size = random.choice(STAR_SIZES)
-        color = random.choice(STARS_COLORS)
-        speed = random.random()
-        return [col, row, size, color, speed]
+        return Starfield(SCREEN_WIDTH, SCREEN_HEIGHT, self.rng.getrandbits(32))
 
     def scroll_stars(self):
         """
-        Scroll all the points of self.stars downward, and add new stars at the
-        top (moving stars from the bottom of the
-        screen to the top).
+        Scroll all the stars downward, and add new stars at the top (moving
+        stars from the bottom of the screen to the top).
         """
-        for color in self.stars:
-            for size in self.stars[color]:
-                for star in self.stars[color][size]:
-                    star[1] -= BACKGROUND_SPEED * star[4]
-                    if star[1] < 0:
-                        star[1] = SCREEN_HEIGHT + 1
-                        star[0] = random.randint(0, SCREEN_WIDTH)
+        self.stars.scroll()
 
     def draw_stars(self):
-        """Display 'stars" on the background, which are just 1px white dots."""
-        for color in self.stars:
-            for size in self.stars[color]:
-                arcade.draw_points(self.stars[color][size], color, size)
+        """Display 'stars" on the background, which are just small dots."""
+        self.stars.draw()
 
     @staticmethod
-    def create_spritelists():
+    def create_spritelists(layer: RenderLayer):
         """
-        Create empty arcade.SpriteList objects for each game sprite list
-        required.
+        Create empty SpriteBatch objects for each game sprite list required.
+        They are arcade.SpriteLists drawn by the RenderLayer with persistent
+        vertex buffers.
 
-        :return: arcade.SpriteList objects
+        :param layer: RenderLayer instance -- layer drawing the lists
+        :return: SpriteBatch objects
         """
-        return (arcade.SpriteList(), arcade.SpriteList(), arcade.SpriteList(),
-                arcade.SpriteList(), arcade.SpriteList(),
-                arcade.SpriteList())
+        return tuple(layer.create_batch() for _ in SPRITES_LISTS)
 
     def spawn_player(self):
         """
@@ -1102,18 +2537,27 @@ class Game(arcade.Window):
         """
         new_player = PlayerShip(player[TEXTURE])
         self.players.append(new_player)
+        self.players_grid.insert(new_player)
         return new_player
 
-    def spawn_hostile(self):
+    def spawn_hostile(self, model: str = None, x: float = None):
         """
         Create enemy spaceship and place it on the upper border of the screen.
         Also put into the self.hostiles.
+
+        :param model: str -- name of the hostile ship, random one allowed by
+        the difficulty by default
+        :param x: float -- x coordinate of the ship, random by default
         """
-        hostile = Hostile(self.difficulty)
+        hostile = Hostile(self.difficulty, model)
         hostile.center_y = SCREEN_HEIGHT - MARGIN
-        hostile.center_x = random.randint(MARGIN, SCREEN_WIDTH - MARGIN)
+        hostile.center_x = self.rng.randint(
+            int(MARGIN), int(SCREEN_WIDTH - MARGIN)) if x is None else x
         hostile.angle = DOWNWARD
         self.hostiles.append(hostile)
+        self.hostiles_grid.insert(hostile)
+        if self.hostiles_ai is not None:
+            self.hostiles_ai.add(hostile)
 
     def not_enough_enemies(self):
         """
@@ -1121,19 +2565,8 @@ class Game(arcade.Window):
 
         :return: bool -- should the game spawn new enemy?
         """
-        max_rating = 5 + self.difficulty
-        return sum([hostiles[RATINGS][hostile.model] for hostile in
-                    self.hostiles]) < max_rating
-
-    def if_difficulty_to_low(self):
-        """
-        Check for the conditions of raising game difficulty.
-
-        :return: bool -- if game difficulty should be raised
-        """
-        condition_a = self.difficulty <= len(hostiles[HOSTILES])
-        condition_b = self.game_time >= self.next_difficulty_raise
-        return condition_a and condition_b
+        max_rating = self.wave_scheduler.base_rating + self.difficulty
+        return self.census.rating < max_rating
 
     def raise_difficulty(self):
         """
@@ -1141,7 +2574,6 @@ class Game(arcade.Window):
         and amount of spawned enemies.
         """
         self.difficulty += 1
-        self.next_difficulty_raise += self.next_difficulty_raise
         self.create_hint("ESCALATION!",
                          pos_y=SCREEN_HEIGHT * 0.6,
                          speed_y=-5,
@@ -1157,8 +2589,8 @@ class Game(arcade.Window):
         """
         Create new 'hint'to be displayed on the screen during the game. Text
         should be short, since hints are displayed for short game_time. Hint
-        is added to the self.hits list and each frame game iterates through
-        his list and displays hints found there.
+        is added to the self.hints HintsManager, which moves and displays
+        all the hints each frame.
 
         :param text: str -- text of the hint, should be short!
         :param pos_x: float -- x position on the screen
@@ -1172,8 +2604,8 @@ class Game(arcade.Window):
         :param size: int -- size of the font
         :param time: int -- time that hint would be displayed for, in seconds
         """
-        self.hints.append(
-            [text, pos_x, pos_y, speed_x, speed_y, color, size, time * FPS])
+        self.hints.add(text, pos_x, pos_y, speed_x, speed_y, color, size,
+                       time * FPS)
 
     def update_hints(self):
         """
@@ -1181,23 +2613,15 @@ class Game(arcade.Window):
         screen and life-time parameter i it is largen than 0. Otherwise,
         remove the hint from the hints list.
         """
-        for hint in self.hints:
-            if hint[-1] > 0:
-                hint[-1] -= 1
-                if hint[3] != 0: hint[1] += hint[3]
-                if hint[4] != 0: hint[2] += hint[4]
-            else:
-                self.hints.remove(hint)
+        self.hints.update()
 
     def display_hints(self):
         """
         Display all the hints on the hints list. It should be usually only one
-        hint there. I not, make sure their x, and y (0 and 1) parameter are
-        different, or they would overlap.
+        hint there. I not, make sure their x, and y positions are different,
+        or they would overlap.
         """
-        for hint in self.hints:
-            arcade.draw_text(hint[0], hint[1], hint[2], hint[5], hint[6],
-                             align="center", anchor_x="center")
+        self.hints.draw()
 
     def add_target_marker(self, rocket: Projectile = None,
                           target: Hostile = None):
@@ -1208,12 +2632,12 @@ class Game(arcade.Window):
         :param rocket: Projectile instance -- player's rocket instance which
         marked that target
         :param target: Hostile instance -- enemy ship targeted by the rocket
+        :return: TargetMarker instance or None, if there is no target
         """
         if rocket is not None and target is not None:
-            new_target = {"rocket": rocket, "target": target,
-                          "x": target.center_x, "y": target.center_y,
-                          "width": target.width, "height": target.height}
-            self.targets_markers.append(new_target)
+            marker = TargetMarker(rocket, target)
+            self.targets_markers.append(marker)
+            return marker
 
     def update_targets_markers(self):
         """
@@ -1222,13 +2646,25 @@ class Game(arcade.Window):
         coordinates. If target does no longer exists or rocket which marked it
         went off the screen, delete this marker.
         """
-        for target in self.targets_markers:
-            if (target["rocket"] in self.projectiles and
-                    target["target"] in self.hostiles):
-                target["x"] = target["target"].center_x
-                target["y"] = target["target"].center_y
-            else:
-                self.targets_markers.remove(target)
+        self.targets_markers[:] = [marker for marker in self.targets_markers
+                                   if marker.update()]
+
+    def update_hostiles_ai(self):
+        """
+        Move all the hostile ships at once and let them decide what to do
+        next. Hostiles list update() only handles their weapons and turrets
+        afterwards.
+        """
+        self.hostiles_ai.update(self.player.center_x, self.player.center_y,
+                                self.threat_index.shots)
+
+    def update_collision_grids(self):
+        """
+        Rebuild SpatialHash grids of ships, which are the targets of all the
+        collision checks made by projectiles, powerups and player's ship.
+        """
+        self.players_grid.rebuild(self.players)
+        self.hostiles_grid.rebuild(self.hostiles)
 
     def draw_targets_markers(self):
         """
@@ -1236,45 +2672,173 @@ class Game(arcade.Window):
         self.targets_markers list. Rectangle is a marker for the hostile
         ships targeted by the player's rockets.
         """
-        for target in self.targets_markers:
-            arcade.draw_rectangle_outline(target["x"], target["y"],
-                                          target["width"], target["height"],
-                                          GREEN)
+        for marker in self.targets_markers:
+            arcade.draw_rectangle_outline(marker.x, marker.y, marker.width,
+                                          marker.height, GREEN)
+        self.profiler.count(DRAW_CALLS, len(self.targets_markers))
 
     def on_update(self, delta_time: float):
         """
-        Update game logic.
+        Update game logic with fixed time step: run as many ticks, as fit in
+        the real time which passed since the previous frame, so the game
+        speed does not depend on the rendering rate. The time left is used to
+        interpolate sprites positions when drawing.
 
-        :param delta_time:
+        :param delta_time: float -- seconds since the previous call
         """
         if self.in_menu:
             self.menu.update()
             self.cursor.on_update()
+        step = 1 / FPS
+        self.accumulator += delta_time
+        ticks = 0
+        # tolerance makes up for rounding errors of summed float times:
+        while self.accumulator > step - 1e-9 and \
+                ticks < self.max_ticks_per_frame:
+            self.tick()
+            self.accumulator -= step
+            ticks += 1
+        if ticks == self.max_ticks_per_frame:
+            # game can not keep up, so the time left is dropped:
+            self.accumulator %= step
+        self.accumulator = max(self.accumulator, 0.0)
+        self.interpolation = self.accumulator / step
+
+    def tick(self):
+        """
+        Update game logic by a single, fixed time step of 1 / FPS second.
+        """
+        self.frames += 1
         if self.players:
+            if not self.headless:
+                self.remember_positions()
             if not self.paused:
+                profiler = self.profiler
+                profiler.start()
+                if self.controller is not None:
+                    self.drive_controller()
+                profiler.lap("controller")
                 self.game_time += 1
 
-                if self.game_time % 90 == 0 and self.not_enough_enemies():
-                    self.spawn_hostile()
+                # waves, filling the screen and difficulty raises:
+                self.wave_scheduler.update(self)
 
                 # TODO: spawning bosses [ ], laser overheating [ ]
-
-                if self.challenge_mode and self.if_difficulty_to_low():
-                    self.raise_difficulty()
-
-                for sprite_list in self.sprites_lists:
+                profiler.lap("spawning")
+
+                for name, sprite_list in zip(SPRITES_LISTS,
+                                             self.sprites_lists):
+                    if sprite_list is self.hostiles:
+                        # player's shots hostiles try to avoid:
+                        self.threat_index.rebuild(self.projectiles)
+                        if self.hostiles_ai is not None:
+                            self.update_hostiles_ai()
                     if len(sprite_list) > 0:
                         sprite_list.update()
-
-                if len(self.targets_markers) > 0 and self.game_time % 3 == 0:
+                    profiler.lap(name)
+                    if sprite_list is self.hostiles:
+                        # parts attached to the ships follow them:
+                        self.transforms.update()
+                        self.turrets_system.update(self.transforms,
+                                                   self.player.center_x,
+                                                   self.player.center_y,
+                                                   self.game_time)
+                        # ships moved, so projectiles and powerups updated
+                        # next must check collisions with actual positions:
+                        self.update_collision_grids()
+                        profiler.lap("collision_grids")
+
+                if len(self.targets_markers) > 0:
                     self.update_targets_markers()
+                profiler.lap("targets_markers")
 
                 self.scroll_stars()
+                profiler.lap("stars")
 
                 self.update_hints()
+                profiler.lap("hints")
+                profiler.count(TICKS)
+                if self.headless:
+                    profiler.end_frame()  # otherwise frame ends in on_draw()
             else:
                 self.pause_time += 1
 
+    def simulate(self, frames: int):
+        """
+        Step game logic as fast as CPU allows, without waiting for the pyglet
+        clock. Used in headless mode to soak-test hostiles AI, projectiles and
+        collisions. Simulation stops earlier, if player's ship is destroyed.
+
+        :param frames: int -- number of ticks to run
+        :return: int -- number of frames actually simulated
+        """
+        for frame in range(frames):
+            if not self.players:
+                return frame
+            self.tick()
+        return frames
+
+    def replay(self, events: list, frames: int):
+        """
+        Re-drive tick() with keyboard events recorded by ReplayRecorder, as
+        fast as CPU allows. Each event is dispatched before the same tick()
+        call it was received before in the recorded session.
+
+        :param events: list -- events in format: (frame, kind, key, modifiers)
+        :param frames: int -- number of frames to replay
+        """
+        index = 0
+        for frame in range(frames):
+            while index < len(events) and events[index][0] <= frame:
+                _, kind, key, modifiers = events[index]
+                if kind == KEY_PRESS:
+                    self.on_key_press(key, modifiers)
+                elif kind == KEY_RELEASE:
+                    self.on_key_release(key, modifiers)
+                index += 1
+            self.tick()
+
+    def attach_controller(self, controller: BotController = None):
+        """
+        Let the programmatic player drive player's ship. Keyboard still
+        works, but controller's action overrides it each tick.
+
+        :param controller: BotController instance, or None to detach it
+        """
+        self.controller = controller
+        if controller is not None and self.observation is None:
+            self.observation = Observation()
+
+    def drive_controller(self):
+        """
+        Show current state of the game to the controller and apply it's
+        action to the player's ship.
+        """
+        self.observation.update(self)
+        self.apply_action(self.controller.act(self.observation))
+
+    def apply_action(self, action):
+        """
+        Set movement and shooting of the player's ship, as the keys would.
+
+        :param action: sequence of 4 numbers -- see BotController.act()
+        """
+        ship = self.player
+        horizontal, vertical, shooting, rocket = action
+        ship.horizontal = PlayerShip.RIGHT if horizontal > 0 else \
+            PlayerShip.LEFT if horizontal < 0 else PlayerShip.STOP
+        ship.vertical = PlayerShip.UP if vertical > 0 else \
+            PlayerShip.DOWN if vertical < 0 else PlayerShip.STOP
+        ship.shooting = bool(shooting)
+        if rocket:
+            self.launch_player_rocket()
+
+    def launch_player_rocket(self):
+        """Launch a rocket from the player's ship, if it has any."""
+        if self.player.rockets > 0:
+            self.player.launch_rocket()
+            self.shots_fired += 1
+
     def on_draw(self):
         """
         Draw all the in-game objects in the game window.
@@ -1285,39 +2849,115 @@ class Game(arcade.Window):
             self.cursor.draw()
         else:
             if self.players:  # game is rendered only, if player is alive
+                profiler = self.profiler
+                profiler.start()
                 self.draw_stars()
-
-                for sprite_list in self.sprites_lists:
+                profiler.count(DRAW_CALLS)
+                profiler.lap("draw_stars")
+
+                # sprites are drawn between their positions from the two
+                # last ticks, so they move smoothly with any rendering rate:
+                self.render_layer.begin(self.interpolation)
+                for name, sprite_list in zip(SPRITES_LISTS,
+                                             self.sprites_lists):
                     sprite_list.draw()
+                    profiler.lap("draw_" + name)
+                profiler.count(DRAW_CALLS, self.render_layer.end())
 
                 if len(self.targets_markers) > 0: self.draw_targets_markers()
+                profiler.lap("draw_targets_markers")
 
-                if len(self.hints) > 0: self.display_hints()
+                if len(self.hints) > 0:
+                    self.render_layer.begin()
+                    self.display_hints()
+                    profiler.count(DRAW_CALLS, self.render_layer.end())
+                profiler.lap("draw_hints")
 
+                self.render_layer.begin()
                 self.draw_hud()
+                profiler.count(DRAW_CALLS, self.render_layer.end())
+                profiler.lap("draw_hud")
+                # frame contains all the ticks run since the last drawing:
+                profiler.end_frame()
+
+                if self.show_profiler: self.draw_profiler()
 
                 if self.paused:
-                    arcade.draw_text("PAUSED", SCREEN_WIDTH / 2,
-                                     SCREEN_HEIGHT / 2,
-                                     arcade.color.WHITE_SMOKE, 24)
+                    text_cache.draw_text("PAUSED", SCREEN_WIDTH / 2,
+                                         SCREEN_HEIGHT / 2,
+                                         arcade.color.WHITE_SMOKE, 24)
             else:
                 if self.should_display_scores:
                     self.draw_scores_table()
                 else:
                     self.endgame()
 
+    def on_close(self):
+        """
+        Close the CSV file of the FrameProfiler, before the window is closed.
+        """
+        self.profiler.close_csv()
+        super().on_close()
+
+    def remember_positions(self):
+        """
+        Save positions of all sprites before they are moved by the next tick.
+        They are kept in the arrays of the SpriteBatches.
+        """
+        for sprite_list in self.sprites_lists:
+            sprite_list.remember()
+
     def draw_hud(self):
         """
-        Display hud information on the screen.
+        Display hud information on the screen. Must be called between
+        RenderLayer.begin() and RenderLayer.end().
         """
-        output = (f"Fired shots: {self.shots_fired},"
-                  f" Hit enemies: {self.hits}, Destroyed: {self.destroyed},"
-                  f"Rockets: {self.player.rockets},"
-                  f" Shield: {self.player.shield}, Score: {self.score}")
+        self.hud.update((self.shots_fired, self.hits, self.destroyed,
+                         self.player.rockets, self.player.shield,
+                         self.score), self.god_mode)
+        self.hud.draw()
 
-        if self.god_mode: output += ", Godmode: on"
+    def draw_profiler(self):
+        """
+        Display percentiles of the duration of each measured frame phase,
+        above the hud. Percentiles are recalculated once per second.
+        """
+        if self.frames % FPS == 0 or not self.profiler_lines:
+            self.profiler_lines = [
+                f"{phase:<22}{p50:>7.2f}{p95:>7.2f}{p99:>7.2f}" for
+                phase, p50, p95, p99 in self.profiler.report()]
+            self.profiler_lines.append(
+                f"{'frame budget':<22}{1000 / self.render_fps:>7.2f}")
+            self.profiler_lines.extend(
+                f"{counter:<22}{p50:>7}{p95:>7}{p99:>7}" for
+                counter, p50, p95, p99 in self.profiler.counters_report())
+        pos_y = SCORE_STRIPE + 20 * len(self.profiler_lines)
+        text_cache.draw_text(
+            f"{'phase [ms]':<22}{'p50':>7}{'p95':>7}{'p99':>7}", 10,
+            pos_y + 20, arcade.color.ANTIQUE_WHITE, 12, font_name="courier")
+        # lines change every second, so they are not kept in the text_cache:
+        for i, line in enumerate(self.profiler_lines):
+            arcade.draw_text(line, 10, pos_y - i * 20,
+                             arcade.color.ANTIQUE_WHITE, 12,
+                             font_name="courier")
 
-        arcade.draw_text(output, 10, 20, arcade.color.ANTIQUE_WHITE, 14)
+    def toggle_sound(self):
+        """
+        Mute or unmute all the sounds of the game.
+        """
+        state = "ON" if self.sound.toggle() else "OFF"
+        if self.hints is not None:  # no hints in menu before the first game
+            self.create_hint("SOUND " + state, size=20, time=1)
+
+    def toggle_profiler(self):
+        """
+        Show or hide FrameProfiler overlay. Profiler measures frames only
+        when overlay is displayed, or timings are written to the CSV file.
+        """
+        self.show_profiler = not self.show_profiler
+        self.profiler_lines = []
+        self.profiler.enabled = (self.show_profiler or
+                                 self.profiler.csv_file is not None)
 
     def on_mouse_motion(self, x: float, y: float, dx: float, dy: float):
         """
@@ -1365,6 +3005,8 @@ class Game(arcade.Window):
         :param int key: Key that was hit
         :param int modifiers: If it was shift/ctrl/alt
         """
+        if self.recorder is not None:
+            self.recorder.record(self.frames, KEY_PRESS, key, modifiers)
         if not (self.players or self.in_menu):
             if self.should_display_scores:
                 self.enter_player_name(key, modifiers)
@@ -1378,6 +3020,10 @@ class Game(arcade.Window):
         else:
             if key == arcade.key.P or key == arcade.key.PAUSE:
                 self.toggle_pause()
+            if key == arcade.key.F3:
+                self.toggle_profiler()
+            if key == arcade.key.M:
+                self.toggle_sound()
             if not (self.paused or self.in_menu):
                 if key == arcade.key.W or key == arcade.key.UP:
                     self.player.vertical = PlayerShip.UP
@@ -1390,9 +3036,7 @@ class Game(arcade.Window):
                 if key == arcade.key.SPACE:
                     self.player.toggle_shooting()
                 if key == arcade.key.R:
-                    if self.player.rockets > 0:
-                        self.player.launch_rocket()
-                        self.shots_fired += 1
+                    self.launch_player_rocket()
                 if key == arcade.key.G:  # GOD MODE for testing
                     self.toggle_god_mode()
 
@@ -1426,6 +3070,8 @@ class Game(arcade.Window):
         :param int key: Key that was hit
         :param int modifiers: If it was shift/ctrl/alt
         """
+        if self.recorder is not None:
+            self.recorder.record(self.frames, KEY_RELEASE, key, modifiers)
         if not (self.paused or self.in_menu) and self.players:
             if key == arcade.key.W or key == arcade.key.UP:
                 self.player.vertical = PlayerShip.STOP
@@ -1489,15 +3135,13 @@ class Game(arcade.Window):
         for i in range(len(scores_table)):
             score = scores_table[i]
             color = GREEN if score[1] else base_color
-            arcade.draw_text(score[0], SCREEN_WIDTH * 0.4,
-                             SCREEN_HEIGHT * 0.8 - i * 30, color, 20)
+            text_cache.draw_text(score[0], SCREEN_WIDTH * 0.4,
+                                 SCREEN_HEIGHT * 0.8 - i * 30, color, 20)
 
     @staticmethod
     def compare_with_best_scores(best_scores: list, current_score: int):
         """
         Check if current score is good enough to enter best scores ever played.
-        If so, save it to the file with Shelve
-        module.
 
         :param current_score: int -- score achieved by current player in last
         game
@@ -1506,45 +3150,31 @@ class Game(arcade.Window):
         :return: bool, int -- if there is new  score and, index of player's
         score on the best scores-table list
         """
-        new_score, highest_index = False, None  # important variables
-        for i in range(len(best_scores)):
-            if current_score > best_scores[i]["score"]:
-                new_score, highest_index = True, i
-            else:
-                break
-        if len(best_scores) < 10 and not new_score:
-            new_score = True
-        return new_score, highest_index
+        # number of the lower scores in the table sorted from the lowest:
+        lower = bisect.bisect_left(ScoresView(best_scores), current_score)
+        new_score = lower > 0 or len(best_scores) < 10
+        return new_score, lower - 1 if lower > 0 else None
 
     @staticmethod
     def load_best_scores(path: str = CONFIG_PATH, filename: str = SCORES_FILE):
         """
-        Use Shelve module to unpack previously saved best scores in game.
+        Read previously saved best scores in game, without waiting for the
+        background thread. Game itself loads them in background.
 
         :return: list of dicts -- best scores in the game in format:
         [{name: str, score: int}...]
         """
-        file_path = path + filename
-        if not os.path.isfile(file_path):
-            new_file = shelve.open(file_path)
-            new_file["scores"] = []
-            new_file.close()
-        with shelve.open(file_path) as d:
-            return d["scores"]
+        store = ScoreStore(path + filename,
+                           legacy_path=path + LEGACY_SCORES_FILE)
+        store.load(background=False)
+        return store.table
 
     def save_best_scores(self):
         """
-        Save most actual version of best scores table to the Shelve file,
-        including new score of current game.
-        """
-        self.best_scores.append(
-            {"name": self.player_name, "score": self.score})
-        self.best_scores.sort(key=lambda x: x["score"])
-        filename = CONFIG_PATH + SCORES_FILE
-        file = shelve.open(filename)
-        file["scores"] = self.best_scores if len(
-            self.best_scores) < 11 else self.best_scores[-10:]
-        file.close()
+        Add score of current game to the best scores table, which is saved
+        to the file in the background.
+        """
+        self.scores.add(self.player_name, self.score)
         self.endgame()
 
     def toggle_pause(self):
@@ -1571,24 +3201,118 @@ class Game(arcade.Window):
         When player dies, ad game ends, show proper hint to the player.
         """
         output = "GAME OVER!"
-        arcade.draw_text(output, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2,
-                         arcade.color.RED_DEVIL, 24)
+        text_cache.draw_text(output, SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2,
+                             arcade.color.RED_DEVIL, 24)
         hint = "Press ENTER to restart, or ESC to quit..."
-        arcade.draw_text(hint, SCREEN_WIDTH / 2, (SCREEN_HEIGHT / 2) - 30,
-                         arcade.color.RED_DEVIL, 12)
+        text_cache.draw_text(hint, SCREEN_WIDTH / 2, (SCREEN_HEIGHT / 2) - 30,
+                             arcade.color.RED_DEVIL, 12)
+
+
+def load_game_config(path: str = CONFIG_PATH, filename: str = CONFIG_FILE):
+    """
+    Load game data from the config file into the global variables used by
+    all the game objects.
+
+    :param path: str -- path of the directory containing config file
+    :param filename: str -- name of the config file, e.g. modified copy of
+    the game_config.txt, tested by balancing runs
+    """
+    global settings, player, hostiles, powerups, levels, weapons
+    settings, player, hostiles, weapons, levels, powerups = \
+        load_config_from_file(path, filename)
 
 
-def run_game():
+def run_game(record: str = None, profile: str = None,
+             batched_ai: bool = False, render_fps: int = RENDER_FPS,
+             max_ticks_per_frame: int = MAX_TICKS_PER_FRAME):
     """
     Actual entry point of the game.py required in case of initializing script
     from other script.
+
+    :param record: str -- path of the file to record game sessions into
+    :param profile: str -- path of the CSV file to write frames timings into
+    :param batched_ai: bool -- update hostiles with HostilesAI engine
+    :param render_fps: int -- how many times per second screen is drawn
+    :param max_ticks_per_frame: int -- catch-up limit of logic updates
     """
-    global game, settings, player, hostiles, powerups, levels, weapons
-    settings, player, hostiles, weapons, levels, powerups = \
-        load_config_from_file(CONFIG_PATH, CONFIG_FILE)
-    game = Game(SCREEN_WIDTH, SCREEN_HEIGHT, TITLE, False, True)
+    global game
+    load_game_config()
+    game = Game(SCREEN_WIDTH, SCREEN_HEIGHT, TITLE, False, True,
+                record=record, profile=profile, batched_ai=batched_ai,
+                render_fps=render_fps,
+                max_ticks_per_frame=max_ticks_per_frame)
     arcade.run()
 
 
+def run_headless(frames: int, seed: int = None, batched_ai: bool = False,
+                 config_path: str = CONFIG_PATH,
+                 config_file: str = CONFIG_FILE):
+    """
+    Start new game without window and simulate it for a number of frames.
+    Screen size is fixed by RED_INVADERS_SCREEN environment variable.
+
+    :param frames: int -- number of frames to simulate
+    :param seed: int -- seed of random numbers generator
+    :param batched_ai: bool -- update hostiles with HostilesAI engine
+    :param config_path: str -- path of the directory containing config file
+    :param config_file: str -- name of the config file
+    :return: Game instance after the simulation
+    """
+    global game
+    load_game_config(config_path, config_file)
+    game = Game(SCREEN_WIDTH, SCREEN_HEIGHT, TITLE, False, False,
+                headless=True, seed=seed, batched_ai=batched_ai)
+    game.setup_new_game()
+    game.simulate(frames)
+    return game
+
+
+def run_replay(path: str, profile: str = None):
+    """
+    Replay game session recorded with Game(record=path) in headless mode.
+    Screen size must be the same as in the recorded session.
+
+    :param path: str -- path of the replay file
+    :param profile: str -- path of the CSV file to write frames timings into
+    :return: Game instance after the replay
+    """
+    global game
+    header, events = load_replay(path)
+    if (header["width"], header["height"]) != (SCREEN_WIDTH, SCREEN_HEIGHT):
+        raise ValueError(f"Replay was recorded on {header['width']}x"
+                         f"{header['height']} screen, set RED_INVADERS_SCREEN"
+                         f" environment variable to replay it.")
+    load_game_config()
+    game = Game(SCREEN_WIDTH, SCREEN_HEIGHT, TITLE, False, False,
+                headless=True, profile=profile,
+                batched_ai=header["batched_ai"])
+    game.difficulty = header["difficulty"]
+    game.challenge_mode = header["challenge_mode"]
+    game.god_mode = header["god_mode"]
+    game.setup_new_game(seed=header["seed"])
+    game.replay(events, replay_length(events))
+    game.profiler.close_csv()
+    return game
+
+
 if __name__ == "__main__":
-    run_game()
+    parser = argparse.ArgumentParser(description=TITLE)
+    parser.add_argument("--record", metavar="FILE",
+                        help="record keyboard events of the game session")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="replay recorded session without window")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="write durations of frame phases to CSV file")
+    parser.add_argument("--batched-ai", action="store_true",
+                        help="update all hostile ships at once with NumPy")
+    parser.add_argument("--render-fps", type=int, default=RENDER_FPS,
+                        help="how many times per second screen is drawn")
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS_PER_FRAME,
+                        help="maximum logic updates to catch up in a frame")
+    arguments = parser.parse_args()
+    if arguments.replay:
+        replayed = run_replay(arguments.replay, arguments.profile)
+        print(f"Replayed {replayed.frames} frames, score: {replayed.score}")
+    else:
+        run_game(arguments.record, arguments.profile, arguments.batched_ai,
+                 arguments.render_fps, arguments.max_ticks)
@@ -0,0 +1,499 @@
+import math
+
+import numpy
+import arcade
+
+from PIL import Image
+from pyglet import gl
+from arcade import shader
+from arcade.sprite_list import VERTEX_SHADER, FRAGMENT_SHADER
+
+# images wider than that start their own shelf of the atlas:
+ATLAS_WIDTH = 2048
+# transparent pixels between images, so filtering does not mix them:
+PADDING = 1
+# Sprites which jumped farther than that between ticks are not interpolated:
+MAX_INTERPOLATED_DISTANCE = 100
+# per-instance attributes of the sprites: dtype, shape and shader input:
+ATTRIBUTES = (("position", numpy.float32, 2, "2f", "in_pos"),
+              ("angle", numpy.float32, 1, "1f", "in_angle"),
+              ("size", numpy.float32, 2, "2f", "in_scale"),
+              ("sub_tex_coords", numpy.float32, 4, "4f", "in_sub_tex_coords"),
+              ("color", numpy.uint8, 4, "4B", "in_color"))
+# corners of the quad drawn for each sprite: x, y, u, v:
+QUAD = numpy.array([-1.0, -1.0, 0.0, 0.0,
+                    -1.0, 1.0, 0.0, 1.0,
+                    1.0, -1.0, 1.0, 0.0,
+                    1.0, 1.0, 1.0, 1.0], dtype=numpy.float32)
+
+
+class TextureAtlas:
+    """
+    Single texture containing images of all the textures drawn by the
+    RenderLayer, packed in rows (shelves). Known textures are packed at once
+    when the atlas is created, and any other image is added when the first
+    Sprite using it is drawn. Each image keeps it's place in the atlas, so
+    Sprites joining and leaving batches never rebuild it.
+    """
+
+    def __init__(self, width: int = ATLAS_WIDTH):
+        """
+        :param width: int -- width of the shelves in pixels
+        """
+        self.width = width
+        self.indices = {}  # texture name -> index of it's image
+        self.images = []
+        self.rects = []  # x, y (from the top), width, height in pixels
+        self.shelf_x, self.shelf_y, self.shelf_height = 0, 0, 0
+        # texture coordinates of each image, used by the shader:
+        self.coords = numpy.zeros((0, 4), dtype=numpy.float32)
+        # incremented each time images are added and coords change:
+        self.version = 0
+        self.texture = None
+        self.uploaded = -1  # version of the atlas sent to the GPU
+
+    def __len__(self):
+        return len(self.images)
+
+    def index(self, texture: arcade.Texture):
+        """
+        :param texture: arcade.Texture -- texture of a Sprite
+        :return: int -- index of the texture's image in the atlas
+        """
+        index = self.indices.get(texture.name)
+        if index is None:
+            index = self.indices[texture.name] = self.add(texture.image)
+        return index
+
+    def extend(self, textures):
+        """
+        Add images of many textures at once, so the atlas is rebuilt and
+        sent to the GPU only once, instead of each time a new texture is
+        drawn.
+
+        :param textures: iterable of arcade.Textures
+        """
+        for texture in textures:
+            if texture.name not in self.indices:
+                self.indices[texture.name] = self.place(texture.image)
+        if len(self.images) > self.coords.shape[0]:
+            self.update_coords()
+
+    def add(self, image: Image.Image):
+        """
+        Put the image into the atlas, and find new texture coordinates.
+
+        :param image: PIL.Image -- image of the texture
+        :return: int -- index of the image
+        """
+        index = self.place(image)
+        self.update_coords()
+        return index
+
+    def place(self, image: Image.Image):
+        """
+        Put the image at the end of the last shelf, or start a new one if
+        it does not fit.
+
+        :param image: PIL.Image -- image of the texture
+        :return: int -- index of the image
+        """
+        width, height = image.size
+        if self.shelf_x > 0 and self.shelf_x + width > self.width:
+            self.shelf_x = 0
+            self.shelf_y += self.shelf_height + PADDING
+            self.shelf_height = 0
+        self.rects.append((self.shelf_x, self.shelf_y, width, height))
+        self.images.append(image)
+        self.shelf_x += width + PADDING
+        self.shelf_height = max(self.shelf_height, height)
+        return len(self.images) - 1
+
+    def size(self):
+        """
+        :return: tuple -- width and height of the atlas in pixels
+        """
+        if not self.rects:
+            return 1, 1
+        return (max(self.width, max(x + w for x, _, w, _ in self.rects)),
+                self.shelf_y + self.shelf_height)
+
+    def update_coords(self):
+        """
+        Find texture coordinates of all the images. They depend on the size
+        of the atlas, which grows with new shelves. Shader flips the vertical
+        coordinate, as arcade.SpriteList does.
+        """
+        width, height = self.size()
+        rects = numpy.array(self.rects, dtype=numpy.float32)
+        self.coords = numpy.column_stack((
+            rects[:, 0] / width, 1 - (rects[:, 1] + rects[:, 3]) / height,
+            rects[:, 2] / width, rects[:, 3] / height)).astype(numpy.float32)
+        self.version += 1
+
+    def image(self):
+        """
+        :return: PIL.Image -- all the images pasted into one
+        """
+        atlas = Image.new("RGBA", self.size())
+        for image, (x, y, _, _) in zip(self.images, self.rects):
+            atlas.paste(image, (x, y))
+        return atlas
+
+    def use(self):
+        """Bind the atlas, sending it to the GPU first, if it changed."""
+        if self.uploaded != self.version:
+            image = self.image()
+            self.texture = shader.texture(image.size, 4,
+                                          numpy.asarray(image))
+            self.uploaded = self.version
+        self.texture.use(0)
+
+
+class SpriteBatch(arcade.SpriteList):
+    """
+    arcade.SpriteList drawn with persistent vertex buffers. Each Sprite has
+    it's slot in NumPy arrays of the instances attributes, and each
+    attribute has it's own GPU buffer. Sprites report their changes by the
+    arcade.SpriteList callbacks (update_location, update_angle...), which
+    write the new values into the slot and extend dirty range of the
+    attribute, so only the changed parts of the buffers are sent to the GPU.
+    Buffers double their capacity when they are full, and removed Sprite's
+    slot is filled with the last one, so Sprites joining and leaving the
+    batch never rebuild it. Order of the Sprites in the list, used to update
+    them, is kept.
+
+    Until the batch is drawn first time, it only keeps the slots, so batches
+    of the headless game cost nothing more than arcade.SpriteLists.
+
+    Positions from the previous tick are kept in the array too (see
+    remember()), so the batch could draw Sprites between their two last
+    positions without moving them. Sprites which joined the batch since the
+    last tick (e.g. recycled by the SpritesPool) are drawn where they are.
+    """
+
+    def __init__(self, layer, capacity: int = 64):
+        """
+        :param layer: RenderLayer instance -- layer sharing it's shader
+        program and texture atlas with this batch
+        :param capacity: int -- number of slots allocated at start
+        """
+        super().__init__()
+        self.layer = layer
+        self.slots = {}  # Sprite -> it's slot in the arrays
+        self.slots_sprites = []
+        self.capacity = capacity
+        self.arrays = {name: numpy.zeros((capacity, width), dtype=dtype)
+                       for name, dtype, width, _, _ in ATTRIBUTES}
+        self.textures = numpy.zeros(capacity, dtype=numpy.int32)
+        # positions of the Sprites in the previous tick, and Sprites which
+        # were not in the batch then:
+        self.previous = numpy.zeros((capacity, 2), dtype=numpy.float32)
+        self.fresh = numpy.ones(capacity, dtype=bool)
+        # [first, last + 1] slots drawn in interpolated positions last time:
+        self.interpolated = [0, 0]
+        self.atlas_version = -1
+        # changes of the Sprites are tracked since the batch is drawn:
+        self.tracking = False
+        # [first, last + 1] slots of each attribute changed since last draw:
+        self.dirty = {name: [0, 0] for name, _, _, _, _ in ATTRIBUTES}
+        self.buffers = None
+        self.buffers_capacity = 0
+
+    def __contains__(self, item: arcade.Sprite):
+        return item in self.slots
+
+    def append(self, item: arcade.Sprite):
+        """Add new Sprite into the first free slot."""
+        slot = len(self.slots_sprites)
+        if slot == self.capacity:
+            self.grow()
+        self.sprite_list.append(item)
+        self.slots[item] = slot
+        self.slots_sprites.append(item)
+        item.register_sprite_list(self)
+        if self.tracking:
+            self.write(slot, item)
+
+    def remove(self, item: arcade.Sprite):
+        """Remove Sprite and move the last one into it's slot."""
+        self.sprite_list.remove(item)
+        slot = self.slots.pop(item)
+        last = self.slots_sprites.pop()
+        if last is not item:
+            self.slots_sprites[slot] = last
+            self.slots[last] = slot
+            if self.tracking:
+                last_slot = len(self.slots_sprites)
+                for name, array in self.arrays.items():
+                    array[slot] = array[last_slot]
+                    self.mark(name, slot)
+                self.textures[slot] = self.textures[last_slot]
+                self.previous[slot] = self.previous[last_slot]
+                self.fresh[slot] = self.fresh[last_slot]
+
+    def pop(self):
+        """Remove the last Sprite of the list."""
+        item = self.sprite_list[-1]
+        self.remove(item)
+        item.sprite_lists.remove(self)
+        return item
+
+    def grow(self):
+        """Double the capacity of the arrays and buffers."""
+        self.capacity *= 2
+        for name, array in self.arrays.items():
+            self.arrays[name] = numpy.resize(
+                array, (self.capacity,) + array.shape[1:])
+        self.textures = numpy.resize(self.textures, self.capacity)
+        self.previous = numpy.resize(self.previous, (self.capacity, 2))
+        self.fresh = numpy.resize(self.fresh, self.capacity)
+
+    def mark(self, name: str, slot: int):
+        """Extend dirty range of the attribute with the slot."""
+        dirty = self.dirty[name]
+        if slot < dirty[0]:
+            dirty[0] = slot
+        if slot >= dirty[1]:
+            dirty[1] = slot + 1
+
+    def write(self, slot: int, sprite: arcade.Sprite):
+        """Write all the attributes of the Sprite into it's slot."""
+        arrays = self.arrays
+        arrays["position"][slot] = sprite._position
+        arrays["angle"][slot] = math.radians(sprite.angle)
+        arrays["size"][slot] = sprite.width / 2, sprite.height / 2
+        arrays["color"][slot] = sprite.color + (sprite.alpha,)
+        self.textures[slot] = index = self.layer.atlas.index(sprite._texture)
+        arrays["sub_tex_coords"][slot] = self.layer.atlas.coords[index]
+        self.fresh[slot] = True
+        for name in self.dirty:
+            self.mark(name, slot)
+
+    def update_location(self, sprite: arcade.Sprite):
+        """
+        Positions change most often, so they are only marked here, and read
+        from the Sprites at once, when the batch is drawn.
+        """
+        if not self.tracking:
+            return
+        slot = self.slots[sprite]
+        dirty = self.dirty["position"]
+        if slot < dirty[0]:
+            dirty[0] = slot
+        if slot >= dirty[1]:
+            dirty[1] = slot + 1
+
+    def update_angle(self, sprite: arcade.Sprite):
+        if not self.tracking:
+            return
+        slot = self.slots[sprite]
+        self.arrays["angle"][slot] = math.radians(sprite.angle)
+        self.mark("angle", slot)
+
+    def update_position(self, sprite: arcade.Sprite):
+        """Called when size, color or alpha of the Sprite changed."""
+        if not self.tracking:
+            return
+        slot = self.slots[sprite]
+        self.arrays["size"][slot] = sprite.width / 2, sprite.height / 2
+        self.arrays["color"][slot] = sprite.color + (sprite.alpha,)
+        self.mark("size", slot)
+        self.mark("color", slot)
+
+    def update_texture(self, sprite: arcade.Sprite):
+        if not self.tracking:
+            return
+        slot = self.slots[sprite]
+        self.textures[slot] = index = self.layer.atlas.index(sprite._texture)
+        self.arrays["sub_tex_coords"][slot] = self.layer.atlas.coords[index]
+        self.arrays["size"][slot] = sprite.width / 2, sprite.height / 2
+        self.mark("sub_tex_coords", slot)
+        self.mark("size", slot)
+
+    def refresh(self):
+        """Write all the Sprites into their slots."""
+        for slot, sprite in enumerate(self.slots_sprites):
+            self.write(slot, sprite)
+
+    def gather(self):
+        """Read positions of the Sprites which moved since the last draw."""
+        count = len(self.slots_sprites)
+        first, last = self.dirty["position"][0], min(
+            self.dirty["position"][1], count)
+        if first < last:
+            self.arrays["position"][first:last] = [
+                sprite._position for sprite in self.slots_sprites[first:last]]
+
+    def remember(self):
+        """
+        Keep current positions of the Sprites as the previous ones, before
+        the next tick moves them.
+        """
+        if not self.tracking:
+            return
+        self.gather()
+        count = len(self.slots_sprites)
+        self.previous[:count] = self.arrays["position"][:count]
+        self.fresh[:count] = False
+
+    def interpolate(self, alpha: float):
+        """
+        Find positions of the Sprites between the previous and the current
+        ones, proportionally to the alpha.
+
+        :param alpha: float -- 0 for the previous positions, 1 for the
+        current ones
+        :return: tuple -- array of positions, and [first, last + 1] slots of
+        the interpolated ones
+        """
+        count = len(self.slots_sprites)
+        current = self.arrays["position"][:count]
+        delta = current - self.previous[:count]
+        moving = numpy.flatnonzero(~self.fresh[:count] & (
+            delta != 0).any(axis=1) & (numpy.abs(delta).sum(axis=1) <
+                                       self.layer.max_distance))
+        if len(moving) == 0:
+            return current, [0, 0]
+        positions = current.copy()
+        positions[moving] -= delta[moving] * (1 - alpha)
+        return positions, [int(moving[0]), int(moving[-1]) + 1]
+
+    def prepare(self, alpha: float = None):
+        """
+        Find changes of the arrays, which should be sent to the GPU.
+
+        :param alpha: float -- how far between previous and current
+        positions Sprites are drawn, None to draw them where they are
+        :return: list of tuples -- name of the attribute, offset in bytes
+        and data to write into it's buffer
+        """
+        if not self.tracking:
+            self.tracking = True
+            self.refresh()
+        count = len(self.slots_sprites)
+        atlas = self.layer.atlas
+        if self.atlas_version != atlas.version:
+            # atlas grew, so coordinates of all the images changed:
+            self.atlas_version = atlas.version
+            self.arrays["sub_tex_coords"][:count] = atlas.coords[
+                self.textures[:count]]
+            self.dirty["sub_tex_coords"] = [0, count]
+        self.gather()
+        sources = dict(self.arrays)
+        if alpha is not None:
+            sources["position"], interpolated = self.interpolate(alpha)
+        else:
+            interpolated = [0, 0]
+        # Sprites interpolated now, or the last time, are written:
+        for first, last in (interpolated, self.interpolated):
+            if first < last:
+                self.mark("position", first)
+                self.mark("position", last - 1)
+        self.interpolated = interpolated
+        writes = []
+        for name, dirty in self.dirty.items():
+            first, last = dirty[0], min(dirty[1], count)
+            if first < last:
+                array = sources[name]
+                writes.append((name, first * array.strides[0],
+                               array[first:last].tobytes()))
+            dirty[0], dirty[1] = count, 0
+        return writes
+
+    def create_buffers(self):
+        """Allocate GPU buffers for all the slots and bind them together."""
+        program = self.layer.program
+        self.buffers = {
+            name: shader.Buffer.create_with_size(
+                self.capacity * self.arrays[name].itemsize * width,
+                usage="dynamic") for name, _, width, _, _ in ATTRIBUTES}
+        self.buffers_capacity = self.capacity
+        self.vao = shader.vertex_array(program, [shader.BufferDescription(
+            self.layer.quad, "2f 2f", ("in_vert", "in_texture"))] + [
+            shader.BufferDescription(
+                self.buffers[name], layout, (attribute,),
+                normalized=["in_color"] if name == "color" else (),
+                instanced=True) for name, _, _, layout, attribute in
+            ATTRIBUTES])
+
+    def draw(self):
+        """
+        Draw all the Sprites with a single instanced draw call. Must be
+        called between RenderLayer.begin() and RenderLayer.end().
+        """
+        count = len(self.slots_sprites)
+        if count == 0:
+            return
+        if self.buffers_capacity != self.capacity:
+            self.create_buffers()
+            # new buffers are filled from scratch:
+            for dirty in self.dirty.values():
+                dirty[0], dirty[1] = 0, count
+        for name, offset, data in self.prepare(self.layer.alpha):
+            self.buffers[name].write(data, offset)
+        # new textures were added to the atlas by prepare():
+        self.layer.atlas.use()
+        with self.vao:
+            self.layer.program["Texture"] = 0
+            self.layer.program["Projection"] = arcade.get_projection(
+            ).flatten()
+            self.vao.render(gl.GL_TRIANGLE_STRIP, instances=count)
+        self.layer.draw_calls += 1
+
+
+class RenderLayer:
+    """
+    Draws gameplay Sprites kept in SpriteBatches. All the batches share a
+    single shader program and a single TextureAtlas, so the only per-batch
+    work is writing changed parts of it's buffers and one draw call. Batches
+    are drawn separately, and in order, so Sprites of each batch cover the
+    Sprites of the previous ones.
+    """
+
+    def __init__(self, max_distance: float = MAX_INTERPOLATED_DISTANCE,
+                 textures=()):
+        """
+        :param max_distance: float -- Sprites which moved farther than that
+        in a single tick are drawn in their current positions
+        :param textures: iterable of arcade.Textures -- textures which would
+        be drawn, packed into the atlas at once
+        """
+        self.atlas = TextureAtlas()
+        self.atlas.extend(textures)
+        self.program = None
+        self.quad = None
+        self.max_distance = max_distance
+        # how far between previous and current positions Sprites are drawn:
+        self.alpha = None
+        self.draw_calls = 0  # draw calls made since the last begin()
+
+    def create_batch(self, capacity: int = 64):
+        """
+        :param capacity: int -- number of slots allocated at start
+        :return: SpriteBatch instance
+        """
+        return SpriteBatch(self, capacity)
+
+    def begin(self, alpha: float = None):
+        """
+        Prepare shared GL state for drawing the batches.
+
+        :param alpha: float -- 0 draws Sprites in their positions from the
+        previous tick (see SpriteBatch.remember()), 1 in the current ones,
+        None in the current ones without interpolation
+        """
+        self.alpha = alpha
+        self.draw_calls = 0
+        if self.program is None:
+            self.program = shader.program(vertex_shader=VERTEX_SHADER,
+                                          fragment_shader=FRAGMENT_SHADER)
+            self.quad = shader.buffer(QUAD.tobytes())
+        gl.glEnable(gl.GL_BLEND)
+        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+
+    def end(self):
+        """
+        :return: int -- number of draw calls made since begin()
+        """
+        return self.draw_calls
@@ -0,0 +1,118 @@
+import struct
+
+# replay file starts with header: magic bytes, version of the format, seed of
+# the session, screen width and height, game difficulty and bit flags:
+HEADER = struct.Struct("<4sBIHHBB")
+MAGIC, VERSION = b"RIRP", 1
+CHALLENGE_MODE, GOD_MODE, BATCHED_AI = 1, 2, 4
+# each event is: frame number, kind of event, key code and key modifiers:
+EVENT = struct.Struct("<IBIH")
+KEY_PRESS, KEY_RELEASE, END = 0, 1, 2
+
+
+class ReplayRecorder:
+    """
+    Record keyboard events of a single game session into a compact binary
+    file, which can later re-drive the game logic frame by frame.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: str -- path of the replay file, overwritten by each new
+        recorded session
+        """
+        self.path = path
+        self.file = None
+
+    @property
+    def recording(self):
+        return self.file is not None
+
+    def start(self, seed: int, width: int, height: int, difficulty: int,
+              challenge_mode: bool, god_mode: bool,
+              batched_ai: bool = False):
+        """
+        Open replay file and write the session header, which contains all the
+        state required to start the same session again.
+
+        :param seed: int -- seed of the game random numbers generator
+        :param width: int -- screen width in pixels
+        :param height: int -- screen height in pixels
+        :param difficulty: int -- game difficulty at the start of session
+        :param challenge_mode: bool -- if difficulty raises with time
+        :param god_mode: bool -- if player's ship is indestructible
+        :param batched_ai: bool -- if hostiles are updated by HostilesAI
+        """
+        if self.recording:
+            self.stop(0)
+        flags = CHALLENGE_MODE * bool(challenge_mode) + GOD_MODE * bool(
+            god_mode) + BATCHED_AI * bool(batched_ai)
+        self.file = open(self.path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, width, height,
+                                    difficulty, flags))
+
+    def record(self, frame: int, kind: int, key: int = 0,
+               modifiers: int = 0):
+        """
+        Write single event. File is flushed each time, since events are rare
+        and game could be closed at any moment.
+
+        :param frame: int -- number of frames updated before the event
+        :param kind: int -- KEY_PRESS, KEY_RELEASE or END
+        :param key: int -- key code
+        :param modifiers: int -- key modifiers (SHIFT, CTRL, etc.)
+        """
+        if self.recording:
+            self.file.write(EVENT.pack(frame, kind, key, modifiers))
+            self.file.flush()
+
+    def stop(self, frame: int):
+        """
+        Write the END event and close the replay file.
+
+        :param frame: int -- number of frames updated in the session
+        """
+        if self.recording:
+            self.record(frame, END)
+            self.file.close()
+            self.file = None
+
+
+def load_replay(path: str):
+    """
+    Read replay file recorded by ReplayRecorder.
+
+    :param path: str -- path of the replay file
+    :return: dict, list -- header of the session, and list of events in
+    format: (frame, kind, key, modifiers)
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    magic, version, seed, width, height, difficulty, flags = \
+        HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a replay file of version {VERSION}")
+    header = {"seed": seed, "width": width, "height": height,
+              "difficulty": difficulty,
+              "challenge_mode": bool(flags & CHALLENGE_MODE),
+              "god_mode": bool(flags & GOD_MODE),
+              "batched_ai": bool(flags & BATCHED_AI)}
+    # incomplete event, if game crashed while writing it, is ignored:
+    events_size = (len(data) - HEADER.size) // EVENT.size * EVENT.size
+    events = list(EVENT.iter_unpack(
+        data[HEADER.size:HEADER.size + events_size]))
+    return header, events
+
+
+def replay_length(events: list):
+    """
+    Find number of frames the recorded session lasted.
+
+    :param events: list -- events loaded with load_replay()
+    :return: int -- frame of the END event, or of the last event, if the
+    recording was not finished properly
+    """
+    for frame, kind, _, _ in reversed(events):
+        if kind == END:
+            return frame
+    return events[-1][0] if events else 0
@@ -0,0 +1,271 @@
+import os
+import queue
+import atexit
+import bisect
+import shelve
+import struct
+import threading
+
+# file starts with header: magic bytes and version of the format:
+HEADER = struct.Struct("<4sB")
+MAGIC, VERSION = b"RISC", 1
+# each record is: score and length of the player's name, followed by the name
+# encoded in UTF-8:
+RECORD = struct.Struct("<qH")
+# file is rewritten with only the best scores, when it has more records:
+COMPACT_AFTER = 100
+
+
+class ScoresView:
+    """
+    Sequence of the scores values of the best scores table, which allows
+    bisecting the table of dicts without copying the scores.
+    """
+
+    def __init__(self, table: list):
+        """
+        :param table: list of dicts -- scores in format: {name: str,
+        score: int}, sorted by score
+        """
+        self.table = table
+
+    def __len__(self):
+        return len(self.table)
+
+    def __getitem__(self, index: int):
+        return self.table[index]["score"]
+
+
+class ScoreStore:
+    """
+    Keeps the best scores table in memory, sorted from the lowest score, and
+    saves it in an append-only file. Reading and writing the file is done by
+    a background thread, so the game never waits for the disk. Records added
+    at once are written in a single batch with one fsync, and the file is
+    compacted into the new one, atomically renamed over the old one.
+    Table is changed by both threads, so it is changed only under the lock.
+
+    When the scores of the older versions can not be imported, the scores
+    file is not created, so import is tried again in the next session, and
+    the scores of this session are kept only in memory.
+    """
+
+    def __init__(self, path: str = None, capacity: int = 10,
+                 legacy_path: str = None):
+        """
+        :param path: str -- path of the scores file, or None to keep scores
+        only in memory
+        :param capacity: int -- how many best scores are kept
+        :param legacy_path: str -- path of the shelve file with scores saved
+        by the older versions of the game, imported if there is no scores
+        file yet
+        """
+        self.path = path
+        self.capacity = capacity
+        self.legacy_path = legacy_path
+        self.table = []
+        self.lock = threading.Lock()
+        self.loaded = threading.Event()
+        self.records = 0  # number of records in the file
+        self.saving = path is not None
+        self.jobs = queue.Queue()
+        # records added, but not appended to the file yet:
+        self.pending = queue.Queue()
+        self.worker = None
+
+    def __len__(self):
+        return len(self.table)
+
+    def submit(self, job, *args):
+        """Run the job in the background thread, started with first job."""
+        if self.worker is None:
+            self.worker = threading.Thread(target=self.run,
+                                           name="scores store", daemon=True)
+            self.worker.start()
+            atexit.register(self.flush)
+        self.jobs.put((job, args))
+
+    def run(self):
+        """Loop of the background thread, running the jobs in order."""
+        while True:
+            job, args = self.jobs.get()
+            try:
+                job(*args)
+            except OSError as error:
+                print(f"Unable to save best scores: {error}")
+            finally:
+                self.jobs.task_done()
+
+    def flush(self):
+        """Block until all the submitted jobs are finished."""
+        if self.worker is not None:
+            self.jobs.join()
+
+    def load(self, background: bool = True):
+        """
+        Read the best scores table from the file. Should be called once.
+
+        :param background: bool -- if file should be read by the background
+        thread, otherwise it is read before return
+        """
+        if self.path is None:
+            self.loaded.set()
+        elif background:
+            self.submit(self.read)
+        else:
+            self.read()
+
+    def wait(self):
+        """
+        Block until the scores are loaded.
+
+        :return: list of dicts -- best scores table
+        """
+        self.loaded.wait()
+        return self.table
+
+    def read(self):
+        """
+        Read all the records from the file, and keep the best ones. Last
+        record, incomplete if game crashed while writing it, is ignored.
+        Scores added before the file was read are kept too, since they are
+        appended to the file only after reading it.
+        """
+        try:
+            if not os.path.isfile(self.path):
+                self.import_legacy()
+            else:
+                with open(self.path, "rb") as file:
+                    data = file.read()
+                records = self.parse(data)
+                with self.lock:
+                    self.table[:] = self.best(records + self.table)
+        except OSError as error:
+            print(f"Unable to load best scores: {error}")
+        finally:
+            self.loaded.set()
+
+    def parse(self, data: bytes):
+        """
+        :param data: bytes -- contents of the scores file
+        :return: list of dicts -- all the records in format: {name: str,
+        score: int}
+        """
+        if data[:HEADER.size] != HEADER.pack(MAGIC, VERSION):
+            raise OSError(f"{self.path} is not a scores file of version "
+                          f"{VERSION}")
+        records, position = [], HEADER.size
+        while position + RECORD.size <= len(data):
+            score, length = RECORD.unpack_from(data, position)
+            position += RECORD.size
+            if position + length > len(data):
+                break
+            name = data[position:position + length].decode("utf-8")
+            records.append({"name": name, "score": score})
+            position += length
+        self.records = len(records)
+        return records
+
+    def best(self, records: list):
+        """
+        :param records: list of dicts -- scores in format: {name: str,
+        score: int} in order they were saved
+        :return: list of dicts -- best scores, sorted from the lowest one
+        """
+        return sorted(records, key=lambda record: record["score"])[
+               -self.capacity:]
+
+    def import_legacy(self):
+        """
+        Import scores from the shelve file of the older versions of the game
+        and save them in the new file. If import fails, no file is saved.
+        """
+        if self.legacy_path is not None and os.path.isfile(self.legacy_path):
+            try:
+                with shelve.open(self.legacy_path, "r") as legacy:
+                    records = list(legacy.get("scores", []))
+            except Exception as error:
+                self.saving = False
+                print(f"Unable to import best scores: {error}, scores will"
+                      f" not be saved")
+                return
+            with self.lock:
+                self.table[:] = self.best(records + self.table)
+        self.compact()
+
+    @staticmethod
+    def encode(name: str, score: int):
+        name = name.encode("utf-8")[:0xFFFF]
+        return RECORD.pack(score, len(name)) + name
+
+    def save_pending(self):
+        """
+        Append all the records added since the last save at once, so they
+        are synced to the disk once. Next jobs find no records left.
+        """
+        records = []
+        while True:
+            try:
+                records.append(self.pending.get_nowait())
+            except queue.Empty:
+                break
+        if records and self.saving:
+            self.append(records)
+
+    def append(self, records: list):
+        """
+        Append records at the end of the file and sync it once. If file grew
+        too much, it is compacted instead.
+
+        :param records: list of tuples -- (name, score)
+        """
+        if not os.path.isfile(self.path) or \
+                self.records + len(records) > COMPACT_AFTER:
+            self.compact()
+            return
+        with open(self.path, "ab") as file:
+            file.write(b"".join(self.encode(*record) for record in records))
+            file.flush()
+            os.fsync(file.fileno())
+        self.records += len(records)
+
+    def compact(self):
+        """
+        Write only the current best scores to the temporary file, and rename
+        it atomically over the scores file, so the file is never left half
+        written.
+        """
+        with self.lock:
+            table = list(self.table)
+        temporary = self.path + ".tmp"
+        with open(temporary, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION) + b"".join(
+                self.encode(record["name"], record["score"]) for record in
+                table))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.path)
+        self.records = len(table)
+
+    def add(self, name: str, score: int):
+        """
+        Put new score into the table, if it is good enough, and save it in
+        the background.
+
+        :param name: str -- name of the player
+        :param score: int -- score of the player
+        :return: int or None -- index of the new score in the table, or None
+        if it was not good enough
+        """
+        with self.lock:
+            index = bisect.bisect_right(ScoresView(self.table), score)
+            if len(self.table) >= self.capacity:
+                if index == 0:
+                    return None
+                del self.table[0]
+                index -= 1
+            self.table.insert(index, {"name": name, "score": score})
+        if self.path is not None:
+            self.pending.put((name, score))
+            self.submit(self.save_pending)
+        return index
@@ -81,6 +81,12 @@ SubMenu as argument.
 
 IMPORTANT: app_hook attribute of Menu and Cursor must be the same arcade.Window
  object!
+
+TextCache:
+All the texts of menu elements are drawn with the shared text_cache object,
+which keeps rasterized texts, so they are not rendered again each frame. Use
+text_cache.draw_text() instead of arcade.draw_text() in your game to share it,
+for the texts which do not change, and text_cache.draw_glyphs() for counters.
 """
 __author__ = "Rafał Trąbski"
 __copyright__ = "Copyright 2019"
@@ -93,9 +99,19 @@ __status__ = "Development"
 
 import abc
 import arcade
+import PIL.Image
+import PIL.ImageDraw
+import PIL.ImageFont
+
+from collections import OrderedDict
 
 WHITE, GRAY, BLACK, GREEN = (arcade.color.WHITE, arcade.color.GRAY,
                              arcade.color.BLACK, arcade.color.GREEN)
+DEFAULT_FONTS = ("calibri", "arial")
+# fonts tried when none of the requested ones is found (as in arcade):
+FALLBACK_FONTS = ("arial.ttf",
+                  "/usr/share/fonts/truetype/freefont/FreeMono.ttf",
+                  "/System/Library/Fonts/SFNSDisplay.ttf")
 
 
 def normalize(value: float, minimum: float, maximum: float):
@@ -203,6 +219,190 @@ class SharedVariable:
             associate.__dict__[self.associated[associate]] = self.value
 
 
+class TextCache:
+    """
+    Least-recently-used cache of texts rasterized by PIL, for the texts
+    which do not change: menu elements, labels and hints. Each entry is an
+    arcade.SpriteList with a single text Sprite, so drawing a text which was
+    already displayed only moves it's Sprite, without rendering it again.
+    When cache is full, the text not drawn for the longest time is dropped,
+    and it's GL texture released.
+
+    Texts changing often, like counters, are drawn with draw_glyphs(), so
+    only their characters are cached, not each value of the text. Texts are
+    rasterized here, not by arcade.draw_text(), because arcade 2.0 draws
+    each text it rasterizes, and hints need just the textures.
+    """
+
+    # PIL text is not anti-aliased, so it is rendered bigger and shrunk:
+    SUPERSAMPLING = 5
+
+    def __init__(self, capacity: int = 256):
+        """
+        :param capacity: int -- maximum number of texts kept in the cache
+        """
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.fonts = {}
+        self.hits, self.misses = 0, 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, text: str, color: arcade.Color, font_size: float,
+            align: str = "left", font_name: tuple = DEFAULT_FONTS):
+        """
+        Find text in the cache, or rasterize it if it is not there.
+
+        :return: arcade.SpriteList -- list with one Sprite of the text
+        """
+        key = (text, font_size, tuple(color), align, font_name)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            texture = arcade.Texture(f"text{key}", self.rasterize(
+                text, color, font_size, align, font_name))
+            sprite = arcade.Sprite()
+            sprite.texture = texture
+            sprite.textures = [texture]
+            entry = self.entries[key] = arcade.SpriteList()
+            entry.append(sprite)
+            if len(self.entries) > self.capacity:
+                self.release(self.entries.popitem(last=False)[1])
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return entry
+
+    @staticmethod
+    def release(entry: arcade.SpriteList):
+        """
+        Delete GL texture and buffers of the evicted text. arcade deletes them
+        when their objects are collected, but the text Sprite and it's
+        SpriteList reference each other, so without dropping them here they
+        would wait for the garbage collector.
+        """
+        entry.remove(entry[0])
+        entry._texture = entry.vao = None
+        entry.vbo_buf = entry.sprite_data_buf = None
+
+    def draw_text(self, text: str, start_x: float, start_y: float,
+                  color: arcade.Color, font_size: float = 12,
+                  align: str = "left", anchor_x: str = "left",
+                  anchor_y: str = "baseline",
+                  font_name: tuple = DEFAULT_FONTS):
+        """
+        Replacement of the arcade.draw_text() using the cache.
+
+        :param text: str -- text to draw, could be multi-line
+        :param start_x: float -- x coordinate of the anchor point
+        :param start_y: float -- y coordinate of the anchor point
+        :param color: arcade.Color -- color of the text
+        :param font_size: float -- size of the font
+        :param align: str -- 'left', 'center' or 'right' alignment of lines
+        :param anchor_x: str -- 'left', 'center' or 'right'
+        :param anchor_y: str -- 'baseline', 'bottom', 'center' or 'top'
+        :param font_name: str or tuple -- names of the fonts in order of
+        preference
+        :return: float -- x coordinate of the right edge of the text
+        """
+        sprite_list = self.get(text, color, font_size, align, font_name)
+        sprite = sprite_list[0]
+        half_width, half_height = sprite.width / 2, sprite.height / 2
+        if anchor_x == "left":
+            sprite.center_x = start_x + half_width
+        elif anchor_x == "right":
+            sprite.center_x = start_x - half_width
+        else:
+            sprite.center_x = start_x
+        if anchor_y == "top":
+            sprite.center_y = start_y - half_height
+        elif anchor_y == "center":
+            sprite.center_y = start_y
+        else:
+            sprite.center_y = start_y + half_height
+        sprite_list.draw()
+        return sprite.center_x + half_width
+
+    def draw_glyphs(self, text: str, start_x: float, start_y: float,
+                    color: arcade.Color, font_size: float = 12,
+                    anchor_x: str = "left", font_name: tuple = DEFAULT_FONTS):
+        """
+        Draw single-line text changing often, like a counter, character by
+        character, so the cache keeps only it's glyphs. Parameters are the
+        same as for draw_text(), but text is anchored at the baseline.
+
+        :return: float -- x coordinate of the right edge of the text
+        """
+        glyphs = [self.get(character, color, font_size, font_name=font_name)
+                  for character in text]
+        if anchor_x != "left":
+            width = sum(glyph[0].width for glyph in glyphs)
+            start_x -= width if anchor_x == "right" else width / 2
+        for glyph in glyphs:
+            sprite = glyph[0]
+            sprite.center_x = start_x + sprite.width / 2
+            sprite.center_y = start_y + sprite.height / 2
+            glyph.draw()
+            start_x += sprite.width
+        return start_x
+
+    def load_font(self, font_name: tuple, size: int):
+        """
+        Find the first available font from the requested ones, or one of
+        the FALLBACK_FONTS, or default PIL font.
+
+        :return: PIL.ImageFont
+        """
+        if (font_name, size) not in self.fonts:
+            names = (font_name,) if isinstance(font_name, str) else font_name
+            font = None
+            for name in names + tuple(n + ".ttf" for n in names) + \
+                    FALLBACK_FONTS:
+                try:
+                    font = PIL.ImageFont.truetype(name, size)
+                    break
+                except OSError:
+                    pass
+            self.fonts[(font_name, size)] = font or \
+                PIL.ImageFont.load_default()
+        return self.fonts[(font_name, size)]
+
+    def rasterize(self, text: str, color: arcade.Color, font_size: float,
+                  align: str, font_name: tuple):
+        """
+        Render text to the image, the same way arcade.draw_text() does.
+        Single line is as wide as the advance of it's characters, including
+        the trailing spaces, and as high as the font, so lines and glyphs
+        drawn next to each other share the baseline.
+
+        :return: PIL.Image
+        """
+        scale = TextCache.SUPERSAMPLING
+        # font is scaled to match sizes of the texts drawn by arcade:
+        font = self.load_font(font_name, int(font_size * 1.25 * scale))
+        draw = PIL.ImageDraw.Draw(PIL.Image.new("RGBA", (1, 1)))
+        if hasattr(draw, "multiline_textbbox"):
+            width, height = draw.multiline_textbbox((0, 0), text,
+                                                    font=font)[2:]
+            if "\n" not in text:
+                width = max(width, int(font.getlength(text)))
+        else:
+            width, height = draw.multiline_textsize(text, font=font)
+        if "\n" not in text and hasattr(font, "getmetrics"):
+            height = sum(font.getmetrics())
+        width, height = max(width, scale), max(height, scale)
+        image = PIL.Image.new("RGBA", (width, height))
+        PIL.ImageDraw.Draw(image).multiline_text((0, 0), text, tuple(color),
+                                                 font=font, align=align)
+        return image.resize((width // scale, height // scale),
+                            resample=PIL.Image.LANCZOS)
+
+
+# texts cache shared by all the menu elements and the game using this module:
+text_cache = TextCache()
+
+
 class Cursor(arcade.Sprite):
     """
     TODO: write raw Cursor abstract class [x], test it [x][ ]
@@ -639,9 +839,9 @@ class Button(MenuElement):
                                           self.texture,
                                           alpha=self.image_alpha)
         # Button's text:
-        arcade.draw_text(self.name, self.left + self.font_size,
-                         self.bottom + (self.height / 3), self.text_color,
-                         self.font_size, align="center", anchor_x="left")
+        text_cache.draw_text(self.name, self.left + self.font_size,
+                             self.bottom + (self.height / 3), self.text_color,
+                             self.font_size, align="center", anchor_x="left")
 
 
 class Slider(MenuElement):
@@ -765,8 +965,8 @@ class Slider(MenuElement):
         Display this Slider on the screen.
         """
         # Slider name:
-        arcade.draw_text(self.variable_name.title(), self.left,
-                         self.top + self.height / 2, WHITE, self.font_size)
+        text_cache.draw_text(self.variable_name.title(), self.left,
+                             self.top + self.height / 2, WHITE, self.font_size)
         # Slider rail:
         arcade.draw_rectangle_filled(self.center_x, self.center_y, self.width,
                                      self.height, self.slide_color)
@@ -779,9 +979,9 @@ class Slider(MenuElement):
         arcade.draw_circle_outline(self.slider_position, self.center_y,
                                    (self.height / 1.5) + 2, self.border_color)
         # Variable value:
-        arcade.draw_text(str(self._var_cur_val), self.right,
-                         self.top + self.height / 2, GREEN, self.font_size,
-                         anchor_x="right")
+        text_cache.draw_glyphs(str(self._var_cur_val), self.right,
+                               self.top + self.height / 2, GREEN,
+                               self.font_size, anchor_x="right")
 
     def set_variable(self):
         """
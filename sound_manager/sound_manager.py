@@ -0,0 +1,149 @@
+import threading
+from collections import deque
+
+import pyglet
+
+from pyglet.media.exceptions import MediaException
+
+# how many copies of the same sound could be heard at once:
+MAX_VOICES = 4
+
+
+class SoundManager:
+    """
+    Decodes sounds before they are needed and limits how many of them are
+    played at once. Sounds listed in the manifest are decoded into memory in
+    a background thread, so the first shot or explosion does not stall the
+    game. When a sound is played more times at once than the voices limit,
+    it's oldest copy is stopped. Disabled manager does no audio work at all.
+    Decoded sounds are shared by the loading thread and the game, so they
+    are accessed only under the lock.
+    """
+
+    def __init__(self, path: str, voices: int = MAX_VOICES,
+                 enabled: bool = True):
+        """
+        :param path: str -- directory containing the sound files
+        :param voices: int -- maximum number of copies of a single sound
+        played at once
+        :param enabled: bool -- False mutes all the sounds
+        """
+        self.path = path
+        self.voices_limit = voices
+        self.enabled = enabled
+        # decoded sounds, None if file could not be loaded:
+        self.sources = {}
+        self.lock = threading.Lock()
+        # players of each sound, the oldest first:
+        self.voices = {}
+        self.manifest = []
+        self.thread = None
+        self.played, self.stolen = 0, 0
+
+    def preload(self, manifest, background: bool = True):
+        """
+        Decode all the sounds from the manifest.
+
+        :param manifest: iterable of str -- names of the sound files
+        :param background: bool -- if sounds should be decoded in a separate
+        thread, while the game starts
+        """
+        # muted manager would decode the manifest when it is unmuted:
+        self.manifest = list(manifest)
+        if not self.enabled:
+            return
+        with self.lock:
+            names = [name for name in self.manifest if
+                     name not in self.sources]
+        if background:
+            self.thread = threading.Thread(target=self.load_all, args=(names,),
+                                           name="sounds preloading",
+                                           daemon=True)
+            self.thread.start()
+        else:
+            self.load_all(names)
+
+    def load_all(self, names: list):
+        for name in names:
+            with self.lock:
+                loaded = name in self.sources
+            if not loaded:
+                self.load(name)
+
+    def load(self, name: str):
+        """
+        Decode whole sound file into memory. If the sound was decoded by
+        other thread meanwhile, the first decoded source is kept.
+
+        :param name: str -- name of the sound file
+        :return: pyglet.media.StaticSource or None if file could not be
+        loaded
+        """
+        try:
+            source = pyglet.media.load(self.path + name, streaming=False)
+        except (OSError, MediaException) as error:
+            print(f"Unable to load sound {name}: {error}")
+            source = None
+        with self.lock:
+            return self.sources.setdefault(name, source)
+
+    def wait(self):
+        """Block until all the preloaded sounds are decoded."""
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def play(self, name: str):
+        """
+        Play the sound. Sound not decoded yet is loaded immediately. If too
+        many copies of the sound are already playing, the oldest one is
+        stopped.
+
+        :param name: str -- name of the sound file
+        :return: pyglet.media.Player or None, if sound was not played
+        """
+        if not self.enabled:
+            return None
+        with self.lock:
+            loaded = name in self.sources
+            source = self.sources.get(name)
+        if not loaded:
+            source = self.load(name)
+        if source is None:
+            return None
+        voices = self.voices.get(name)
+        if voices is None:
+            voices = self.voices[name] = deque()
+        # copies of the same sound finish in the same order they started:
+        while voices and not voices[0].playing:
+            voices.popleft()
+        if len(voices) >= self.voices_limit:
+            oldest = voices.popleft()
+            oldest.pause()
+            oldest.delete()
+            self.stolen += 1
+        player = source.play()
+        voices.append(player)
+        self.played += 1
+        return player
+
+    def stop_all(self):
+        """Stop all the sounds being played."""
+        for voices in self.voices.values():
+            for player in voices:
+                player.pause()
+                player.delete()
+            voices.clear()
+
+    def toggle(self):
+        """
+        Mute or unmute all the sounds.
+
+        :return: bool -- True if sounds are enabled now
+        """
+        self.enabled = not self.enabled
+        if self.enabled:
+            self.preload(self.manifest)
+        else:
+            self.stop_all()
+        return self.enabled
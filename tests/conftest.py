@@ -0,0 +1,5 @@
+import os
+
+# tests are run without display, so the game is always imported in headless
+# mode (no window, GL context, pyautogui nor sounds):
+os.environ.setdefault("RED_INVADERS_HEADLESS", "1")
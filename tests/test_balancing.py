@@ -0,0 +1,97 @@
+import os
+import csv
+import shutil
+import tempfile
+import unittest
+
+from balancing import balancing
+
+
+class TestBalancing(unittest.TestCase):
+    """
+    Test balancing batch runner of the headless sessions.
+    """
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+
+    def test_player_must_decide(self):
+        """
+        Check if player without decide() can not be created.
+        """
+        with self.assertRaises(TypeError):
+            balancing.Player(1)
+
+    def test_sessions_are_repeatable(self):
+        """
+        Check if the same seeds give the same results, when sessions are
+        played in this process and in the pool of processes.
+        """
+        single = balancing.run_batch(3, processes=1, player="scripted",
+                                     frames=200)
+        pool = balancing.run_batch(3, processes=2, player="scripted",
+                                   frames=200)
+        self.assertEqual(single, pool)
+        self.assertEqual([result["seed"] for result in pool], [0, 1, 2])
+
+    def test_session_results(self):
+        """
+        Check if session stops after the time limit and reports it's
+        statistics.
+        """
+        result = balancing.run_session((1, "random", 30,
+                                        balancing.game.CONFIG_PATH,
+                                        balancing.game.CONFIG_FILE, False))
+        self.assertEqual(result["frames"], 30, "Should be: 30.")
+        self.assertTrue(result["survived"])
+        self.assertEqual(result["survival"], 30 / balancing.game.FPS)
+        self.assertGreater(result["shots_fired"], 0, "Should be: > 0.")
+
+    def test_scripted_player_survives_longer_than_random(self):
+        """
+        Check if dodging scripted player survives longer than the random
+        one, so the report of the scripted sessions tells configs apart.
+        """
+        frames = 20 * balancing.game.FPS
+        survival = {player: balancing.aggregate(balancing.run_batch(
+            4, processes=2, player=player, frames=frames))["survival"][0]
+            for player in ("random", "scripted")}
+        self.assertGreater(survival["scripted"], 2 * survival["random"])
+
+    def test_aggregated_report(self):
+        """
+        Check if results of the sessions are summed up into the report.
+        """
+        results = [{"survival": i, "score": i * 10, "accuracy": 0.5,
+                    "destroyed": i, "survived": i == 9,
+                    "difficulty": i // 5} for i in range(10)]
+        report = balancing.aggregate(results)
+        self.assertEqual(report["sessions"], 10, "Should be: 10.")
+        self.assertEqual(report["survived"], 0.1, "Should be: 0.1.")
+        self.assertEqual(report["score"], (45.0, 10, 40, 80))
+        self.assertEqual(report["difficulty"], {0: 5, 1: 5})
+        self.assertIn("difficulty reached: 0: 5, 1: 5",
+                      balancing.format_report(report))
+
+    def test_command_line_writes_csv(self):
+        """
+        Check if CLI command writes a row for each session.
+        """
+        path = tempfile.mkdtemp()
+        try:
+            status = balancing.main(["--sessions", "2", "--processes", "1",
+                                     "--time", "1", "--csv",
+                                     os.path.join(path, "results.csv")])
+            with open(os.path.join(path, "results.csv"), newline="") as file:
+                rows = list(csv.DictReader(file))
+        finally:
+            shutil.rmtree(path)
+        self.assertEqual(status, 0, "Should be: 0.")
+        self.assertEqual([row["seed"] for row in rows], ["0", "1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from config_loader import config_loader
+from config_loader.config_loader import load_config_from_file, \
+    parse_config, ConfigError, CACHE_EXTENSION
+
+CONFIG = """# test config
+settings:
+
+difficulty = 0
+sound_on = True
+
+enemies_config:
+
+hostiles = [hostile_ship_1, hostile_ship_2]
+speed = {hostile_ship_1: 0.8, hostile_ship_2: 0.7}
+EOF
+"""
+
+
+class TestParseConfig(unittest.TestCase):
+    """
+    Test config_loader.parse_config() of the config format.
+    """
+
+    def test_nested_values_and_scalars(self):
+        """
+        Check if nested lists and dicts, and each scalar type are parsed.
+        """
+        lines = ["enemies_config:",
+                 "turrets = {ship: [[turret, laser, 0, -12], [gun, 1.5]]}",
+                 "speed = -0.5",
+                 "sound_on = False"]
+        self.assertEqual(parse_config(lines), [
+            {"turrets": {"ship": [["turret", "laser", 0, -12],
+                                  ["gun", 1.5]]},
+             "speed": -0.5, "sound_on": False}])
+
+    def test_comments_empty_lines_and_eof(self):
+        """
+        Check if comments, empty lines and lines after EOF are ignored.
+        """
+        lines = CONFIG.splitlines() + ["ignored:", "a = 1"]
+        self.assertEqual(parse_config(lines), [
+            {"difficulty": 0, "sound_on": True},
+            {"hostiles": ["hostile_ship_1", "hostile_ship_2"],
+             "speed": {"hostile_ship_1": 0.8, "hostile_ship_2": 0.7}}])
+
+    def test_error_shows_line_and_column(self):
+        """
+        Check if unclosed list is reported with it's position in the file.
+        """
+        lines = ["settings:", "", "hostiles = [a, b"]
+        with self.assertRaises(ConfigError) as error:
+            parse_config(lines, "game_config.txt")
+        self.assertEqual((error.exception.line, error.exception.column),
+                         (3, 17), "Should be: 3, 17.")
+        self.assertTrue(str(error.exception).startswith(
+            "game_config.txt:3:17:"))
+
+
+class TestCompiledConfig(unittest.TestCase):
+    """
+    Test compiled cache of config files.
+    """
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.path = tempfile.mkdtemp()
+        self.file = os.path.join(self.path, "config.txt")
+        with open(self.file, "w") as f:
+            f.write(CONFIG)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.path)
+
+    def test_cached_config_is_not_parsed(self):
+        """
+        Check if config loaded second time comes from the cache.
+        """
+        parsed = load_config_from_file(self.path, "config.txt")
+        self.assertTrue(os.path.isfile(self.file + CACHE_EXTENSION))
+        with mock.patch.object(config_loader, "parse_config") as parser:
+            cached = load_config_from_file(self.path, "config.txt")
+        parser.assert_not_called()
+        self.assertEqual(cached, parsed)
+
+    def test_modified_config_is_parsed_again(self):
+        """
+        Check if cache is ignored after config file was changed.
+        """
+        load_config_from_file(self.path, "config.txt")
+        with open(self.file, "w") as f:
+            f.write(CONFIG.replace("difficulty = 0", "difficulty = 3"))
+        settings = load_config_from_file(self.path, "config.txt")[0]
+        self.assertEqual(settings["difficulty"], 3, "Should be: 3.")
+
+    def test_touched_config_uses_cache(self):
+        """
+        Check if cache is still used, when only modification time of the
+        config file changed.
+        """
+        load_config_from_file(self.path, "config.txt")
+        stat = os.stat(self.file)
+        os.utime(self.file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        with mock.patch.object(config_loader, "parse_config") as parser:
+            load_config_from_file(self.path, "config.txt")
+        parser.assert_not_called()
+
+    def test_command_line_compiles_config(self):
+        """
+        Check if CLI command creates the cache file.
+        """
+        self.assertEqual(config_loader.main([self.file]), 0, "Should be: 0.")
+        self.assertTrue(os.path.isfile(self.file + CACHE_EXTENSION))
+
+
+if __name__ == "__main__":
+    unittest.main()
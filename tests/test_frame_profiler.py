@@ -0,0 +1,69 @@
+import os
+import csv
+import tempfile
+import unittest
+
+from frame_profiler.frame_profiler import FrameProfiler
+
+
+class TestFrameProfiler(unittest.TestCase):
+    """
+    Test FrameProfiler measuring phases of the frames.
+    """
+
+    def test_disabled_profiler_measures_nothing(self):
+        """
+        Check if profiler does not record frames until it is enabled.
+        """
+        profiler = FrameProfiler(("stars",))
+        profiler.start()
+        profiler.lap("stars")
+        profiler.end_frame()
+        self.assertEqual(profiler.report(), [], "Should be: [].")
+
+    def test_percentiles_of_phase(self):
+        """
+        Check if percentiles are calculated from the rolling window.
+        """
+        profiler = FrameProfiler(("stars",), window=100)
+        profiler.samples["stars"].extend(i / 1000 for i in range(1, 101))
+        self.assertEqual(profiler.percentiles("stars"), (51.0, 95.0, 99.0))
+
+    def test_csv_row_for_each_frame(self):
+        """
+        Check if each ended frame is written as a row of the CSV file, with
+        empty cells for phases not measured in this frame.
+        """
+        path = os.path.join(tempfile.mkdtemp(), "frames.csv")
+        profiler = FrameProfiler(("stars", "hud"))
+        profiler.open_csv(path)
+        for _ in range(3):
+            profiler.start()
+            profiler.lap("stars")
+            profiler.end_frame()
+        profiler.close_csv()
+        with open(path, newline="") as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(rows[0], ["frame", "stars", "hud", "total"])
+        self.assertEqual(len(rows), 4, "Should be: 4.")
+        self.assertEqual(rows[3][0], "3", "Should be: 3.")
+        self.assertEqual(rows[3][2], "", "Should be: empty.")
+
+    def test_counters_of_frames(self):
+        """
+        Check if events counted in each frame are reported as percentiles,
+        and frames without events are counted as zeros.
+        """
+        profiler = FrameProfiler(("draw",), counters=("draw_calls",))
+        profiler.enabled = True
+        for calls in (4, 6, 0):
+            for _ in range(calls):
+                profiler.count("draw_calls")
+            profiler.end_frame()
+        self.assertEqual(list(profiler.counts["draw_calls"]), [4, 6, 0])
+        self.assertEqual(profiler.counters_report(),
+                         [("draw_calls", 4, 6, 6)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 import os
+import tempfile
 import unittest
 import game
 
@@ -8,6 +9,18 @@ TESTS_PATH = os.path.dirname(os.path.abspath(__file__))
 dummy = None
 
 
+class HeadlessGameTestCase(unittest.TestCase):
+    """
+    Base of the tests needing a game session: each test gets new headless
+    Game, with seeded random generator, and no frames run yet.
+    """
+
+    batched_ai = False  # update hostiles with game.HostilesAI
+
+    def setUp(self):
+        self.game = game.run_headless(0, seed=1, batched_ai=self.batched_ai)
+
+
 class TestGame(unittest.TestCase):
     """
     Test game.Game methods.
@@ -85,9 +98,721 @@ class TestGame(unittest.TestCase):
         Check if provided with no file in config directory it creates new
         file and returns an empty list.
         """
-        os.chdir(TESTS_PATH + "/test_files")
-        self.assertIsInstance(game.Game.load_best_scores(), list,
-                              "Should return list.")
+        with tempfile.TemporaryDirectory() as path:
+            self.assertEqual(game.Game.load_best_scores(path + "/"), [],
+                             "Should be: [].")
+            self.assertTrue(os.path.isfile(path + "/" + game.SCORES_FILE))
+
+
+class TestSpatialHash(unittest.TestCase):
+    """
+    Test game.SpatialHash broad-phase of collision checks.
+    """
+
+    @staticmethod
+    def create_sprite(x: float, y: float):
+        sprite = game.arcade.Sprite(game.get_image_path("hostiles/"
+                                                        "hostile_ship_1"))
+        sprite.center_x, sprite.center_y = x, y
+        return sprite
+
+    def test_check_for_collision_finds_only_colliding_sprites(self):
+        """
+        Check if only Sprites overlapping the queried one are returned.
+        """
+        near, far = self.create_sprite(100, 100), self.create_sprite(900, 900)
+        grid = game.SpatialHash(cell_size=64)
+        grid.rebuild([near, far])
+        self.assertEqual(grid.check_for_collision(self.create_sprite(110, 95)),
+                         [near], "Should be: [near].")
+
+    def test_query_sprite_overlapping_many_cells(self):
+        """
+        Check if Sprite lying on the cells border is found from both sides.
+        """
+        sprite = self.create_sprite(64, 64)
+        grid = game.SpatialHash(cell_size=64)
+        grid.insert(sprite)
+        self.assertIn(sprite, grid.query(self.create_sprite(40, 40)))
+        self.assertIn(sprite, grid.query(self.create_sprite(90, 90)))
+
+    def test_removed_sprite_is_not_found(self):
+        """
+        Check if killed Sprite removed from grid is not a collision candidate.
+        """
+        sprite = self.create_sprite(100, 100)
+        grid = game.SpatialHash(cell_size=64)
+        grid.insert(sprite)
+        grid.remove(sprite)
+        self.assertEqual(grid.query(sprite), [], "Should be: [].")
+        self.assertEqual(len(grid), 0, "Should be: 0.")
+
+
+class TestThreatIndex(unittest.TestCase):
+    """
+    Test game.ThreatIndex of player's shots hostiles avoid.
+    """
+
+    @staticmethod
+    def create_shot(x: float, y: float, angle: float = game.UPWARD):
+        shot = game.arcade.Sprite()
+        shot.center_x, shot.center_y, shot.angle = x, y, angle
+        return shot
+
+    def test_only_shots_below_and_near_are_threats(self):
+        """
+        Check if shots above, too far away or flying down are ignored.
+        """
+        near = self.create_shot(130, 50)
+        shots = [self.create_shot(100, 300), self.create_shot(300, 50),
+                 self.create_shot(100, 50, game.DOWNWARD), near]
+        index = game.ThreatIndex(distance=75)
+        index.rebuild(shots)
+        self.assertEqual(len(index), 3, "Should be: 3.")
+        self.assertIs(index.nearest(100, 200), near, "Should be: near.")
+        self.assertIsNone(index.nearest(100, 40), "Should be: None.")
+
+    def test_nearest_threat_from_neighbour_columns(self):
+        """
+        Check if the highest shot below the ship is found in columns on both
+        sides of it, skipping the shots too far away horizontally.
+        """
+        left, right = self.create_shot(80, 10), self.create_shot(220, 20)
+        far = self.create_shot(290, 30)
+        index = game.ThreatIndex(distance=75)
+        index.rebuild([left, right, far])
+        self.assertIs(index.nearest(150, 100), right, "Should be: right.")
+
+
+class TestStarfield(unittest.TestCase):
+    """
+    Test game.Starfield vectorised background stars.
+    """
+
+    def test_scroll_moves_stars_down(self):
+        """
+        Check if each star moves down accordingly to it's speed.
+        """
+        stars = game.Starfield(100, 100, 1)
+        stars.y[:] = 50
+        stars.scroll()
+        expected = 50 - game.BACKGROUND_SPEED * stars.speed
+        self.assertTrue(game.numpy.allclose(stars.y, expected))
+
+    def test_scroll_respawns_stars_at_the_top(self):
+        """
+        Check if stars which left the screen are moved to it's top.
+        """
+        stars = game.Starfield(100, 80, 1)
+        stars.y[:] = -1
+        stars.scroll()
+        self.assertTrue((stars.y == 81).all(), "Should be: 81.")
+        self.assertTrue(((stars.x >= 0) & (stars.x <= 100)).all())
+
+    def test_update_vertices_writes_triangle_for_each_star(self):
+        """
+        Check if vertex buffer contains 3 vertices around each star.
+        """
+        stars = game.Starfield(10, 10, 1)
+        vertices = stars.update_vertices()["vertex"].reshape(-1, 3, 2)
+        self.assertEqual(len(vertices), len(stars))
+        self.assertTrue(game.numpy.allclose(vertices.mean(axis=1)[:, 0],
+                                            stars.x + stars.offsets[:, :, 0]
+                                            .mean(axis=1)))
+
+
+class TestProjectilesPool(HeadlessGameTestCase):
+    """
+    Test game.ProjectilesPool recycling of the Projectile objects.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.pool = self.game.projectiles_pool
+
+    def test_killed_projectile_is_reused(self):
+        """
+        Check if killed Projectile is returned to the pool and reused with
+        new type, angle, position and speed vector.
+        """
+        laser = self.pool.acquire("player_laser_blue", 1, game.UPWARD,
+                                  ["", 100, 200])
+        laser.kill()
+        shot = self.pool.acquire("hostile_laser_red", 1, game.DOWNWARD,
+                                 ["", 300, 400])
+        self.assertIs(shot, laser)
+        self.assertEqual(shot.type_, "hostile_laser_red")
+        self.assertEqual((shot.center_x, shot.center_y), (400, 300))
+        self.assertEqual(shot.damage, game.weapons[game.DAMAGES][shot.type_])
+        self.assertAlmostEqual(shot.change_y,
+                               -game.weapons[game.SPEED][shot.type_])
+        self.assertEqual(self.pool.statistics()["reused"], 1)
+
+    def test_projectile_killed_twice_is_released_once(self):
+        """
+        Check if Projectile killed twice in the same frame is pooled once.
+        """
+        laser = self.pool.acquire("player_laser_blue", 1, game.UPWARD,
+                                  ["", 100, 200])
+        laser.kill()
+        laser.kill()
+        self.assertEqual(len(self.pool), 1, "Should be: 1.")
+        self.assertEqual(self.pool.in_use, 0, "Should be: 0.")
+
+
+class TestExplosionsPool(HeadlessGameTestCase):
+    """
+    Test game.ExplosionsPool recycling and limiting Explosions.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.pool = self.game.explosions_pool
+
+    def test_finished_explosion_is_restarted(self):
+        """
+        Check if finished Explosion is reused from the first frame.
+        """
+        explosion = self.pool.acquire(100, 100)
+        for _ in range(len(explosion.textures)):
+            explosion.update()
+        reused = self.pool.acquire(200, 300)
+        self.assertIs(reused, explosion)
+        self.assertEqual(reused.current_texture, 0, "Should be: 0.")
+        self.assertEqual((reused.center_x, reused.center_y), (200, 300))
+
+    def test_frames_skipped_over_the_limit(self):
+        """
+        Check if Explosions skip frames when there are too many of them.
+        """
+        self.pool.limit = 2
+        explosions = [self.pool.acquire(100, 100) for _ in range(3)]
+        self.assertEqual(self.pool.frame_step, 2, "Should be: 2.")
+        explosions[0].update()
+        self.assertEqual(explosions[0].current_texture, 2, "Should be: 2.")
+
+
+class TestTransformsSystem(HeadlessGameTestCase):
+    """
+    Test game.TransformsSystem moving children with their parents.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.transforms = self.game.transforms
+        self.parents = [game.SpaceObject("hostiles/hostile_ship_1") for _ in
+                        range(2)]
+        self.children = [game.SpaceObject("hostiles/turret_small") for _ in
+                         range(2)]
+        for i, (parent, child) in enumerate(zip(self.parents,
+                                                self.children)):
+            parent.position = [100 * (i + 1), 500]
+            parent.attach(child, 10, -20)
+
+    def test_children_follow_parents(self):
+        """
+        Check if children keep their offsets after parents moved.
+        """
+        self.parents[1].center_x += 50
+        self.transforms.update()
+        self.assertEqual(self.children[0].position, [110, 480])
+        self.assertEqual(self.children[1].position, [260, 480])
+
+    def test_arrays_stay_compact_after_kill(self):
+        """
+        Check if killed parent's child is replaced in arrays by the last one.
+        """
+        self.parents[0].kill()
+        self.assertEqual(len(self.transforms), 1, "Should be: 1.")
+        self.assertEqual(self.children[1].transform_index, 0,
+                         "Should be: 0.")
+        self.transforms.update()
+        self.assertEqual(self.children[1].position, [210, 480])
+
+    def test_child_can_not_carry_children(self):
+        """
+        Check if attaching object to a child is refused.
+        """
+        with self.assertRaises(ValueError):
+            self.children[0].attach(self.parents[1], 0, 0)
+
+
+class TestTurretsSystem(HeadlessGameTestCase):
+    """
+    Test game.TurretsSystem moving, aiming and firing all the turrets.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.system = self.game.turrets_system
+        self.ship = game.Hostile(0)
+        self.ship.position = [400, 600]
+        self.turret = game.Turret("turret_small", "hostile_laser_red", 0, -12,
+                                  90, 1)
+        self.ship.attach(self.turret, 0, 12)
+        self.system.add(self.turret)
+        self.game.transforms.update()
+
+    def test_turret_follows_ship_and_aims_at_player(self):
+        """
+        Check if turret is moved to it's ship, and rotated in full degrees
+        toward the player.
+        """
+        self.system.update(self.game.transforms, 500, 100, 0)
+        self.assertEqual(self.turret.position, [400, 612])
+        self.assertEqual(self.turret.angle, 191.0, "Should be: 191.0.")
+
+    def test_turret_fires_when_reloaded(self):
+        """
+        Check if turret shoots only after it's rate of fire elapsed.
+        """
+        shots = len(self.game.projectiles)
+        self.system.update(self.game.transforms, 500, 100, 50)
+        self.assertEqual(len(self.game.projectiles), shots, "Should be: 0.")
+        self.system.update(self.game.transforms, 500, 100, 91)
+        self.assertEqual(len(self.game.projectiles), shots + 1)
+        self.assertEqual(self.turret.last_shot, 91, "Should be: 91.")
+
+    def test_killed_turret_is_removed(self):
+        """
+        Check if destroyed turret is no longer updated.
+        """
+        self.turret.kill()
+        self.assertEqual(len(self.system), 0, "Should be: 0.")
+
+    def test_turret_is_destroyed_with_ship(self):
+        """
+        Check if killing the ship kills it's turrets, and they are no longer
+        moved nor updated.
+        """
+        self.ship.kill()
+        self.assertFalse(self.turret.alive, "Should be: False.")
+        self.assertEqual(len(self.game.transforms), 0, "Should be: 0.")
+        self.assertEqual(len(self.system), 0, "Should be: 0.")
+        self.assertEqual(self.ship.children, [], "Should be: [].")
+
+    def test_projectile_velocity_from_tables(self):
+        """
+        Check if velocity of projectile shot in full degree angle is the
+        same, as calculated with trigonometric functions.
+        """
+        shot = self.game.projectiles_pool.acquire(
+            "hostile_laser_red", 1, 169.0, ["", 100, 100])
+        radians = game.math.radians(169)
+        speed = game.weapons[game.SPEED]["hostile_laser_red"]
+        self.assertAlmostEqual(shot.change_x, -game.math.sin(radians) * speed)
+        self.assertAlmostEqual(shot.change_y, game.math.cos(radians) * speed)
+
+
+class TestHintsManager(unittest.TestCase):
+    """
+    Test game.HintsManager moving, expiring and drawing hints.
+    """
+
+    def setUp(self):
+        self.hints = game.HintsManager(game.RenderLayer())
+
+    def test_expired_hints_are_removed(self):
+        """
+        Check if expired hints are removed without skipping the others.
+        """
+        for time in (0, 0, 5, 0):
+            self.hints.add("Hit!", 100, 100, 0, 0, game.WHITE, 10, time)
+        self.hints.update()
+        self.assertEqual(len(self.hints), 1, "Should be: 1.")
+        self.assertEqual(len(self.hints.sprites), 1, "Should be: 1.")
+        self.assertEqual(next(iter(self.hints)).time, 4, "Should be: 4.")
+
+    def test_expired_hint_slot_is_reused(self):
+        """
+        Check if the last hint Sprite takes the batch slot of the expired
+        one, so the batch is not rebuilt.
+        """
+        expired = self.hints.add("Hit!", 100, 100, 0, 0, game.WHITE, 10, 0)
+        last = self.hints.add("10", 100, 100, 0, 0, game.WHITE, 10, 5)
+        self.hints.update()
+        self.assertNotIn(expired.sprite, self.hints.sprites)
+        self.assertEqual(self.hints.sprites.slots[last.sprite], 0,
+                         "Should be: 0.")
+
+    def test_hints_share_texture_of_the_same_text(self):
+        """
+        Check if text is rasterized once for all the hints displaying it.
+        """
+        first = self.hints.add("10", 100, 100, 0, -5, game.WHITE, 10, 45)
+        second = self.hints.add("10", 300, 100, 0, -5, game.WHITE, 10, 45)
+        self.assertIs(first.sprite.texture, second.sprite.texture)
+
+    def test_hint_sprite_moves_with_hint(self):
+        """
+        Check if hint Sprite is moved by the speed of the hint.
+        """
+        hint = self.hints.add("10", 100, 100, 0, -5, game.WHITE, 10, 45)
+        self.hints.update()
+        self.assertEqual(hint.y, 95, "Should be: 95.")
+        self.assertEqual(hint.sprite.center_x, 100, "Should be: 100.")
+        self.assertEqual(hint.sprite.bottom, 95, "Should be: 95.")
+
+
+class TestHud(unittest.TestCase):
+    """
+    Test game.Hud laying out labels and digits of the counters.
+    """
+
+    def setUp(self):
+        self.hud = game.Hud(game.RenderLayer())
+
+    def test_counters_are_made_of_digits(self):
+        """
+        Check if each label and each digit is a Sprite, placed one after
+        another.
+        """
+        self.hud.update((10, 2, 1, 3, 100, 250), False)
+        sprites = list(self.hud.sprites)
+        self.assertEqual(len(sprites), 6 + 11, "Should be: 17.")
+        for previous, sprite in zip(sprites, sprites[1:]):
+            self.assertAlmostEqual(previous.right, sprite.left)
+
+    def test_sprites_are_reused_when_counters_change(self):
+        """
+        Check if Sprites are kept when counters change, and the extra ones
+        removed when counters get shorter.
+        """
+        self.hud.update((10, 2, 1, 3, 100, 250), True)
+        first = self.hud.sprites[0]
+        self.hud.update((9, 2, 1, 3, 100, 250), False)
+        self.assertIs(self.hud.sprites[0], first)
+        self.assertEqual(len(self.hud.sprites), 6 + 10, "Should be: 16.")
+
+
+class TestTargetMarker(HeadlessGameTestCase):
+    """
+    Test game.TargetMarker showing targets of player's rockets.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.game.spawn_hostile()
+        self.target = self.game.hostiles[0]
+        self.rocket = self.game.projectiles_pool.acquire(
+            game.weapons[game.ROCKETS][0], 1, game.UPWARD,
+            self.game.player.gun_slots[0])
+        self.game.projectiles.append(self.rocket)
+        self.rocket.target = self.target
+        self.rocket.marker = self.game.add_target_marker(self.rocket,
+                                                         self.target)
+
+    def test_marker_follows_target(self):
+        """
+        Check if marker is moved with the targeted ship.
+        """
+        self.target.center_x += 10
+        self.game.update_targets_markers()
+        self.assertEqual(self.game.targets_markers[0].x, self.target.center_x)
+
+    def test_marker_of_killed_target_is_deleted(self):
+        """
+        Check if marker is deleted, when it's target was destroyed.
+        """
+        self.target.kill()
+        self.game.update_targets_markers()
+        self.assertEqual(self.game.targets_markers, [], "Should be: [].")
+
+    def test_marker_of_recycled_rocket_is_deleted(self):
+        """
+        Check if marker is deleted, when it's rocket was reused as new shot.
+        """
+        self.rocket.kill()
+        reused = self.game.projectiles_pool.acquire(
+            game.weapons[game.ROCKETS][0], 1, game.UPWARD,
+            self.game.player.gun_slots[0])
+        self.assertIs(reused, self.rocket)
+        self.game.update_targets_markers()
+        self.assertEqual(self.game.targets_markers, [], "Should be: [].")
+
+
+class TestFixedTimeStep(HeadlessGameTestCase):
+    """
+    Test game.Game.on_update() running fixed logic ticks.
+    """
+
+    def test_ticks_fitting_in_frame_time(self):
+        """
+        Check if only full ticks are run, and the rest is interpolated.
+        """
+        self.game.on_update(2.5 / game.FPS)
+        self.assertEqual(self.game.frames, 2, "Should be: 2.")
+        self.assertAlmostEqual(self.game.interpolation, 0.5)
+        self.game.on_update(0.5 / game.FPS)
+        self.assertEqual(self.game.frames, 3, "Should be: 3.")
+
+    def test_catch_up_is_limited(self):
+        """
+        Check if long frame runs no more ticks than allowed.
+        """
+        self.game.max_ticks_per_frame = 3
+        self.game.on_update(1.0)
+        self.assertEqual(self.game.frames, 3, "Should be: 3.")
+        self.assertLess(self.game.accumulator, 1 / game.FPS)
+
+    def test_drawn_frame_contains_its_ticks(self):
+        """
+        Check if ticks of the game with window do not end the profiled
+        frame, so it is ended by drawing, with all the ticks run before.
+        """
+        profiler = self.game.profiler
+        profiler.enabled = True
+        self.game.headless = False
+        self.game.on_update(2 / game.FPS)
+        self.assertEqual(profiler.frame, 0, "Should be: 0.")
+        profiler.end_frame()
+        self.assertEqual(list(profiler.counts[game.TICKS]), [2])
+        self.game.headless = True
+        self.game.tick()
+        self.assertEqual(profiler.frame, 2, "Should be: 2.")
+
+    def test_interpolated_positions_are_drawn(self):
+        """
+        Check if sprite is drawn between it's positions from two last ticks,
+        and it's real position does not change.
+        """
+        self.game.players.prepare()
+        player = self.game.player
+        x = player.center_x
+        self.game.remember_positions()
+        player.center_x += 10
+        writes = self.game.players.prepare(0.25)
+        drawn = game.numpy.frombuffer(writes[0][2], game.numpy.float32)
+        self.assertEqual(drawn[0], x + 2.5, "Should be: x + 2.5.")
+        self.assertEqual(player.center_x, x + 10, "Should be: x + 10.")
+
+
+class TestHostilesAI(HeadlessGameTestCase):
+    """
+    Test game.HostilesAI updating all hostile ships at once.
+    """
+
+    batched_ai = True
+
+    def setUp(self):
+        super().setUp()
+        self.ai = self.game.hostiles_ai
+
+    def test_arrays_stay_compact_after_kill(self):
+        """
+        Check if killed ship is replaced in arrays by the last ship.
+        """
+        for _ in range(3):
+            self.game.spawn_hostile()
+        first, last = self.game.hostiles[0], self.game.hostiles[2]
+        first.kill()
+        self.assertEqual(len(self.ai), 2, "Should be: 2.")
+        self.assertEqual(last.ai_index, 0, "Should be: 0.")
+        self.assertEqual(self.ai.x[0], last.center_x)
+
+    def test_ship_aims_at_player(self):
+        """
+        Check if ship without any shots around flies toward the player.
+        """
+        self.game.spawn_hostile()
+        hostile = self.game.hostiles[0]
+        self.ai.targeted[0] = True  # no random maneuvers
+        self.ai.x[0] = self.game.player.center_x + 200
+        self.game.update_hostiles_ai()
+        self.assertLess(hostile.change_x, 0, "Should be: negative.")
+        self.assertEqual(hostile.center_x, self.ai.x[0])
+
+    def test_simulation_with_batched_ai(self):
+        """
+        Check if the game runs with hostiles updated by HostilesAI.
+        """
+        self.game.simulate(300)
+        self.assertEqual(len(self.ai), len(self.game.hostiles))
+
+
+class TestCensus(HeadlessGameTestCase):
+    """
+    Test game.Census counting the hostile ships alive.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.census = self.game.census
+        for model in ("hostile_ship_1", "hostile_ship_1", "hostile_ship_2"):
+            self.game.spawn_hostile(model)
+
+    def test_census_follows_spawns_and_kills(self):
+        """
+        Check if census counts ships of each model, and their rating is the
+        sum of ratings of the hostiles alive.
+        """
+        self.game.hostiles[0].kill()
+        self.assertEqual(len(self.census), 2, "Should be: 2.")
+        self.assertEqual(self.census.count("hostile_ship_1"), 1)
+        self.assertEqual(self.census.count("hostile_ship_2"), 1)
+        self.assertEqual(self.census.count("hostile_ship_3"), 0)
+        self.assertEqual(self.census.rating, sum(
+            game.hostiles[game.RATINGS][hostile.model] for hostile in
+            self.game.hostiles))
+
+    def test_ship_killed_twice_is_removed_once(self):
+        """
+        Check if killing already destroyed ship does not change census,
+        score nor number of destroyed ships.
+        """
+        hostile = self.game.hostiles[0]
+        hostile.kill()
+        score, destroyed = self.game.score, self.game.destroyed
+        hostile.kill()
+        self.assertEqual(len(self.census), 2, "Should be: 2.")
+        self.assertEqual((self.game.score, self.game.destroyed),
+                         (score, destroyed))
+
+
+class TestWaveScheduler(HeadlessGameTestCase):
+    """
+    Test game.WaveScheduler executing timed events of the level.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.levels = {game.WAVES: [[2, "hostile_ship_2", 3]],
+                       game.SPAWN_INTERVAL: 10, game.ESCALATION_TIME: 1}
+        self.scheduler = game.WaveScheduler(self.levels)
+        self.game.wave_scheduler = self.scheduler
+
+    def run_until(self, game_time: int):
+        self.game.game_time = game_time
+        self.scheduler.update(self.game)
+
+    def test_nothing_happens_before_event_is_due(self):
+        """
+        Check if events are left in the heap until their tick.
+        """
+        self.run_until(game.FPS - 1)
+        self.assertEqual(len(self.scheduler), 3, "Should be: 3.")
+        self.assertEqual(self.game.difficulty, 0, "Should be: 0.")
+
+    def test_wave_is_spawned_on_time(self):
+        """
+        Check if all the ships of the wave appear at once, evenly spread.
+        """
+        self.game.difficulty = 10  # no more escalations
+        self.run_until(2 * game.FPS)
+        self.assertEqual([h.model for h in self.game.hostiles],
+                         ["hostile_ship_2"] * 3)
+        xs = [hostile.center_x for hostile in self.game.hostiles]
+        self.assertAlmostEqual(xs[1] - xs[0], xs[2] - xs[1])
+
+    def test_invalid_wave_is_reported(self):
+        """
+        Check if wave with unknown ship or bad number of ships is rejected
+        when the level is compiled, with the wave named in the message.
+        """
+        for wave in ([2, "hostile_ship_99", 3], [2, "hostile_ship_2", 0],
+                     [2, "hostile_ship_2"]):
+            with self.assertRaises(ValueError) as error:
+                game.WaveScheduler({game.WAVES: [[1, "hostile_ship_1", 1],
+                                                  wave]})
+            self.assertIn(str(wave), str(error.exception))
+
+    def test_difficulty_raises_twice_as_late(self):
+        """
+        Check if the next escalation is scheduled at the doubled time.
+        """
+        self.run_until(game.FPS)
+        self.assertEqual(self.game.difficulty, 1, "Should be: 1.")
+        self.run_until(2 * game.FPS - 1)
+        self.assertEqual(self.game.difficulty, 1, "Should be: 1.")
+        self.run_until(2 * game.FPS)
+        self.assertEqual(self.game.difficulty, 2, "Should be: 2.")
+
+    def test_escalation_waits_for_challenge_mode(self):
+        """
+        Check if escalation postponed without challenge mode comes, when
+        challenge mode is turned on.
+        """
+        self.game.challenge_mode = False
+        self.run_until(game.FPS)
+        self.assertEqual(self.game.difficulty, 0, "Should be: 0.")
+        self.game.challenge_mode = True
+        self.run_until(2 * game.FPS)
+        self.assertEqual(self.game.difficulty, 1, "Should be: 1.")
+
+
+class ChasingBot(game.BotController):
+    """Follows the first hostile ship and launches a rocket at start."""
+
+    def __init__(self):
+        self.action = [0, 0, 1, 0]
+        self.observations = 0
+
+    def act(self, observation):
+        self.observations += 1
+        x = observation.player[0, 0]
+        if observation.counts[1] > 0:
+            target = observation.hostiles[0, 0]
+            self.action[0] = 1 if target > x else -1 if target < x else 0
+        self.action[3] = int(self.observations == 1)
+        return self.action
+
+
+class TestBotController(HeadlessGameTestCase):
+    """
+    Test game.Observation and game.BotController driving player's ship.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.bot = ChasingBot()
+        self.game.attach_controller(self.bot)
+
+    def test_controller_must_implement_act(self):
+        """
+        Check if controller without act() can not be created.
+        """
+        with self.assertRaises(TypeError):
+            game.BotController()
+
+    def test_observation_of_the_game(self):
+        """
+        Check if positions and velocities are copied into the same buffer.
+        """
+        self.game.spawn_hostile()
+        hostile = self.game.hostiles[0]
+        observation = self.game.observation
+        buffer = observation.buffer
+        observation.update(self.game)
+        self.assertIs(observation.buffer, buffer)
+        self.assertEqual(observation.counts.tolist(), [1, 1, 0, 0, 0])
+        self.assertEqual(observation.hostiles[0].tolist(), [
+            hostile.center_x, hostile.center_y, hostile.change_x,
+            hostile.change_y])
+
+    def test_rows_of_removed_objects_are_zeroed(self):
+        """
+        Check if hostile ship which was destroyed disappears from the buffer.
+        """
+        self.game.spawn_hostile()
+        observation = self.game.observation
+        observation.update(self.game)
+        self.game.hostiles[0].kill()
+        observation.update(self.game)
+        self.assertEqual(observation.counts[1], 0, "Should be: 0.")
+        self.assertFalse(observation.hostiles.any())
+
+    def test_bot_drives_the_ship(self):
+        """
+        Check if action of the bot moves the ship and fires it's weapons.
+        """
+        self.game.spawn_hostile()
+        self.game.hostiles[0].center_x = self.game.player.center_x + 300
+        rockets = self.game.player.rockets
+        self.game.simulate(5)
+        self.assertEqual(self.bot.observations, 5, "Should be: 5.")
+        self.assertEqual(self.game.player.change_x, game.PlayerShip.RIGHT)
+        self.assertTrue(self.game.player.shooting)
+        self.assertEqual(self.game.player.rockets, max(rockets - 1, 0))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,48 @@
+import os
+import unittest
+
+os.environ.setdefault("RED_INVADERS_HEADLESS", "1")
+import game
+
+
+class TestHeadlessGame(unittest.TestCase):
+    """
+    Test game.Game running in headless mode.
+    """
+
+    def test_run_headless_without_window(self):
+        """
+        Check if headless game is simulated without creating window, cursor
+        and menus.
+        """
+        headless_game = game.run_headless(10, seed=1)
+        self.assertTrue(headless_game.headless)
+        self.assertIsNone(headless_game.cursor)
+        self.assertIsNone(headless_game.menu)
+        self.assertEqual(headless_game.game_time, 10)
+
+    def test_simulate_stops_when_player_is_dead(self):
+        """
+        Check if simulate() returns number of frames actually simulated.
+        """
+        headless_game = game.run_headless(0, seed=1)
+        headless_game.players = game.arcade.SpriteList()
+        self.assertEqual(headless_game.simulate(10), 0)
+
+    def test_sound_toggled_in_menu_before_first_game(self):
+        """
+        Check if M pressed in the menu, before any game was started, toggles
+        sounds without showing the hint.
+        """
+        game.load_game_config()
+        menu_game = game.Game(game.SCREEN_WIDTH, game.SCREEN_HEIGHT,
+                              game.TITLE, False, False, headless=True)
+        menu_game.in_menu = True
+        menu_game.sound.manifest = []  # nothing to decode
+        menu_game.on_key_press(game.arcade.key.M, 0)
+        self.assertTrue(menu_game.sound.enabled)
+        self.assertIsNone(menu_game.hints)
+
+
+if __name__ == "__main__":
+    unittest.main()
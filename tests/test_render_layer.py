@@ -0,0 +1,155 @@
+import unittest
+
+import numpy
+import arcade
+
+from PIL import Image
+
+from render_layer.render_layer import RenderLayer, TextureAtlas
+
+
+def texture(name: str, width: int = 10, height: int = 10):
+    return arcade.Texture(name, Image.new("RGBA", (width, height)))
+
+
+def sprite(x: float, y: float, name: str = "ship"):
+    result = arcade.Sprite()
+    result.texture = texture(name)
+    result.position = [x, y]
+    return result
+
+
+class TestTextureAtlas(unittest.TestCase):
+    """
+    Test render_layer.TextureAtlas packing images of the textures.
+    """
+
+    def test_each_image_is_added_once(self):
+        """
+        Check if textures with the same name share their image.
+        """
+        atlas = TextureAtlas()
+        self.assertEqual(atlas.index(texture("a")), 0, "Should be: 0.")
+        self.assertEqual(atlas.index(texture("b")), 1, "Should be: 1.")
+        self.assertEqual(atlas.index(texture("a")), 0, "Should be: 0.")
+        self.assertEqual(len(atlas), 2, "Should be: 2.")
+
+    def test_images_are_packed_in_shelves(self):
+        """
+        Check if image which does not fit in the shelf starts a new one, and
+        texture coordinates follow size of the atlas.
+        """
+        atlas = TextureAtlas(width=25)
+        for name in ("a", "b", "c"):
+            atlas.index(texture(name))
+        self.assertEqual(atlas.rects, [(0, 0, 10, 10), (11, 0, 10, 10),
+                                       (0, 11, 10, 10)])
+        self.assertEqual(atlas.size(), (25, 21), "Should be: (25, 21).")
+        self.assertEqual(atlas.image().size, (25, 21))
+        self.assertAlmostEqual(atlas.coords[2][1], 0.0)
+        self.assertAlmostEqual(atlas.coords[0][1], 11 / 21)
+
+    def test_known_textures_are_packed_at_once(self):
+        """
+        Check if textures passed to the RenderLayer are in the atlas before
+        drawing, and the atlas changed only once.
+        """
+        layer = RenderLayer(textures=[texture(name) for name in "abc"])
+        self.assertEqual(len(layer.atlas), 3, "Should be: 3.")
+        self.assertEqual(layer.atlas.version, 1, "Should be: 1.")
+        self.assertEqual(layer.atlas.index(texture("b")), 1, "Should be: 1.")
+        self.assertEqual(layer.atlas.version, 1, "Should be: 1.")
+
+
+class TestSpriteBatch(unittest.TestCase):
+    """
+    Test render_layer.SpriteBatch keeping slots of the Sprites without GL.
+    """
+
+    def setUp(self):
+        self.batch = RenderLayer().create_batch(capacity=2)
+        self.sprites = [sprite(i * 10, 0) for i in range(3)]
+        for sprite_ in self.sprites:
+            self.batch.append(sprite_)
+
+    def test_batch_grows_when_full(self):
+        """
+        Check if capacity is doubled by the third Sprite.
+        """
+        self.assertEqual(self.batch.capacity, 4, "Should be: 4.")
+        self.batch.prepare()
+        self.assertEqual(self.batch.arrays["position"][2].tolist(),
+                         [20, 0])
+
+    def test_killed_sprite_slot_is_reused(self):
+        """
+        Check if the last Sprite takes slot of the killed one, and the order
+        of the list does not change.
+        """
+        self.batch.prepare()
+        self.sprites[0].kill()
+        self.assertEqual(list(self.batch), self.sprites[1:])
+        self.assertEqual(self.batch.slots[self.sprites[2]], 0,
+                         "Should be: 0.")
+        self.assertEqual(self.batch.arrays["position"][0].tolist(), [20, 0])
+        self.assertNotIn(self.sprites[0], self.batch)
+
+    def test_only_changes_are_written(self):
+        """
+        Check if after moving one Sprite, only it's position is written.
+        """
+        writes = self.batch.prepare()
+        self.assertEqual(len(writes), 5, "Should be: 5.")
+        self.sprites[1].center_x += 5
+        writes = self.batch.prepare()
+        self.assertEqual([(name, offset) for name, offset, _ in writes],
+                         [("position", 8)])
+        self.assertEqual(len(writes[0][2]), 8, "Should be: 8.")
+        self.assertEqual(self.batch.prepare(), [], "Should be: [].")
+
+    def test_new_texture_is_written(self):
+        """
+        Check if Sprite which changed it's texture gets it's coordinates.
+        """
+        self.batch.prepare()
+        self.sprites[2].texture = texture("hit")
+        names = [name for name, _, _ in self.batch.prepare()]
+        self.assertEqual(names, ["size", "sub_tex_coords"])
+        self.assertEqual(self.batch.textures[2], 1, "Should be: 1.")
+
+    def test_positions_are_interpolated_without_moving_sprites(self):
+        """
+        Check if only the moving Sprite is drawn between it's previous and
+        current position, and the Sprite added after the last tick is drawn
+        where it is, even if it moved.
+        """
+        self.batch.prepare()
+        self.batch.remember()
+        self.sprites[1].center_x += 10
+        added = sprite(100, 0)
+        self.batch.append(added)
+        added.center_x += 10
+        writes = self.batch.prepare(0.5)
+        self.assertEqual([(name, offset) for name, offset, _ in writes[:1]],
+                         [("position", 8)])
+        positions = numpy.frombuffer(writes[0][2], numpy.float32)
+        self.assertEqual(positions.tolist(), [15, 0, 20, 0, 110, 0])
+        self.assertEqual(self.sprites[1].center_x, 20, "Should be: 20.")
+
+    def test_interpolated_sprite_is_written_when_it_stops(self):
+        """
+        Check if Sprite drawn in interpolated position last time, is drawn
+        in it's current one, when it did not move in the last tick.
+        """
+        self.batch.prepare()
+        self.batch.remember()
+        self.sprites[0].center_x += 10
+        self.batch.prepare(0.5)
+        self.batch.remember()
+        writes = self.batch.prepare(0.5)
+        positions = numpy.frombuffer(writes[0][2], numpy.float32)
+        self.assertEqual(positions.tolist(), [10, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+os.environ.setdefault("RED_INVADERS_HEADLESS", "1")
+import game
+from replay.replay import ReplayRecorder, load_replay, replay_length, \
+    KEY_PRESS, KEY_RELEASE, END
+
+
+class TestReplay(unittest.TestCase):
+    """
+    Test recording and replaying game sessions.
+    """
+
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), "session.replay")
+
+    def test_recorded_events_are_loaded(self):
+        """
+        Check if header and events are read back in the same form.
+        """
+        recorder = ReplayRecorder(self.path)
+        recorder.start(123, 1280, 720, 3, True, False)
+        recorder.record(5, KEY_PRESS, game.arcade.key.UP, 0)
+        recorder.record(9, KEY_RELEASE, game.arcade.key.UP, 0)
+        recorder.stop(20)
+        header, events = load_replay(self.path)
+        self.assertEqual(header, {"seed": 123, "width": 1280, "height": 720,
+                                  "difficulty": 3, "challenge_mode": True,
+                                  "god_mode": False, "batched_ai": False})
+        self.assertEqual(events, [(5, KEY_PRESS, game.arcade.key.UP, 0),
+                                  (9, KEY_RELEASE, game.arcade.key.UP, 0),
+                                  (20, END, 0, 0)])
+        self.assertEqual(replay_length(events), 20, "Should be: 20.")
+
+    def test_replayed_session_is_identical(self):
+        """
+        Check if replayed session ends in exactly the same state as the
+        recorded one.
+        """
+        game.load_game_config()
+        recorded = game.Game(game.SCREEN_WIDTH, game.SCREEN_HEIGHT, game.TITLE,
+                             False, False, headless=True, seed=7,
+                             record=self.path)
+        game.game = recorded
+        recorded.god_mode = True
+        recorded.setup_new_game()
+        keys = [game.arcade.key.SPACE, game.arcade.key.LEFT,
+                game.arcade.key.UP, game.arcade.key.RIGHT]
+        for frame in range(600):
+            if frame % 50 == 0:
+                recorded.on_key_press(keys[frame // 50 % 4], 0)
+            elif frame % 50 == 25:
+                recorded.on_key_release(keys[frame // 50 % 4], 0)
+            # screen refreshed faster than game logic is updated:
+            recorded.on_update(1 / 60)
+        recorded.recorder.stop(recorded.frames)
+
+        replayed = game.run_replay(self.path)
+        self.assertEqual(replayed.frames, recorded.frames)
+        self.assertEqual((replayed.score, replayed.shots_fired,
+                          replayed.hits, replayed.destroyed),
+                         (recorded.score, recorded.shots_fired,
+                          recorded.hits, recorded.destroyed))
+        self.assertEqual((replayed.player.center_x, replayed.player.center_y),
+                         (recorded.player.center_x, recorded.player.center_y))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import shutil
+import tempfile
+import unittest
+import threading
+
+from score_store import score_store
+from score_store.score_store import ScoreStore, HEADER, MAGIC, VERSION
+
+
+class TestScoreStore(unittest.TestCase):
+    """
+    Test score_store.ScoreStore keeping and saving the best scores.
+    """
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.file = os.path.join(self.path, "scores.bin")
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def reloaded(self):
+        store = ScoreStore(self.file, capacity=3)
+        store.load(background=False)
+        return store
+
+    def test_only_best_scores_are_kept(self):
+        """
+        Check if table keeps only the best scores, sorted from the lowest.
+        """
+        store = ScoreStore(capacity=3)
+        store.load()
+        for name, score in (("a", 30), ("b", 10), ("c", 20), ("d", 40)):
+            store.add(name, score)
+        self.assertIsNone(store.add("e", 5))
+        self.assertEqual([r["score"] for r in store.wait()], [20, 30, 40],
+                         "Should be: [20, 30, 40].")
+
+    def test_scores_are_saved_in_background(self):
+        """
+        Check if scores added to the store could be read after flushing it.
+        """
+        store = self.reloaded()
+        store.add("player", 100)
+        store.add("other", 50)
+        store.flush()
+        self.assertEqual(self.reloaded().table,
+                         [{"name": "other", "score": 50},
+                          {"name": "player", "score": 100}])
+
+    def test_score_added_while_file_is_read_is_kept(self):
+        """
+        Check if score added by the game, while the background thread merges
+        the table with the records read from the file, is not lost.
+        """
+        self.reloaded().flush()  # creates empty file
+        store = ScoreStore(self.file, capacity=3)
+        best = store.best
+        adding = threading.Thread(target=store.add, args=("game", 10))
+
+        def slow_best(records: list):
+            adding.start()
+            adding.join(0.1)  # blocked by the lock, until table is merged
+            return best(records)
+
+        store.best = slow_best
+        store.load(background=False)
+        adding.join()
+        store.flush()
+        self.assertEqual(store.table, [{"name": "game", "score": 10}])
+
+    def test_failed_legacy_import_is_retried(self):
+        """
+        Check if scores file is not created when legacy scores could not be
+        read, so they are imported in the next session.
+        """
+        legacy = os.path.join(self.path, "scores.data")
+        with open(legacy, "wb") as file:
+            file.write(b"not a shelve file")
+        store = ScoreStore(self.file, legacy_path=legacy)
+        store.load(background=False)
+        store.add("player", 100)
+        store.flush()
+        self.assertFalse(os.path.exists(self.file))
+        self.assertEqual(store.table, [{"name": "player", "score": 100}])
+
+    def test_truncated_record_is_ignored(self):
+        """
+        Check if record written partially, when game crashed, is skipped.
+        """
+        store = self.reloaded()
+        store.add("player", 100)
+        store.add("other", 50)
+        store.flush()
+        with open(self.file, "r+b") as file:
+            file.truncate(os.path.getsize(self.file) - 2)
+        self.assertEqual(self.reloaded().table,
+                         [{"name": "player", "score": 100}])
+
+    def test_file_is_compacted(self):
+        """
+        Check if file grown over the limit is rewritten with only the best
+        scores.
+        """
+        store = self.reloaded()
+        for score in range(score_store.COMPACT_AFTER + 1):
+            store.add("player", score)
+            store.flush()
+        self.assertLessEqual(store.records, 3, "Should be: <= 3.")
+        self.assertFalse(os.path.exists(self.file + ".tmp"))
+        with open(self.file, "rb") as file:
+            self.assertEqual(file.read(HEADER.size),
+                             HEADER.pack(MAGIC, VERSION))
+        self.assertEqual([r["score"] for r in self.reloaded().table],
+                         [98, 99, 100], "Should be: [98, 99, 100].")
+
+
+if __name__ == "__main__":
+    unittest.main()
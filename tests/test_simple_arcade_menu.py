@@ -1,5 +1,6 @@
 import os
 import unittest
+from unittest import mock
 from simple_arcade_menu import *
 
 path = os.path.dirname(os.path.abspath(__file__))
@@ -11,6 +12,70 @@ class TestSimpleArcadeMenu(unittest.TestCase):
     """"""
 
 
+class TestTextCache(unittest.TestCase):
+    """
+    Test TextCache keeping rasterized texts.
+    """
+
+    def test_same_text_is_rasterized_once(self):
+        """
+        Check if text requested twice is taken from the cache.
+        """
+        cache = TextCache()
+        first = cache.get("Score: 10", WHITE, 14)
+        second = cache.get("Score: 10", WHITE, 14)
+        self.assertIs(first, second)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_least_recently_used_text_is_evicted(self):
+        """
+        Check if cache drops the text not used for the longest time.
+        """
+        cache = TextCache(capacity=2)
+        cache.get("A", WHITE, 14)
+        evicted = cache.get("B", WHITE, 14)
+        cache.get("A", WHITE, 14)
+        cache.get("C", WHITE, 14)
+        self.assertEqual([key[0] for key in cache.entries], ["A", "C"])
+        self.assertEqual(len(evicted), 0, "Should be: 0.")
+        self.assertIsNone(evicted._texture, "Should be: None.")
+
+    def test_text_sprite_has_size_of_text(self):
+        """
+        Check if longer text produces wider Sprite.
+        """
+        cache = TextCache()
+        short = cache.get("Hit!", WHITE, 10)[0]
+        long = cache.get("Shield hit!", WHITE, 10)[0]
+        self.assertGreater(long.width, short.width)
+        self.assertGreater(short.height, 0)
+
+    def test_lines_are_aligned(self):
+        """
+        Check if centered multi-line text is rasterized separately from the
+        same text aligned to the left.
+        """
+        cache = TextCache()
+        left = cache.get("Hit!\nShield hit!", WHITE, 10)[0]
+        center = cache.get("Hit!\nShield hit!", WHITE, 10, align="center")[0]
+        self.assertIsNot(left, center)
+        self.assertNotEqual(left.texture.image.tobytes(),
+                            center.texture.image.tobytes())
+
+    def test_counter_is_cached_as_glyphs(self):
+        """
+        Check if counters drawn with draw_glyphs() keep only their digits in
+        the cache, placed one after another.
+        """
+        cache = TextCache()
+        with mock.patch.object(arcade.SpriteList, "draw"):
+            end = cache.draw_glyphs("1010", 0, 0, WHITE, 14)
+            cache.draw_glyphs("1100", 0, 0, WHITE, 14)
+        digits = [cache.get(digit, WHITE, 14)[0] for digit in "10"]
+        self.assertEqual(len(cache), 2, "Should be: 2.")
+        self.assertEqual(end, 2 * sum(digit.width for digit in digits))
+
+
 if __name__ == '__main__':
     dummy()
     unittest.main()
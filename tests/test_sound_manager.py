@@ -0,0 +1,90 @@
+import os
+import unittest
+
+from sound_manager.sound_manager import SoundManager
+
+SOUNDS_PATH = os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))) + "/sounds/"
+
+
+class FakePlayer:
+    def __init__(self):
+        self.playing = True
+
+    def pause(self):
+        self.playing = False
+
+    def delete(self):
+        pass
+
+
+class FakeSource:
+    def __init__(self):
+        self.players = []
+
+    def play(self):
+        self.players.append(FakePlayer())
+        return self.players[-1]
+
+
+class TestSoundManager(unittest.TestCase):
+    """
+    Test sound_manager.SoundManager preloading and limiting sounds.
+    """
+
+    def setUp(self):
+        self.manager = SoundManager(SOUNDS_PATH, voices=2)
+        self.source = self.manager.sources["laser_shot.wav"] = FakeSource()
+
+    def test_manifest_is_decoded_in_background(self):
+        """
+        Check if sounds from the manifest are loaded, and missing files are
+        skipped.
+        """
+        self.manager.preload(["hit.wav", "missing.wav"])
+        self.manager.wait()
+        self.assertIsNotNone(self.manager.sources["hit.wav"])
+        self.assertIsNone(self.manager.sources["missing.wav"])
+        self.assertIsNone(self.manager.play("missing.wav"))
+
+    def test_oldest_voice_is_stolen(self):
+        """
+        Check if playing sound over the voices limit stops it's oldest copy.
+        """
+        for _ in range(3):
+            self.manager.play("laser_shot.wav")
+        first, second, third = self.source.players
+        self.assertFalse(first.playing)
+        self.assertTrue(second.playing and third.playing)
+        self.assertEqual(self.manager.stolen, 1, "Should be: 1.")
+
+    def test_finished_voices_are_not_stolen(self):
+        """
+        Check if voices which finished playing do not count to the limit.
+        """
+        self.manager.play("laser_shot.wav").playing = False
+        self.manager.play("laser_shot.wav")
+        self.manager.play("laser_shot.wav")
+        self.assertEqual(self.manager.stolen, 0, "Should be: 0.")
+
+    def test_muted_manager_plays_nothing(self):
+        """
+        Check if muted manager does not play nor load any sounds.
+        """
+        self.manager.toggle()
+        self.assertIsNone(self.manager.play("laser_shot.wav"))
+        self.assertIsNone(self.manager.play("hit.wav"))
+        self.assertNotIn("hit.wav", self.manager.sources)
+        self.assertEqual(self.source.players, [], "Should be: [].")
+
+    def test_sound_decoded_twice_is_shared(self):
+        """
+        Check if sound decoded by the game, while the loading thread was
+        decoding it too, keeps the source decoded first.
+        """
+        self.assertIs(self.manager.load("laser_shot.wav"), self.source)
+        self.assertIs(self.manager.sources["laser_shot.wav"], self.source)
+
+
+if __name__ == "__main__":
+    unittest.main()